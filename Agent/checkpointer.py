@@ -0,0 +1,359 @@
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.types import TASKS
+from dotenv import load_dotenv
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+"""
+ScheduleAgent용 SQLite 체크포인터
+
+MemorySaver는 모든 스레드의 메시지 기록을 프로세스 메모리에 무기한 보관하고, 재시작하면 사라지며 워커끼리 공유되지 않습니다.
+SQLiteCheckpointSaver는 체크포인트를 WAL 모드의 SQLite 파일에 저장해 같은 호스트의 여러 uvicorn 워커가 스레드를 이어받을 수 있게 하고,
+스레드별 TTL, 최대 스레드 수(LRU 제거), 스레드당 최근 체크포인트 개수 제한으로 저장소 크기를 일정하게 유지합니다.
+"""
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINTER = os.getenv("CHECKPOINTER", "sqlite").lower()
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", "data/checkpoints/schedule.sqlite")
+CHECKPOINT_TTL = float(os.getenv("CHECKPOINT_TTL", 60 * 60 * 24))
+CHECKPOINT_MAX_THREADS = int(os.getenv("CHECKPOINT_MAX_THREADS", 10000))
+CHECKPOINT_KEEP_LAST = int(os.getenv("CHECKPOINT_KEEP_LAST", 3))
+CHECKPOINT_PRUNE_INTERVAL = float(os.getenv("CHECKPOINT_PRUNE_INTERVAL", 60))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS threads_updated_at ON threads (updated_at);
+"""
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver[int]):
+    """
+    SQLite 파일 기반 LangGraph 체크포인터
+    ttl(초) 동안 갱신되지 않은 스레드와 max_threads를 넘는 오래된 스레드는 주기적으로 삭제하고,
+    스레드마다 최근 keep_last개의 체크포인트만 남깁니다. 0 이하 또는 None이면 해당 제한을 두지 않습니다.
+    """
+
+    def __init__(
+        self,
+        path: str = CHECKPOINT_DB_PATH,
+        ttl: float | None = CHECKPOINT_TTL,
+        max_threads: int | None = CHECKPOINT_MAX_THREADS,
+        keep_last: int | None = CHECKPOINT_KEEP_LAST,
+        prune_interval: float = CHECKPOINT_PRUNE_INTERVAL,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        if keep_last is not None and 0 < keep_last < 2:
+            # 최신 체크포인트의 pending_sends를 복원하려면 부모 체크포인트의 writes가 필요
+            raise ValueError("keep_last는 2 이상이어야 합니다.")
+        self.path = path
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.max_threads = max_threads if max_threads and max_threads > 0 else None
+        self.keep_last = keep_last if keep_last and keep_last > 0 else None
+        self.prune_interval = prune_interval
+        self._last_pruned = 0.0
+        self._lock = threading.RLock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        logger.info(f"sqlite checkpointer opened: {path}")
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    def _execute(self, query: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        with self._lock:
+            return self.conn.execute(query, params).fetchall()
+
+    def _pending_sends(self, thread_id: str, checkpoint_ns: str, parent_checkpoint_id: str | None) -> List[Any]:
+        if not parent_checkpoint_id:
+            return []
+        rows = self._execute(
+            "SELECT type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? AND channel = ? "
+            "ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, parent_checkpoint_id, TASKS),
+        )
+        return [self.serde.loads_typed((type_, value)) for type_, value in rows]
+
+    def _to_tuple(self, row: Tuple) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata_type, metadata = row
+        writes = self._execute(
+            "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        )
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+            checkpoint={
+                **self.serde.loads_typed((type_, checkpoint)),
+                "pending_sends": self._pending_sends(thread_id, checkpoint_ns, parent_checkpoint_id),
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_checkpoint_id}}
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[(task_id, channel, self.serde.loads_typed((type_, value))) for task_id, channel, type_, value in writes],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """config의 체크포인트(checkpoint_id가 없으면 스레드의 최신 체크포인트) 조회"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = "SELECT * FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+        params: List[Any] = [thread_id, checkpoint_ns]
+        if checkpoint_id := get_checkpoint_id(config):
+            query += " AND checkpoint_id = ?"
+            params.append(checkpoint_id)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+        rows = self._execute(query, params)
+        return self._to_tuple(rows[0]) if rows else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """조건에 맞는 체크포인트를 최신순으로 조회"""
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        query = "SELECT * FROM checkpoints"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        for row in self._execute(query, params):
+            if limit is not None and limit <= 0:
+                break
+            checkpoint_tuple = self._to_tuple(row)
+            if filter and not all(checkpoint_tuple.metadata.get(key) == value for key, value in filter.items()):
+                continue
+            if limit is not None:
+                limit -= 1
+            yield checkpoint_tuple
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """체크포인트 저장 후 스레드 갱신 시각 기록 및 오래된 체크포인트 정리"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        copied = checkpoint.copy()
+        copied.pop("pending_sends", None)
+        type_, serialized = self.serde.dumps_typed(copied)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (thread_id, checkpoint_ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+                 type_, serialized, metadata_type, serialized_metadata),
+            )
+            self.conn.execute("INSERT OR REPLACE INTO threads VALUES (?, ?)", (thread_id, time.time()))
+            if self.keep_last:
+                self._compact(thread_id, checkpoint_ns)
+        self._maybe_prune()
+
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """체크포인트에 연결된 중간 쓰기 저장"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        # 특수 쓰기(에러, 인터럽트 등)는 덮어쓰고, 일반 쓰기는 이미 저장된 경우 유지
+        rows = {"REPLACE": [], "IGNORE": []}
+        for idx, (channel, value) in enumerate(writes):
+            type_, serialized = self.serde.dumps_typed(value)
+            rows["REPLACE" if channel in WRITES_IDX_MAP else "IGNORE"].append(
+                (thread_id, checkpoint_ns, checkpoint_id, task_id, WRITES_IDX_MAP.get(channel, idx),
+                 channel, type_, serialized, task_path)
+            )
+        with self._lock, self.conn:
+            for conflict, params in rows.items():
+                if params:
+                    self.conn.executemany(f"INSERT OR {conflict} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", params)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """스레드의 모든 체크포인트와 쓰기 삭제"""
+        with self._lock, self.conn:
+            self._delete_threads([thread_id])
+
+    def _compact(self, thread_id: str, checkpoint_ns: str) -> None:
+        stale = self.conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+            (thread_id, checkpoint_ns, self.keep_last),
+        ).fetchall()
+        if not stale:
+            return
+        for table in ("checkpoints", "writes"):
+            self.conn.executemany(
+                f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                [(thread_id, checkpoint_ns, checkpoint_id) for checkpoint_id, in stale],
+            )
+
+    def _delete_threads(self, thread_ids: Sequence[str]) -> None:
+        params = [(thread_id,) for thread_id in thread_ids]
+        for table in ("checkpoints", "writes", "threads"):
+            self.conn.executemany(f"DELETE FROM {table} WHERE thread_id = ?", params)
+
+    def _maybe_prune(self) -> None:
+        if time.monotonic() - self._last_pruned >= self.prune_interval:
+            self.prune()
+
+    def prune(self) -> int:
+        """TTL이 지난 스레드와 max_threads를 넘는 오래된 스레드 삭제, 삭제한 스레드 수 반환"""
+        self._last_pruned = time.monotonic()
+        expired = []
+        with self._lock, self.conn:
+            if self.ttl is not None:
+                expired += self.conn.execute(
+                    "SELECT thread_id FROM threads WHERE updated_at < ?", (time.time() - self.ttl,)
+                ).fetchall()
+            if self.max_threads is not None:
+                expired += self.conn.execute(
+                    "SELECT thread_id FROM threads ORDER BY updated_at DESC LIMIT -1 OFFSET ?", (self.max_threads,)
+                ).fetchall()
+            thread_ids = list({thread_id for thread_id, in expired})
+            if thread_ids:
+                self._delete_threads(thread_ids)
+        if thread_ids:
+            logger.info(f"pruned {len(thread_ids)} checkpoint threads")
+        return len(thread_ids)
+
+    def stats(self) -> Dict[str, Any]:
+        """저장된 스레드/체크포인트/쓰기 개수"""
+        (threads,), = self._execute("SELECT COUNT(*) FROM threads")
+        (checkpoints,), = self._execute("SELECT COUNT(*) FROM checkpoints")
+        (writes,), = self._execute("SELECT COUNT(*) FROM writes")
+        return {
+            "path": self.path,
+            "threads": threads,
+            "checkpoints": checkpoints,
+            "writes": writes,
+            "ttl": self.ttl,
+            "max_threads": self.max_threads,
+            "keep_last": self.keep_last,
+        }
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(lambda: [*self.list(config, filter=filter, before=before, limit=limit)])
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def create_checkpointer(kind: str = CHECKPOINTER) -> BaseCheckpointSaver:
+    """환경변수 CHECKPOINTER(sqlite/memory)에 맞는 체크포인터 생성"""
+    if kind == "memory":
+        return MemorySaver()
+    if kind == "sqlite":
+        return SQLiteCheckpointSaver()
+    raise ValueError(f"지원하지 않는 체크포인터입니다: {kind}")
@@ -0,0 +1,125 @@
+from typing import List
+from langchain_core.embeddings import Embeddings
+from dotenv import load_dotenv
+import logging
+import os
+
+"""
+CPU 서빙용 임베딩 백엔드 선택
+
+EMBEDDING_BACKEND 환경변수로 같은 Embeddings 인터페이스 뒤의 실행 방식을 고릅니다.
+- huggingface: sentence-transformers PyTorch (기존 방식)
+- onnx: sentence-transformers ONNX Runtime 백엔드 (extra: uv sync --extra onnx)
+- onnx-int8: 동적 int8 양자화 ONNX 모델, export_int8_onnx()로 미리 만들어 둔 모델 디렉터리를 EMBEDDING_ONNX_INT8_PATH로 지정 (extra: onnx)
+- fastembed: fastembed(ONNX Runtime) 런타임, 지원 목록에 없는 모델은 커스텀 모델로 등록 (extra: uv sync --extra fastembed)
+
+백엔드마다 벡터가 조금씩 다르므로 test/embedding_benchmark.py로 기존 모델 대비 recall@10을 확인한 뒤 바꾸세요.
+"""
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "huggingface").lower()
+EMBEDDING_BACKENDS = ("huggingface", "onnx", "onnx-int8", "fastembed")
+EMBEDDING_ONNX_INT8_PATH = os.getenv("EMBEDDING_ONNX_INT8_PATH", "data/models/embedding-onnx-int8")
+EMBEDDING_ONNX_INT8_CONFIG = os.getenv("EMBEDDING_ONNX_INT8_CONFIG", "avx512_vnni")
+EMBEDDING_ONNX_INT8_FILE = os.getenv("EMBEDDING_ONNX_INT8_FILE", f"onnx/model_qint8_{EMBEDDING_ONNX_INT8_CONFIG}.onnx")
+# fastembed 지원 목록에 없는 모델을 등록할 때 쓰는 정보 (snowflake-arctic-embed-l-v2.0 기준)
+FASTEMBED_MODEL_FILE = os.getenv("FASTEMBED_MODEL_FILE", "onnx/model.onnx")
+FASTEMBED_ADDITIONAL_FILES = [file for file in os.getenv("FASTEMBED_ADDITIONAL_FILES", "onnx/model.onnx_data").split(",") if file]
+FASTEMBED_POOLING = os.getenv("FASTEMBED_POOLING", "CLS")
+FASTEMBED_DIM = int(os.getenv("FASTEMBED_DIM", 1024))
+FASTEMBED_THREADS = int(os.getenv("FASTEMBED_THREADS", 0)) or None
+
+
+class FastEmbedEmbeddings(Embeddings):
+    """fastembed TextEmbedding을 감싼 Embeddings"""
+
+    # 쿼리는 query_embed(모델별 쿼리 접두어 등)로 따로 계산하므로 문서 임베딩과 다를 수 있음
+    symmetric = False
+
+    def __init__(self, model_name: str, batch_size: int = 64, threads: int | None = FASTEMBED_THREADS):
+        from fastembed import TextEmbedding
+
+        supported = {model["model"].lower() for model in TextEmbedding.list_supported_models()}
+        if model_name.lower() not in supported:
+            from fastembed.common.model_description import ModelSource, PoolingType
+
+            logger.info(f"registering custom fastembed model: {model_name}")
+            TextEmbedding.add_custom_model(
+                model=model_name,
+                pooling=PoolingType[FASTEMBED_POOLING],
+                normalization=True,
+                sources=ModelSource(hf=model_name),
+                dim=FASTEMBED_DIM,
+                model_file=FASTEMBED_MODEL_FILE,
+                additional_files=FASTEMBED_ADDITIONAL_FILES,
+            )
+        self.model = TextEmbedding(model_name=model_name, threads=threads)
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [vector.tolist() for vector in self.model.embed(texts, batch_size=self.batch_size)]
+
+    def embed_query(self, text: str) -> List[float]:
+        return next(iter(self.model.query_embed(text))).tolist()
+
+
+def is_symmetric(embeddings: Embeddings) -> bool:
+    """
+    embed_query가 embed_documents와 같은 벡터를 내는지 (같으면 캐시/마이크로 배치에서 쿼리를 문서와 묶어서 계산)
+    symmetric 속성이 있으면 그 값, HuggingFaceEmbeddings는 query_encode_kwargs가 없을 때만, 그 밖에는 False
+    """
+    symmetric = getattr(embeddings, "symmetric", None)
+    if symmetric is not None:
+        return bool(symmetric)
+    if type(embeddings).__name__ == "HuggingFaceEmbeddings":
+        return not getattr(embeddings, "query_encode_kwargs", None)
+    return False
+
+
+def create_embeddings(model_name: str, backend: str = EMBEDDING_BACKEND) -> Embeddings:
+    """backend에 맞는 임베딩 모델 생성"""
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"지원하지 않는 임베딩 백엔드입니다: {backend} (가능한 값: {', '.join(EMBEDDING_BACKENDS)})")
+    logger.info(f"creating embeddings: {model_name} ({backend})")
+    if backend == "fastembed":
+        return FastEmbedEmbeddings(model_name)
+
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    if backend == "onnx":
+        return HuggingFaceEmbeddings(model_name=model_name, model_kwargs={"backend": "onnx"})
+    if backend == "onnx-int8":
+        if not os.path.isdir(EMBEDDING_ONNX_INT8_PATH):
+            raise FileNotFoundError(
+                f"int8 ONNX 모델이 없습니다: {EMBEDDING_ONNX_INT8_PATH} "
+                f"(python -m Agent.embedding_backends 로 먼저 만들어 주세요.)"
+            )
+        return HuggingFaceEmbeddings(
+            model_name=EMBEDDING_ONNX_INT8_PATH,
+            model_kwargs={"backend": "onnx", "model_kwargs": {"file_name": EMBEDDING_ONNX_INT8_FILE}},
+        )
+    return HuggingFaceEmbeddings(model_name=model_name)
+
+
+def export_int8_onnx(model_name: str, output_dir: str = EMBEDDING_ONNX_INT8_PATH, quantization_config: str = EMBEDDING_ONNX_INT8_CONFIG) -> str:
+    """
+    모델을 ONNX로 변환하고 동적 int8 양자화해 output_dir에 저장
+    quantization_config: arm64, avx2, avx512, avx512_vnni 중 서빙 CPU에 맞는 값
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    model = SentenceTransformer(model_name, backend="onnx")
+    model.save(output_dir)
+    export_dynamic_quantized_onnx_model(model, quantization_config, output_dir)
+    logger.info(f"exported int8 onnx model: {output_dir}")
+    return output_dir
+
+
+if __name__ == "__main__":
+    from Agent.qdrant_manager import EMBEDDING_MODEL_NAME
+
+    logging.basicConfig(level=logging.INFO)
+    export_int8_onnx(EMBEDDING_MODEL_NAME)
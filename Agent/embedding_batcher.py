@@ -0,0 +1,142 @@
+from typing import Any, Dict, List, Sequence, Tuple
+from concurrent.futures import Future
+from langchain_core.embeddings import Embeddings
+from dotenv import load_dotenv
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+
+"""
+동시 요청의 임베딩 호출을 마이크로 배치로 묶는 브로커
+
+API 요청마다 embed_query를 따로 호출하면 CPU 모델이 크기 1짜리 배치만 처리하게 됩니다.
+MicroBatchEmbeddings는 여러 스레드/코루틴의 호출을 큐에 모아 max_batch_size개가 차거나 max_wait_ms가 지나면
+전용 워커 스레드에서 한 번에 임베딩하고, 호출자별 Future에 결과를 나눠 돌려줍니다.
+"""
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MICRO_BATCH = os.getenv("EMBEDDING_MICRO_BATCH", "true").lower() == "true"
+EMBEDDING_MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", 32))
+EMBEDDING_MAX_WAIT_MS = float(os.getenv("EMBEDDING_MAX_WAIT_MS", 5))
+
+_STOP = object()
+
+
+class MicroBatchEmbeddings(Embeddings):
+    """
+    Embeddings를 감싸 동시 호출을 마이크로 배치로 묶는 래퍼
+    symmetric이면 쿼리도 embed_documents로 문서와 같은 배치에 넣고, 아니면 쿼리는 embed_query로 하나씩 계산합니다.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_batch_size: int = EMBEDDING_MAX_BATCH_SIZE,
+        max_wait_ms: float = EMBEDDING_MAX_WAIT_MS,
+        symmetric: bool = False,
+    ):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size는 1 이상이어야 합니다.")
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.symmetric = symmetric
+        self.batches = 0
+        self.items = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, texts: Sequence[str], kind: str = "document") -> Future:
+        """임베딩 요청을 큐에 넣고 Future 반환"""
+        future: Future = Future()
+        self._queue.put((list(texts), kind, future))
+        return future
+
+    def _collect(self) -> List[Tuple[List[str], str, Future]]:
+        # 첫 요청이 올 때까지 기다린 뒤, max_wait 동안 max_batch_size개까지 더 모음
+        first = self._queue.get()
+        if first is _STOP:
+            return []
+        requests = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if request is _STOP:
+                self._queue.put(_STOP)
+                break
+            requests.append(request)
+            size += len(request[0])
+        return requests
+
+    def _run(self) -> None:
+        while True:
+            requests = self._collect()
+            if not requests:
+                return
+            try:
+                self._process(requests)
+            except Exception as e:
+                for _, _, future in requests:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _process(self, requests: List[Tuple[List[str], str, Future]]) -> None:
+        batched = [request for request in requests if request[1] == "document" or self.symmetric]
+        texts = [text for request_texts, _, _ in batched for text in request_texts]
+        vectors = self.embeddings.embed_documents(texts) if texts else []
+        self.batches += 1
+        self.items += len(texts)
+
+        offset = 0
+        for request_texts, _, future in batched:
+            future.set_result(vectors[offset:offset + len(request_texts)])
+            offset += len(request_texts)
+        for request_texts, kind, future in requests:
+            if kind == "query" and not self.symmetric:
+                future.set_result([self.embeddings.embed_query(text) for text in request_texts])
+                self.items += len(request_texts)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self.submit(texts, "document").result()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.submit([text], "query").result()[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return await asyncio.wrap_future(self.submit(texts, "document"))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await asyncio.wrap_future(self.submit([text], "query")))[0]
+
+    def close(self) -> None:
+        """워커 스레드 종료 (남은 요청은 처리한 뒤 종료)"""
+        self._queue.put(_STOP)
+        self._worker.join()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
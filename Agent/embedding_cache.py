@@ -0,0 +1,155 @@
+from typing import Any, Dict, List, Sequence
+from langchain_core.embeddings import Embeddings
+from dotenv import load_dotenv
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import numpy as np
+
+from db.cache import TTLCache
+
+"""
+임베딩 결과 캐시
+
+에이전트는 같은 음식 이름과 태그를 반복해서 검색하는데, 매번 CPU에서 임베딩 모델을 다시 실행합니다.
+CachedEmbeddings는 Embeddings를 감싸 (모델 이름 + 쿼리/문서 구분 + 텍스트)의 해시를 키로
+메모리 LRU와 선택적인 SQLite 디스크 저장소에 임베딩을 보관하고, 없는 텍스트만 모아 한 번에 임베딩합니다.
+메모리에는 float32 배열로 보관하고(1024차원 1만 개 약 40MB), 문서 적재(embed_documents)는 한 번 쓰고 마는
+텍스트가 대부분이라 메모리를 거치지 않고 디스크 캐시만 사용합니다.
+"""
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", 10000))
+EMBEDDING_CACHE_TTL = float(os.getenv("EMBEDDING_CACHE_TTL", 0)) or None
+# 빈 문자열이면 디스크 캐시를 사용하지 않음
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "data/embedding_cache/embeddings.sqlite")
+
+
+class CachedEmbeddings(Embeddings):
+    """메모리 LRU + 디스크(SQLite) 임베딩 캐시 래퍼"""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        maxsize: int = EMBEDDING_CACHE_SIZE,
+        ttl: float | None = EMBEDDING_CACHE_TTL,
+        path: str | None = EMBEDDING_CACHE_PATH,
+        symmetric: bool = False,
+    ):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        # 쿼리와 문서를 같은 방식으로 임베딩하는 모델이면 쿼리도 embed_documents로 묶어서 계산하고 캐시를 공유
+        self.symmetric = symmetric
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.path = path or None
+        self.disk_hits = 0
+        self.computed = 0
+        self._lock = threading.RLock()
+        self.conn = None
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            logger.info(f"embedding disk cache opened: {self.path}")
+
+    def key(self, text: str, kind: str) -> str:
+        """캐시 키: 모델 이름, 쿼리/문서 구분, 텍스트의 sha256"""
+        return hashlib.sha256(f"{self.model_name}\0{kind}\0{text}".encode("utf-8")).hexdigest()
+
+    def _load_disk(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        if self.conn is None or not keys:
+            return {}
+        found = {}
+        with self._lock:
+            # SQLite 바인딩 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self.conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update({key: np.frombuffer(vector, dtype=np.float32) for key, vector in rows})
+        return found
+
+    def _save_disk(self, items: Dict[str, np.ndarray]) -> None:
+        if self.conn is None or not items:
+            return
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                [(key, vector.tobytes()) for key, vector in items.items()],
+            )
+
+    def _embed(self, texts: Sequence[str], kind: str, use_memory: bool = True) -> List[List[float]]:
+        if self.symmetric:
+            kind = "document"
+        keys = [self.key(text, kind) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+        if use_memory:
+            for key in keys:
+                if key not in vectors and (vector := self.memory.get(key)) is not None:
+                    vectors[key] = vector
+
+        missing = list(dict.fromkeys(key for key in keys if key not in vectors))
+        from_disk = self._load_disk(missing)
+        if use_memory:
+            for key, vector in from_disk.items():
+                self.memory.set(key, vector)
+        vectors.update(from_disk)
+        self.disk_hits += len(from_disk)
+
+        # 캐시에 없는 텍스트만 중복 없이 모아 한 번에 임베딩
+        pending = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if pending:
+            if kind == "query":
+                computed = [self.embeddings.embed_query(text) for text in pending.values()]
+            else:
+                computed = self.embeddings.embed_documents(list(pending.values()))
+            new_vectors = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(pending.keys(), computed)}
+            if use_memory:
+                for key, vector in new_vectors.items():
+                    self.memory.set(key, vector)
+            self._save_disk(new_vectors)
+            vectors.update(new_vectors)
+            self.computed += len(new_vectors)
+
+        return [vectors[key].tolist() for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """문서 임베딩 (적재용이라 메모리 LRU를 거치지 않고 디스크 캐시만 사용)"""
+        return self._embed(texts, "document", use_memory=False)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text], "query")[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """여러 쿼리 임베딩 (캐시에 없는 쿼리만 계산, symmetric이면 한 번의 forward pass)"""
+        return self._embed(texts, "query")
+
+    def clear(self) -> None:
+        """메모리와 디스크 캐시 모두 비우기"""
+        self.memory.clear()
+        if self.conn is not None:
+            with self._lock, self.conn:
+                self.conn.execute("DELETE FROM embeddings")
+
+    def stats(self) -> Dict[str, Any]:
+        """메모리 적중/실패, 디스크 적중, 새로 계산한 임베딩 수"""
+        disk_size = None
+        if self.conn is not None:
+            with self._lock:
+                (disk_size,), = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchall()
+        return {
+            "model_name": self.model_name,
+            "memory": self.memory.stats(),
+            "disk_path": self.path,
+            "disk_size": disk_size,
+            "disk_hits": self.disk_hits,
+            "computed": self.computed,
+        }
@@ -0,0 +1,111 @@
+from typing import Any, Dict, Hashable, Tuple
+from dotenv import load_dotenv
+import hashlib
+import json
+import logging
+import math
+import os
+import numpy as np
+
+from db.cache import TTLCache
+from Agent.tools.dri_calculator import DRI_AGE_BANDS
+from model.schemas.agent import NutrientData, UserProfile
+from Agent.prompts.prompt import recommender_prompt
+
+"""
+권장 영양성분(NutrientData) 캐시
+
+nutrient_recommender -> set_nutrient_table 결과는 사용자 프로필의 신체/건강 정보에만 의존하므로,
+DRI 연령 구간과 나이대, 반올림한 키/몸무게 등으로 정규화한 프로필을 키로 캐싱해 비슷한 프로필의 LLM + retriever 호출을 생략합니다.
+키에는 recommender 프롬프트와 NutrientData 스키마의 해시가 포함되어, 프롬프트가 바뀌면 이전 결과는 자동으로 적중하지 않습니다.
+"""
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+NUTRIENT_CACHE_SIZE = int(os.getenv("NUTRIENT_CACHE_SIZE", 4096))
+NUTRIENT_CACHE_TTL = float(os.getenv("NUTRIENT_CACHE_TTL", 60 * 60 * 24 * 7))
+NUTRIENT_CACHE_ENABLED = os.getenv("NUTRIENT_CACHE_ENABLED", "true").lower() == "true"
+# 프로필 구간 크기 (나이: 세, 키: cm, 몸무게: kg), 나이 구간은 DRI 연령 구간 안에서만 나눔
+AGE_BAND = int(os.getenv("NUTRIENT_CACHE_AGE_BAND", 5))
+HEIGHT_STEP = float(os.getenv("NUTRIENT_CACHE_HEIGHT_STEP", 5))
+WEIGHT_STEP = float(os.getenv("NUTRIENT_CACHE_WEIGHT_STEP", 2))
+
+_GENDERS = {"남성": "male", "남자": "male", "남": "male", "male": "male", "m": "male",
+            "여성": "female", "여자": "female", "여": "female", "female": "female", "f": "female"}
+
+
+def prompt_fingerprint() -> str:
+    """recommender 프롬프트와 출력 스키마의 해시 (프롬프트 변경 시 캐시 무효화용)"""
+    payload = json.dumps({
+        "messages": [repr(message) for message in recommender_prompt.messages],
+        "schema": NutrientData.model_json_schema(),
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _bucket(value: float, step: float) -> float:
+    return math.floor(value / step) * step
+
+
+def age_key(age: int) -> Tuple[int, float]:
+    """(DRI 연령 구간 번호, 나이대), 권장량이 다른 DRI 구간(예: 18세와 19세)이 한 키로 묶이지 않도록 구간 번호를 먼저 둠"""
+    band = int(np.searchsorted(DRI_AGE_BANDS, age, side="right") - 1)
+    return band, _bucket(age, AGE_BAND)
+
+
+def profile_key(profile: UserProfile | Dict[str, Any]) -> Tuple[Hashable, ...]:
+    """영양 권장량에 영향을 주는 필드만 구간화/정규화한 프로필 키 (선호/비선호 음식은 제외)"""
+    if isinstance(profile, dict):
+        profile = UserProfile(**profile)
+    gender = profile.gender.strip().lower()
+    return (
+        age_key(profile.age),
+        _GENDERS.get(gender, gender),
+        _bucket(profile.height, HEIGHT_STEP),
+        _bucket(profile.weight, WEIGHT_STEP),
+        profile.activity_level.strip().lower(),
+        tuple(sorted({disease.strip() for disease in profile.diseases if disease.strip()})),
+    )
+
+
+class NutrientCache:
+    """정규화된 프로필 -> 권장 영양성분(dict) 캐시"""
+
+    def __init__(self, maxsize: int = NUTRIENT_CACHE_SIZE, ttl: float | None = NUTRIENT_CACHE_TTL, enabled: bool = NUTRIENT_CACHE_ENABLED):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.enabled = enabled
+        self.fingerprint = prompt_fingerprint()
+
+    def key(self, profile: UserProfile | Dict[str, Any]) -> Tuple[Hashable, ...]:
+        return (self.fingerprint, *profile_key(profile))
+
+    def get(self, profile: UserProfile | Dict[str, Any]) -> Dict[str, Any] | None:
+        """캐시된 권장 영양성분 조회, 없으면 None"""
+        if not self.enabled:
+            return None
+        nutrient_table = self.cache.get(self.key(profile))
+        return dict(nutrient_table) if nutrient_table is not None else None
+
+    def set(self, profile: UserProfile | Dict[str, Any], nutrient_table: NutrientData | Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        if isinstance(nutrient_table, NutrientData):
+            nutrient_table = nutrient_table.model_dump()
+        self.cache.set(self.key(profile), dict(nutrient_table))
+
+    def invalidate(self, profile: UserProfile | Dict[str, Any] | None = None) -> None:
+        """프로필 하나 또는 전체 무효화, 프롬프트 해시도 다시 계산합니다."""
+        if profile is not None:
+            self.cache.invalidate(self.key(profile))
+            return
+        self.cache.clear()
+        self.fingerprint = prompt_fingerprint()
+        logger.info(f"nutrient cache cleared (prompt fingerprint: {self.fingerprint})")
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.cache.stats(), "enabled": self.enabled, "prompt_fingerprint": self.fingerprint}
+
+
+nutrient_cache = NutrientCache()
@@ -70,8 +70,9 @@ trans_fat_g: 권장 일일 트랜스지방 (g)
 2. 이전 단계에서 도출된 **권장 영양성분표**는 식단의 영양 균형을 맞추는 데 핵심적인 가이드라인으로 활용하십시오.
 3. **식단 생성 키워드**는 사용자의 특정 식단 목표나 선호도(예: 저탄고지, 고단백, 비건, 간편식 등)를 반영하는 데 사용하십시오. 식단 구성 중 영양학적 근거가 필요하거나 특정 영양소에 대한 추가 정보가 필요하다고 판단되면, `retriever` 툴을 활용하여 정보를 검색하십시오.
 4. 특정 음식의 영양 정보가 필요하다면, `get_food_nutrient` 툴을 사용하여 음식의 9가지 영양 정보를 가져오십시오.
+   비선호 음식이나 질병 때문에 음식을 바꿔야 한다면, `search_similar_foods` 툴에 기준 음식 이름과 대분류(예: 밥류), 제외할 태그를 전달하여 조건에 맞는 비슷한 음식을 찾으십시오.
 5. **일주일(7일) 치 식단**을 생성해야 합니다. 각 날짜별, 그리고 시간별 식단을 포함하십시오. 각 식단에 포함되는 **음식 항목의 영양 정보는 다음 과정을 통해 정확하게 확인한 후 기입하십시오:**
-    * 먼저, `get_food_nutrient` 툴을 사용하여 식단으로할 음식의 9가지 영양 정보를 가져오십시오.
+    * 먼저, `get_food_nutrient` 툴을 사용하여 식단으로할 음식의 9가지 영양 정보를 가져오십시오. 음식이 여러 개라면 `get_food_nutrients` 툴에 음식 이름 목록을 전달하여 한 번에 가져오십시오.
     * 날짜 별로 영양성분을 합산하여 일일 영양성분을 계산하십시오.
 6. 일주일 치 식단을 생성한 후, 해당 식단 데이터를 **`generate_weekly_meal_plan` 툴의 `WeeklyMealPlan` Pydantic 클래스 형식에 맞춰** 구성하십시오. 이 클래스는 각 날짜('YYYY-MM-DD' 형식), 식사 시간('HH:MM' 형식), 각 음식의 이름, 그리고 일일 영양 정보를 포함해야 합니다. 
 7. 구성된 식단 데이터를 **`generate_weekly_meal_plan` 툴의 `meal_plan` 인자로 전달하여 툴을 호출하고, 해당 툴의 출력을 최종 결과로 반환하십시오.** 다른 형식의 출력은 허용되지 않습니다.
@@ -1,17 +1,32 @@
 from langchain_qdrant import QdrantVectorStore, RetrievalMode
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.embeddings import Embeddings
 from pydantic import BaseModel
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams, PointStruct, ScoredPoint
-from typing import List
+from qdrant_client.http.models import (
+    Distance, VectorParams, PointStruct, ScoredPoint, QueryRequest, Filter, PointIdsList,
+    FieldCondition, MatchAny, MatchValue, PayloadSchemaType,
+    SparseVectorParams, SparseVector, Modifier, Prefetch, FusionQuery, Fusion,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType, BinaryQuantization, BinaryQuantizationConfig,
+    Disabled, HnswConfigDiff, VectorParamsDiff, SearchParams, QuantizationSearchParams,
+)
+from typing import Any, Dict, Iterable, List, Sequence, Set
 from langchain_core.documents import Document
 from dotenv import load_dotenv
 from tqdm import tqdm
-from uuid import uuid4
+from uuid import NAMESPACE_URL, uuid5
+from Agent.embedding_cache import CachedEmbeddings
+from Agent.embedding_backends import EMBEDDING_BACKEND, create_embeddings, is_symmetric
+from Agent.embedding_batcher import EMBEDDING_MICRO_BATCH, MicroBatchEmbeddings
+from Agent.sparse_embeddings import SPARSE_BACKEND, create_sparse_embeddings
+from langchain_qdrant import SparseEmbeddings
+from db.cache import singleton
+import hashlib
+import itertools
+import json
 import os
 import logging
-# from langchain_community.embeddings.fastembed import FastEmbedEmbeddings
+import queue
+import threading
 
 load_dotenv()
 
@@ -20,6 +35,27 @@ QDRANT_PORT = os.getenv("QDRANT_PORT", 6333)
 DOCS_COLLECTION_NAME = os.getenv("DOCS_COLLECTION_NAME", "food_docs")
 FOOD_COLLECTION_NAME = os.getenv("FOOD_COLLECTION_NAME", "food_name")
 TAG_COLLECTION_NAME = os.getenv("TAG_COLLECTION_NAME", "food_tag")
+# add_documents 업로드 스레드 수와 임베딩이 끝난 배치를 쌓아 둘 큐 크기
+QDRANT_UPSERT_WORKERS = int(os.getenv("QDRANT_UPSERT_WORKERS", 4))
+QDRANT_UPSERT_QUEUE_SIZE = int(os.getenv("QDRANT_UPSERT_QUEUE_SIZE", 8))
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "Snowflake/snowflake-arctic-embed-l-v2.0")
+# dense + sparse(BM25) 하이브리드 검색을 쓸 컬렉션 (쉼표 구분, 빈 값이면 모두 dense)
+HYBRID_COLLECTIONS = [name.strip() for name in os.getenv("HYBRID_COLLECTIONS", FOOD_COLLECTION_NAME).split(",") if name.strip()]
+SPARSE_VECTOR_NAME = "sparse"
+# 하이브리드 검색에서 dense/sparse 각각 limit의 몇 배를 후보로 가져와 RRF로 합칠지
+HYBRID_PREFETCH_FACTOR = int(os.getenv("HYBRID_PREFETCH_FACTOR", 4))
+# 벡터 저장 방식 프리셋 (STORAGE_PRESETS 참고), 컬렉션별로는 "food_docs=binary,food_name=scalar"처럼 지정
+QDRANT_STORAGE_PRESET = os.getenv("QDRANT_STORAGE_PRESET", "memory")
+QDRANT_COLLECTION_PRESETS = dict(
+    item.strip().split("=", 1) for item in os.getenv("QDRANT_COLLECTION_PRESETS", "").split(",") if "=" in item
+)
+# HNSW 그래프 설정 (빈 값이면 프리셋/서버 기본값)
+QDRANT_HNSW_M = int(os.getenv("QDRANT_HNSW_M", 0)) or None
+QDRANT_HNSW_EF_CONSTRUCT = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", 0)) or None
+# 검색 시 설정: hnsw_ef, 양자화 컬렉션에서 원본 벡터로 다시 점수 계산(rescore)할지와 후보 배수(oversampling)
+QDRANT_SEARCH_HNSW_EF = int(os.getenv("QDRANT_SEARCH_HNSW_EF", 0)) or None
+QDRANT_RESCORE = os.getenv("QDRANT_RESCORE", "true").lower() == "true"
+QDRANT_OVERSAMPLING = float(os.getenv("QDRANT_OVERSAMPLING", 2.0))
 logging_level = os.getenv("LOGGING_LEVEL", "INFO").upper()
 
 logging.basicConfig(level={
@@ -34,10 +70,99 @@ logger = logging.getLogger(__name__)
 httpx_logger = logging.getLogger("httpx")
 httpx_logger.setLevel(logging.CRITICAL)
 
-logger.info("loading embeddings")
-ko_embeddings = HuggingFaceEmbeddings(model_name="Snowflake/snowflake-arctic-embed-l-v2.0")
-dimension = len(ko_embeddings.embed_query("test"))
-logger.info("loaded embeddings")
+
+# 임베딩 모델 로딩(수십 초)과 Qdrant 연결은 import 시점이 아니라 처음 필요할 때 한 번만 수행합니다.
+@singleton
+def get_embeddings() -> CachedEmbeddings:
+    """기본 임베딩 모델 (프로세스 단위 싱글톤)"""
+    logger.info("loading embeddings")
+    # 같은 음식 이름/태그를 반복 검색하므로 임베딩 결과를 메모리와 디스크에 캐싱
+    # 쿼리와 문서 임베딩이 같은 백엔드(symmetric)면 쿼리도 문서와 묶어서 계산, fastembed처럼 쿼리를 따로 인코딩하면 따로 계산
+    # 백엔드마다 벡터가 조금씩 달라 캐시 키의 모델 이름에 백엔드를 포함
+    cache_name = EMBEDDING_MODEL_NAME if EMBEDDING_BACKEND == "huggingface" else f"{EMBEDDING_MODEL_NAME}@{EMBEDDING_BACKEND}"
+    model = create_embeddings(EMBEDDING_MODEL_NAME, EMBEDDING_BACKEND)
+    symmetric = is_symmetric(model)
+    if EMBEDDING_MICRO_BATCH:
+        # 동시 요청의 캐시 미스를 마이크로 배치로 묶어 한 번의 forward pass로 처리
+        model = MicroBatchEmbeddings(model, symmetric=symmetric)
+    embeddings = CachedEmbeddings(model, model_name=cache_name, symmetric=symmetric)
+    logger.info("loaded embeddings")
+    return embeddings
+
+
+@singleton
+def get_sparse_embeddings() -> SparseEmbeddings:
+    """기본 희소 임베딩 (프로세스 단위 싱글톤)"""
+    return create_sparse_embeddings(SPARSE_BACKEND)
+
+
+@singleton
+def get_embedding_dimension() -> int:
+    """기본 임베딩 모델의 벡터 차원"""
+    return len(get_embeddings().embed_query("test"))
+
+
+# 포인트 id 네임스페이스 (같은 키는 항상 같은 id)
+POINT_ID_NAMESPACE = uuid5(NAMESPACE_URL, "qdrant-points")
+
+
+def content_hash(document: Document) -> str:
+    """문서 내용과 메타데이터의 sha256 (payload의 content_hash로 저장해 변경 여부 판단)"""
+    metadata = json.dumps(document.metadata, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(f"{document.page_content}\0{metadata}".encode("utf-8")).hexdigest()
+
+
+def point_id(document: Document) -> str:
+    """
+    문서의 결정적 포인트 id (UUIDv5)
+    document.id(예: food_id, tag_id, 출처+청크 번호)가 있으면 그 값으로, 없으면 내용 해시로 만듭니다.
+    """
+    return str(uuid5(POINT_ID_NAMESPACE, document.id or content_hash(document)))
+
+
+class _IngestProgress:
+    """add_documents의 배치 완료 기록 (앞에서부터 연속으로 완료된 배치의 내용 해시 목록을 JSON 파일에 저장)"""
+
+    def __init__(self, path: str | None, collection_name: str, batch_size: int):
+        self.path = path
+        self.key = {"collection_name": collection_name, "batch_size": batch_size}
+        self.saved: List[str] = []
+        self.done: List[str] = []
+        self.pending: Dict[int, str] = {}
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            # 같은 컬렉션, 같은 배치 크기일 때만 이어서 진행
+            if all(saved.get(key) == value for key, value in self.key.items()):
+                self.saved = saved.get("batches", [])
+
+    @staticmethod
+    def digest(hashes: List[str]) -> str:
+        return hashlib.sha256("".join(hashes).encode("utf-8")).hexdigest()
+
+    def is_done(self, batch_index: int, digest: str) -> bool:
+        """지난 실행에서 같은 내용으로 완료된 배치인지"""
+        return batch_index < len(self.saved) and self.saved[batch_index] == digest
+
+    def complete(self, batch_index: int, digest: str):
+        with self.lock:
+            self.pending[batch_index] = digest
+            advanced = False
+            while len(self.done) in self.pending:
+                self.done.append(self.pending.pop(len(self.done)))
+                advanced = True
+            if advanced and self.path:
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({**self.key, "batches": self.done}, f)
+                os.replace(tmp_path, self.path)
+
+    def finish(self):
+        """모두 완료되면 기록 삭제 (다음 실행은 content_hash로 바뀐 문서만 다시 올림)"""
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
 
 class Collections(BaseModel):
     food_docs_collection: str = DOCS_COLLECTION_NAME
@@ -46,70 +171,448 @@ class Collections(BaseModel):
 
 collections = Collections()
 
+# 컬렉션별 payload 인덱스 (필터 검색에 쓰는 metadata 필드)
+PAYLOAD_INDEXES: Dict[str, Dict[str, PayloadSchemaType]] = {
+    collections.food_name_collection: {
+        "food_id": PayloadSchemaType.KEYWORD,
+        "major_category_name": PayloadSchemaType.KEYWORD,
+        "data_type_code": PayloadSchemaType.KEYWORD,
+        "tags": PayloadSchemaType.KEYWORD,
+    },
+    collections.food_tag_collection: {
+        "tag_id": PayloadSchemaType.KEYWORD,
+    },
+    collections.food_docs_collection: {
+        "source": PayloadSchemaType.KEYWORD,
+    },
+}
+
+
+class StoragePreset(BaseModel):
+    """컬렉션 벡터 저장 방식"""
+    on_disk: bool = False  # 원본 float32 벡터를 디스크(mmap)에 둘지
+    quantization: str | None = None  # None, "scalar"(int8, 1/4 크기), "binary"(1bit, 1/32 크기)
+    hnsw_m: int | None = None
+    hnsw_ef_construct: int | None = None
+
+
+# 양자화 벡터는 항상 RAM에 두고(always_ram), 원본 벡터는 rescore할 때만 디스크에서 읽음
+STORAGE_PRESETS: Dict[str, StoragePreset] = {
+    "memory": StoragePreset(),
+    "on_disk": StoragePreset(on_disk=True),
+    "scalar": StoragePreset(on_disk=True, quantization="scalar"),
+    "binary": StoragePreset(on_disk=True, quantization="binary", hnsw_m=32, hnsw_ef_construct=256),
+}
+
+
+def get_storage_preset(collection_name: str) -> StoragePreset:
+    """컬렉션에 적용할 저장 프리셋 (QDRANT_COLLECTION_PRESETS > QDRANT_STORAGE_PRESET, HNSW 환경변수가 있으면 덮어씀)"""
+    name = QDRANT_COLLECTION_PRESETS.get(collection_name, QDRANT_STORAGE_PRESET)
+    if name not in STORAGE_PRESETS:
+        raise ValueError(f"지원하지 않는 저장 프리셋입니다: {name} (가능한 값: {', '.join(STORAGE_PRESETS)})")
+    preset = STORAGE_PRESETS[name]
+    return preset.model_copy(update={
+        "hnsw_m": QDRANT_HNSW_M or preset.hnsw_m,
+        "hnsw_ef_construct": QDRANT_HNSW_EF_CONSTRUCT or preset.hnsw_ef_construct,
+    })
+
+
+def quantization_config(preset: StoragePreset) -> ScalarQuantization | BinaryQuantization | None:
+    if preset.quantization is None:
+        return None
+    if preset.quantization == "scalar":
+        return ScalarQuantization(scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True))
+    if preset.quantization == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    raise ValueError(f"지원하지 않는 양자화 방식입니다: {preset.quantization} (가능한 값: scalar, binary)")
+
+
+def hnsw_config(preset: StoragePreset) -> HnswConfigDiff | None:
+    if preset.hnsw_m is None and preset.hnsw_ef_construct is None:
+        return None
+    return HnswConfigDiff(m=preset.hnsw_m, ef_construct=preset.hnsw_ef_construct)
+
+
+def _field_conditions(fields: Dict[str, Any] | None) -> List[FieldCondition]:
+    conditions = []
+    for field, value in (fields or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            if not value:
+                continue
+            match = MatchAny(any=list(value))
+        else:
+            match = MatchValue(value=value)
+        conditions.append(FieldCondition(key=f"metadata.{field}", match=match))
+    return conditions
+
+
+def build_filter(must: Dict[str, Any] | None = None, must_not: Dict[str, Any] | None = None) -> Filter | None:
+    """
+    metadata 필드 조건으로 Qdrant Filter 생성 (조건이 없으면 None)
+    값이 목록이면 그중 하나와 일치(배열 필드는 원소 중 하나라도 일치), None이나 빈 목록은 무시합니다.
+    예: build_filter(must={"major_category_name": "밥류"}, must_not={"tags": ["매운맛"]})
+    """
+    must_conditions, must_not_conditions = _field_conditions(must), _field_conditions(must_not)
+    if not must_conditions and not must_not_conditions:
+        return None
+    return Filter(must=must_conditions or None, must_not=must_not_conditions or None)
+
 class QdrantManager:
     def __init__(
             self, 
             host: str = QDRANT_HOST, 
             port: int = QDRANT_PORT, 
             collection_names: Collections = collections, 
-            embedding_model: Embeddings = ko_embeddings,
-            dim: int = dimension
+            embedding_model: Embeddings | None = None,
+            dim: int | None = None,
+            hybrid_collections: Sequence[str] = HYBRID_COLLECTIONS,
+            sparse_embedding: SparseEmbeddings | None = None,
+            search_params: SearchParams | None = None,
         ):
         logger.info(f"initializing qdrant manager with host: {host}, port: {port}")
         self.client = QdrantClient(url=f"http://{host}:{port}")
         self.collection_names = collection_names
-        self.embedding_model = embedding_model
+        self.embedding_model = embedding_model or get_embeddings()
+        if dim is None:
+            dim = get_embedding_dimension() if embedding_model is None else len(self.embedding_model.embed_query("test"))
         self.dim = dim
+        self.hybrid_collections = set(hybrid_collections)
+        self.sparse_embedding = sparse_embedding or (get_sparse_embeddings() if self.hybrid_collections else None)
+        self._hybrid: Dict[str, bool] = {}
+        self.search_params = search_params or SearchParams(
+            hnsw_ef=QDRANT_SEARCH_HNSW_EF,
+            quantization=QuantizationSearchParams(rescore=QDRANT_RESCORE, oversampling=QDRANT_OVERSAMPLING),
+        )
         for collection_name in self.collection_names.model_dump().values():
             if not self.client.collection_exists(collection_name):
-                self.client.create_collection(
-                    collection_name=collection_name,
-                    vectors_config=VectorParams(
-                        size=self.dim,
-                        distance=Distance.COSINE
-                    ),
-                )
-                logger.info(f"created collection: {collection_name}")
+                self.create_collection(collection_name)
+            self.ensure_payload_indexes(collection_name)
+
+    def create_collection(self, collection_name: str, preset: StoragePreset | None = None):
+        """
+        dense 벡터 컬렉션 생성 (하이브리드 컬렉션이면 IDF 희소 벡터도 함께)
+        preset이 없으면 get_storage_preset(collection_name)의 저장 방식(on_disk, 양자화, HNSW)을 따릅니다.
+        """
+        preset = preset or get_storage_preset(collection_name)
+        self.client.create_collection(
+            collection_name=collection_name,
+            vectors_config=VectorParams(
+                size=self.dim,
+                distance=Distance.COSINE,
+                on_disk=preset.on_disk,
+            ),
+            sparse_vectors_config={
+                SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF)
+            } if collection_name in self.hybrid_collections else None,
+            quantization_config=quantization_config(preset),
+            hnsw_config=hnsw_config(preset),
+        )
+        self._hybrid.pop(collection_name, None)
+        logger.info(f"created collection: {collection_name} ({preset.model_dump(exclude_none=True)})")
+
+    def apply_storage_preset(self, collection_name: str, preset: StoragePreset | None = None):
+        """
+        기존 컬렉션의 저장 방식을 preset으로 변경 (재적재 없이 Qdrant가 백그라운드에서 세그먼트를 다시 만듦)
+        """
+        preset = preset or get_storage_preset(collection_name)
+        self.client.update_collection(
+            collection_name=collection_name,
+            vectors_config={"": VectorParamsDiff(on_disk=preset.on_disk)},
+            quantization_config=quantization_config(preset) or Disabled.DISABLED,
+            hnsw_config=hnsw_config(preset),
+        )
+        logger.info(f"applied storage preset to {collection_name}: {preset.model_dump(exclude_none=True)}")
+
+    def is_hybrid(self, collection_name: str) -> bool:
+        """하이브리드 검색 대상이고 컬렉션에 희소 벡터가 있는지"""
+        if collection_name not in self._hybrid:
+            hybrid = False
+            if collection_name in self.hybrid_collections:
+                sparse_vectors = self.client.get_collection(collection_name).config.params.sparse_vectors or {}
+                hybrid = SPARSE_VECTOR_NAME in sparse_vectors
+                if not hybrid:
+                    logger.warning(f"{collection_name} has no sparse vectors; using dense search until the collection is reset and re-ingested")
+            self._hybrid[collection_name] = hybrid
+        return self._hybrid[collection_name]
+
+    def ensure_payload_indexes(self, collection_name: str):
+        """PAYLOAD_INDEXES에 정의된 인덱스 중 없는 것만 생성"""
+        indexes = PAYLOAD_INDEXES.get(collection_name, {})
+        if not indexes:
+            return
+        existing = self.client.get_collection(collection_name).payload_schema or {}
+        for field, schema in indexes.items():
+            key = f"metadata.{field}"
+            if key not in existing:
+                self.client.create_payload_index(collection_name=collection_name, field_name=key, field_schema=schema, wait=True)
+                logger.info(f"created payload index: {collection_name}.{key}")
 
     def get_retriever(self, collection_name: str):
+        if self.is_hybrid(collection_name):
+            return QdrantVectorStore(
+                client=self.client,
+                collection_name=collection_name,
+                embedding=self.embedding_model,
+                sparse_embedding=self.sparse_embedding,
+                sparse_vector_name=SPARSE_VECTOR_NAME,
+                retrieval_mode=RetrievalMode.HYBRID,
+            ).as_retriever(search_kwargs={"search_params": self.search_params})
         return QdrantVectorStore(
             client=self.client,
             collection_name=collection_name,
             embedding=self.embedding_model,
             retrieval_mode=RetrievalMode.DENSE,
-        ).as_retriever()
-
-    def add_documents(self, documents: List[Document], collection_name: str, batch_size: int = 100):
-        
-        texts = list(map(lambda x: x.page_content, documents))
-        metadatas = list(map(lambda x: x.metadata, documents))
-        # ids = list(map(lambda x: str(uuid4()), documents))
-        for i in tqdm(range(0, len(texts), batch_size), desc=f"Adding documents to qdrant {collection_name}"):
-            if i + batch_size >= len(texts):
-                last = -1
-            else:
-                last = i + batch_size
-            embeddings = self.embedding_model.embed_documents(texts[i:last])
-            self.client.upsert(
+        ).as_retriever(search_kwargs={"search_params": self.search_params})
+
+    def reset_collection(self, collection_name: str):
+        """컬렉션을 지우고 같은 설정으로 다시 생성"""
+        if self.client.collection_exists(collection_name):
+            self.client.delete_collection(collection_name)
+        self.create_collection(collection_name)
+        self.ensure_payload_indexes(collection_name)
+        logger.info(f"reset collection: {collection_name}")
+
+    def add_documents(
+            self, 
+            documents: Iterable[Document], 
+            collection_name: str, 
+            batch_size: int = 100,
+            upsert_workers: int = QDRANT_UPSERT_WORKERS,
+            queue_size: int = QDRANT_UPSERT_QUEUE_SIZE,
+            progress_path: str | None = None,
+        ) -> Set[str]:
+        """
+        문서를 임베딩해 컬렉션에 추가하고 입력 문서의 포인트 id 집합을 반환 (임베딩과 업로드를 파이프라인으로 겹쳐 실행)
+        documents는 제너레이터도 되며 batch_size개씩 읽어 처리하므로, 메모리에는 배치와 큐에 쌓인 배치만 올라갑니다.
+        포인트 id는 point_id()로 정해지고, 이미 같은 content_hash로 저장된 문서는 임베딩과 업로드를 건너뜁니다.
+        현재 스레드가 바뀐 문서만 임베딩해 크기가 queue_size인 큐에 넣고, upsert_workers개의 스레드가 wait=False로 업로드합니다.
+        마지막으로 바뀐 배치는 모든 업로드가 끝난 뒤 wait=True로 올려 전체 반영을 기다리는 장벽으로 씁니다.
+        progress_path를 주면 완료된 배치를 기록해, 중단 후 다시 실행하면 내용이 같은 앞쪽 배치는 조회 없이 건너뜁니다.
+        """
+        progress = _IngestProgress(progress_path, collection_name, batch_size)
+        if progress.saved:
+            logger.info(f"resuming {collection_name}: {len(progress.saved)} batches recorded")
+        ids: Set[str] = set()
+        hybrid = self.is_hybrid(collection_name)
+
+        def make_points(batch: List[Document], batch_ids: List[str], hashes: List[str]) -> List[PointStruct]:
+            stored = {
+                str(point.id): point.payload.get("content_hash")
+                for point in self.client.retrieve(
+                    collection_name=collection_name,
+                    ids=batch_ids,
+                    with_payload=["content_hash"],
+                    with_vectors=False,
+                )
+            }
+            changed = [j for j in range(len(batch)) if stored.get(batch_ids[j]) != hashes[j]]
+            if not changed:
+                return []
+            texts = [batch[j].page_content for j in changed]
+            embeddings = self.embedding_model.embed_documents(texts)
+            if hybrid:
+                embeddings = [
+                    {"": embedding, SPARSE_VECTOR_NAME: SparseVector(indices=sparse.indices, values=sparse.values)}
+                    for embedding, sparse in zip(embeddings, self.sparse_embedding.embed_documents(texts))
+                ]
+            return [
+                PointStruct(
+                    vector=embedding,
+                    payload={"page_content": batch[j].page_content, "metadata": batch[j].metadata, "content_hash": hashes[j]},
+                    id=batch_ids[j]
+                )
+                for embedding, j in zip(embeddings, changed)
+            ]
+
+        batches: queue.Queue = queue.Queue(maxsize=queue_size)
+        errors: List[Exception] = []
+
+        def upsert_worker():
+            while True:
+                item = batches.get()
+                if item is None:
+                    return
+                i, digest, points = item
+                try:
+                    if not errors:
+                        self.client.upsert(collection_name=collection_name, wait=False, points=points)
+                        progress.complete(i, digest)
+                except Exception as e:
+                    errors.append(e)
+
+        workers = [threading.Thread(target=upsert_worker, daemon=True) for _ in range(max(1, upsert_workers))]
+        for worker in workers:
+            worker.start()
+        # 바뀐 문서가 있는 가장 최근 배치는 장벽으로 쓰기 위해 다음 배치가 나올 때까지 보류
+        held = None
+        total = upserted = 0
+        documents = iter(documents)
+        try:
+            for i in tqdm(itertools.count(), desc=f"Adding documents to qdrant {collection_name}", unit="batch"):
+                batch = list(itertools.islice(documents, batch_size))
+                if not batch or errors:
+                    break
+                hashes = list(map(content_hash, batch))
+                batch_ids = list(map(point_id, batch))
+                digest = progress.digest(hashes)
+                ids.update(batch_ids)
+                total += len(batch)
+                points = [] if progress.is_done(i, digest) else make_points(batch, batch_ids, hashes)
+                if not points:
+                    progress.complete(i, digest)
+                    continue
+                upserted += len(points)
+                if held is not None:
+                    batches.put(held)
+                held = (i, digest, points)
+        finally:
+            for _ in workers:
+                batches.put(None)
+            for worker in workers:
+                worker.join()
+        if errors:
+            raise errors[0]
+
+        if held is not None:
+            # 장벽: 앞선 업로드가 모두 끝난 뒤 마지막 배치를 wait=True로 올려 컬렉션 반영까지 기다림
+            self.client.upsert(collection_name=collection_name, wait=True, points=held[2])
+            progress.complete(held[0], held[1])
+        progress.finish()
+        logger.info(f"{collection_name}: {upserted} upserted, {total - upserted} unchanged or already added")
+        return ids
+
+    def delete_missing(self, collection_name: str, keep_ids: Iterable[str], scroll_filter: Filter | None = None) -> int:
+        """
+        컬렉션(scroll_filter가 있으면 조건에 맞는 포인트)에서 keep_ids에 없는 포인트를 삭제하고 삭제한 수를 반환
+        add_documents가 반환한 id를 모아 넘기면 원본에서 사라진 문서가 지워집니다.
+        """
+        keep_ids = set(keep_ids)
+        missing, offset = [], None
+        while True:
+            points, offset = self.client.scroll(
                 collection_name=collection_name,
+                scroll_filter=scroll_filter,
+                limit=1000,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            missing += [point.id for point in points if str(point.id) not in keep_ids]
+            if offset is None:
+                break
+        for i in range(0, len(missing), 1000):
+            self.client.delete(
+                collection_name=collection_name,
+                points_selector=PointIdsList(points=missing[i:i + 1000]),
                 wait=True,
-                points=[
-                    PointStruct(
-                        vector=embedding,
-                        payload={"page_content": text, "metadata": metadata},
-                        id=str(uuid4())
-                    )
-                    for embedding, text, metadata in zip(embeddings, texts[i:last], metadatas[i:last])
-                ]
             )
+        logger.info(f"{collection_name}: {len(missing)} missing points deleted")
+        return len(missing)
+
+    def get_embedding_cache_stats(self) -> dict:
+        stats = {}
+        model = self.embedding_model
+        if isinstance(model, CachedEmbeddings):
+            stats.update(model.stats())
+            model = model.embeddings
+        if isinstance(model, MicroBatchEmbeddings):
+            stats["micro_batch"] = model.stats()
+        return stats
 
-    def get_documents(self, query: str, collection_name: str) -> List[ScoredPoint]:
-        return self.client.query_points(
+    def get_documents(
+            self, 
+            query: str, 
+            collection_name: str, 
+            limit: int = 10, 
+            query_filter: Filter | None = None,
+            mode: str | None = None,
+        ) -> List[ScoredPoint]:
+        """
+        query와 유사한 포인트 검색 (query_filter는 build_filter로 만든 서버 측 payload 필터)
+        mode는 "dense" 또는 "hybrid", 없으면 컬렉션 설정(is_hybrid)을 따릅니다.
+        """
+        request = self._query_request(query, self.embedding_model.embed_query(query), collection_name, limit, query_filter, mode)
+        return self.client.query_batch_points(collection_name=collection_name, requests=[request])[0].points
+
+    def _query_request(
+            self, 
+            query: str, 
+            vector: List[float], 
+            collection_name: str, 
+            limit: int, 
+            query_filter: Filter | None, 
+            mode: str | None,
+        ) -> QueryRequest:
+        if mode is None:
+            mode = "hybrid" if self.is_hybrid(collection_name) else "dense"
+        if mode == "dense":
+            return QueryRequest(query=vector, filter=query_filter, params=self.search_params, limit=limit, with_payload=True)
+        if mode != "hybrid":
+            raise ValueError(f"지원하지 않는 검색 모드입니다: {mode} (가능한 값: dense, hybrid)")
+        # dense와 sparse 후보를 각각 가져와 RRF(순위 역수 합)로 합침
+        sparse = (self.sparse_embedding or get_sparse_embeddings()).embed_query(query)
+        prefetch_limit = limit * HYBRID_PREFETCH_FACTOR
+        return QueryRequest(
+            prefetch=[
+                Prefetch(query=vector, filter=query_filter, params=self.search_params, limit=prefetch_limit),
+                Prefetch(
+                    query=SparseVector(indices=sparse.indices, values=sparse.values),
+                    using=SPARSE_VECTOR_NAME,
+                    filter=query_filter,
+                    limit=prefetch_limit,
+                ),
+            ],
+            query=FusionQuery(fusion=Fusion.RRF),
+            limit=limit,
+            with_payload=True,
+        )
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """여러 쿼리를 한 번에 임베딩"""
+        if isinstance(self.embedding_model, CachedEmbeddings):
+            return self.embedding_model.embed_queries(queries)
+        return self.embedding_model.embed_documents(queries)
+
+    def get_documents_batch(
+            self, 
+            queries: List[str], 
+            collection_name: str, 
+            limit: int = 10, 
+            query_filter: Filter | None = None,
+            mode: str | None = None,
+        ) -> List[List[ScoredPoint]]:
+        """
+        여러 쿼리를 한 번에 임베딩하고 query_batch_points로 한 번에 검색
+        결과는 queries 순서와 같고, query_filter와 mode는 모든 쿼리에 적용됩니다.
+        """
+        if not queries:
+            return []
+        vectors = self.embed_queries(queries)
+        responses = self.client.query_batch_points(
             collection_name=collection_name,
-            query=self.embedding_model.embed_query(query),
-            limit=10
-        ).points
+            requests=[
+                self._query_request(query, vector, collection_name, limit, query_filter, mode)
+                for query, vector in zip(queries, vectors)
+            ],
+        )
+        return [response.points for response in responses]
+
+
+@singleton
+def get_qdrant_manager() -> QdrantManager:
+    """기본 QdrantManager (프로세스 단위 싱글톤)"""
+    return QdrantManager()
 
 
-qdrant_manager = QdrantManager()
+def __getattr__(name: str):
+    # 기존 `from Agent.qdrant_manager import qdrant_manager` 사용처 호환 (접근 시점에 생성)
+    if name == "qdrant_manager":
+        return get_qdrant_manager()
+    if name == "ko_embeddings":
+        return get_embeddings()
+    if name == "dimension":
+        return get_embedding_dimension()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
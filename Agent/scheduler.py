@@ -1,5 +1,5 @@
-from typing import TypedDict, Annotated, Dict, List
-from langchain_core.runnables import RunnableConfig
+from typing import TypedDict, Annotated, Dict, List, Literal, NotRequired
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
@@ -8,14 +8,22 @@ from pydantic import BaseModel, Field
 from Agent.prompts.prompt import recommender_prompt, plan_prompt
 from Agent.tools.tools import (
     retriever_tool, format_nutrient_json, generate_weekly_meal_plan, 
-    get_food_nutrient,
+    get_food_nutrient, get_food_nutrients, search_similar_foods,
     WeeklyMealPlan, NutrientData
 )
+from Agent.tools.nutrient_aggregator import NutrientAggregator
+from Agent.tools.meal_optimizer import MealPlanOptimizer
+from Agent.tools.dri_calculator import calculate_nutrient_data
+from Agent.checkpointer import create_checkpointer
+from Agent.nutrient_cache import NutrientCache, nutrient_cache as default_nutrient_cache
+from model.schemas.agent import UserProfile
+from db.cache import singleton
 
 from langgraph.graph import END, StateGraph
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.prebuilt import ToolNode, tools_condition
 from langchain_google_genai import ChatGoogleGenerativeAI
+import asyncio
 import logging
 
 
@@ -24,60 +32,61 @@ logger = logging.getLogger(__name__)
 config = RunnableConfig(recursion_limit=10)
 
 
-class UserProfile(BaseModel):
-    """
-    사용자의 신체 및 건강, 식습관 정보를 담는 Pydantic 모델.
-    """
-    age: int = Field(..., description="사용자의 나이 (만 나이, 1세 이상 120세 이하)", ge=1, le=120)
-    gender: str = Field(..., description="사용자의 성별 ('남성' 또는 '여성')")
-    height: float = Field(..., description="사용자의 키 (cm, 50.0cm 이상 250.0cm 이하)", ge=50.0, le=250.0)
-    weight: float = Field(..., description="사용자의 몸무게 (kg, 10.0kg 이상 300.0kg 이하)", ge=10.0, le=300.0)
-    diseases: List[str] = Field(default_factory=list, description="사용자가 앓고 있는 질병 목록 (없으면 빈 리스트)")
-    favorite_foods: List[str] = Field(default_factory=list, description="사용자가 좋아하는 음식 목록 (없으면 빈 리스트)")
-    disliked_foods: List[str] = Field(default_factory=list, description="사용자가 싫어하는 음식 목록 (없으면 빈 리스트)")
-    activity_level: str = Field(..., description="사용자의 활동 수준 (sedentary, lightly_exercising, moderately_exercising, heavy_exercising)")
-
-    def to_dict(self) -> Dict:
-        return {
-            "age": self.age,
-            "gender": self.gender,
-            "height": self.height,
-            "weight": self.weight,
-            "diseases": ", ".join(self.diseases) if len(self.diseases) > 0 else "해당사항없음",
-            "favorite_foods": ", ".join(self.favorite_foods) if len(self.favorite_foods) > 0 else "해당사항없음",
-            "disliked_foods": ", ".join(self.disliked_foods) if len(self.disliked_foods) > 0 else "해당사항없음",
-            "activity_level": self.activity_level,
-        }
-
-
 class ScheduleState(TypedDict):
     user_profile: Annotated[UserProfile, "user profile"] # 사용자 프로필 정보
     keywords: Annotated[str, "식단 유형(저탄고지/고단백/비건 등), 제한사항(알레르기/종교), 목표(체중감량/근육증가), 준비시간(간편식/정성식) 등의 식단 생성 관련 키워드"]
+    mode: NotRequired[Annotated[Literal["llm", "fast"], "식단 생성 방식, fast면 LLM 대신 DRI 계산기와 최적화기로 권장 영양성분과 식단 생성"]]
+    include_tags: NotRequired[Annotated[List[str], "fast 모드 식단에 쓸 음식 태그 (하나라도 가진 음식만 사용)"]]
+    exclude_tags: NotRequired[Annotated[List[str], "fast 모드 식단에서 뺄 음식 태그"]]
     recommender_messages: Annotated[Sequence[BaseMessage], add_messages] # 권장되는 영양성분 정보를 만들기 위해 recommender가 사용하는 메시지
     plan_messages: Annotated[Sequence[BaseMessage], add_messages] # 영양성분을 잘 맞춘 식단 정보를 만들기 위해 plan_generator가 사용하는 메시지
     nutrient_table: Annotated[NutrientData, "생성된 권장되는 영양성분 정보"]
     meal_table: Annotated[str, "생성된 식단 정보"]
+    meal_nutrient_report: Annotated[Dict, "식단의 식사/일/주 단위 영양소 합계와 권장 영양성분 대비 편차"]
     # nutrient_binary_score: Annotated[str, "binary score yes or no"] # 영양성분 정보가 잘 맞는지 확인하기 위해 사용하는 메시지
     # plan_binary_score: Annotated[str, "binary score yes or no"] # 식단 정보가 잘 맞는지 확인하기 위해 사용하는 메시지
     
     
 class ScheduleAgent:
-    def __init__(self):
+    def __init__(self, checkpointer: BaseCheckpointSaver | None = None, nutrient_cache: NutrientCache | None = None):
         logger.info("initializing schedule agent")
+        self.nutrient_cache = nutrient_cache or default_nutrient_cache
         self.llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash")
         self.recommender_tools = [retriever_tool, format_nutrient_json]
-        self.plan_tools = [retriever_tool, generate_weekly_meal_plan, get_food_nutrient]
+        self.plan_tools = [retriever_tool, generate_weekly_meal_plan, get_food_nutrient, get_food_nutrients, search_similar_foods]
         self.workflow = StateGraph(ScheduleState)
-        self.workflow.add_node("nutrient_recommender", self.nutrient_recommender)
+        # 각 노드는 동기(invoke)와 비동기(ainvoke/astream) 구현을 모두 가지며,
+        # 비동기 실행 시 LLM 호출은 ainvoke로, CPU/DB 작업은 스레드로 넘겨 이벤트 루프를 막지 않습니다.
+        self.workflow.add_node("nutrient_cache_lookup", self.nutrient_cache_lookup)
+        self.workflow.add_node("nutrient_calculator", self.nutrient_calculator)
+        self.workflow.add_node("nutrient_recommender", RunnableLambda(self.nutrient_recommender, afunc=self.anutrient_recommender))
         self.workflow.add_node("nutrient_recommender_tools", ToolNode(self.recommender_tools, messages_key="recommender_messages"))
         # self.workflow.add_node("nutrient_relevance_check", self.nutrient_relevance_check)
-        self.workflow.add_node("set_nutrient_table", self.set_nutrient_table)
-        self.workflow.add_node("meal_plan_generator", self.meal_plan_generator)
-        self.workflow.add_node("set_meal_table", self.set_meal_table)
+        self.workflow.add_node("set_nutrient_table", RunnableLambda(self.set_nutrient_table, afunc=self.aset_nutrient_table))
+        self.workflow.add_node("meal_plan_generator", RunnableLambda(self.meal_plan_generator, afunc=self.ameal_plan_generator))
+        self.workflow.add_node("set_meal_table", RunnableLambda(self.set_meal_table, afunc=self.aset_meal_table))
+        self.workflow.add_node("meal_plan_optimizer", RunnableLambda(self.meal_plan_optimizer, afunc=self.ameal_plan_optimizer))
         self.workflow.add_node("meal_plan_generator_tools", ToolNode(self.plan_tools, messages_key="plan_messages"))
         # self.workflow.add_node("plan_relevance_check", self.plan_relevance_check)
 
-        self.workflow.set_entry_point("nutrient_recommender")
+        # fast 모드는 LLM 없이 DRI 계산기 -> 최적화기로 바로 식단 생성
+        self.workflow.set_conditional_entry_point(
+            path=lambda state: "fast" if state.get("mode") == "fast" else "llm",
+            path_map={
+                "fast": "nutrient_calculator",
+                "llm": "nutrient_cache_lookup",
+            },
+        )
+        self.workflow.add_edge("nutrient_calculator", "meal_plan_optimizer")
+        # 비슷한 프로필의 권장 영양성분이 캐시에 있으면 nutrient_recommender ~ set_nutrient_table을 건너뜀
+        self.workflow.add_conditional_edges(
+            source="nutrient_cache_lookup",
+            path=lambda state: "hit" if state.get("nutrient_table") else "miss",
+            path_map={
+                "hit": "meal_plan_generator",
+                "miss": "nutrient_recommender",
+            },
+        )
         self.workflow.add_conditional_edges(
             source="nutrient_recommender",
             path=lambda state: "tools" if tools_condition(state, messages_key="recommender_messages") == "tools" else "next",
@@ -100,65 +109,137 @@ class ScheduleAgent:
         )
         self.workflow.add_edge("meal_plan_generator_tools", "meal_plan_generator")
         self.workflow.add_edge("set_meal_table", END)
+        self.workflow.add_edge("meal_plan_optimizer", END)
 
-        self.memory = MemorySaver()
+        # 기본값은 환경변수 CHECKPOINTER에 따른 체크포인터 (sqlite: 파일 저장 + TTL/스레드 수 제한)
+        self.memory = checkpointer or create_checkpointer()
         self.app = self.workflow.compile(checkpointer=self.memory)
         logger.info("compiled workflow")
     
     def get_graph_image(self) -> bytes:
         return self.app.get_graph(xray=True).draw_mermaid_png()#draw_method=MermaidDrawMethod.API)
 
-    def nutrient_recommender(self, state: ScheduleState) -> ScheduleState:
-        model_with_tools = self.llm.bind_tools(self.recommender_tools)
-        response = (recommender_prompt | model_with_tools).invoke({
+    def _recommender_inputs(self, state: ScheduleState) -> Dict:
+        return {
             "recommender_messages": state["recommender_messages"], 
             "user_profile": state["user_profile"].to_dict()
-            })
+            }
+
+    def _plan_inputs(self, state: ScheduleState) -> Dict:
+        return {
+            "plan_messages": state["plan_messages"], 
+            "user_profile": state["user_profile"].to_dict(),
+            "keywords": state["keywords"],
+            "nutrient_table": state["nutrient_table"]
+            }
+
+    def nutrient_recommender(self, state: ScheduleState) -> ScheduleState:
+        model_with_tools = self.llm.bind_tools(self.recommender_tools)
+        response = (recommender_prompt | model_with_tools).invoke(self._recommender_inputs(state))
+        return {"recommender_messages": [response]}
+
+    async def anutrient_recommender(self, state: ScheduleState) -> ScheduleState:
+        model_with_tools = self.llm.bind_tools(self.recommender_tools)
+        response = await (recommender_prompt | model_with_tools).ainvoke(self._recommender_inputs(state))
         return {"recommender_messages": [response]}
     
+    def nutrient_cache_lookup(self, state: ScheduleState) -> ScheduleState:
+        # 같은 스레드의 이전 결과가 남아 있지 않도록 캐시 미스면 None으로 초기화
+        nutrient_table = self.nutrient_cache.get(state["user_profile"])
+        if nutrient_table is not None:
+            logger.info("nutrient table cache hit")
+        return {"nutrient_table": nutrient_table}
+
+    def nutrient_calculator(self, state: ScheduleState) -> ScheduleState:
+        # fast 모드: nutrient_recommender LLM 루프 대신 DRI/TDEE 규칙으로 권장 영양성분 계산
+        return {"nutrient_table": calculate_nutrient_data(state["user_profile"]).model_dump()}
+
     def set_nutrient_table(self, state: ScheduleState) -> ScheduleState:
         nutrient_data = self.llm.with_structured_output(NutrientData).invoke(state["recommender_messages"][-1].content)
+        self.nutrient_cache.set(state["user_profile"], nutrient_data)
+        return {"nutrient_table": nutrient_data.model_dump()}
+
+    async def aset_nutrient_table(self, state: ScheduleState) -> ScheduleState:
+        nutrient_data = await self.llm.with_structured_output(NutrientData).ainvoke(state["recommender_messages"][-1].content)
+        self.nutrient_cache.set(state["user_profile"], nutrient_data)
         return {"nutrient_table": nutrient_data.model_dump()}
 
     def meal_plan_generator(self, state: ScheduleState) -> ScheduleState:
         model_with_tools = self.llm.bind_tools(self.plan_tools)
-        response = (plan_prompt | model_with_tools).invoke({
-            "plan_messages": state["plan_messages"], 
-            "user_profile": state["user_profile"].to_dict(),
-            "keywords": state["keywords"],
-            "nutrient_table": state["nutrient_table"]
-            })
+        response = (plan_prompt | model_with_tools).invoke(self._plan_inputs(state))
+        return {"plan_messages": [response]}
+
+    async def ameal_plan_generator(self, state: ScheduleState) -> ScheduleState:
+        model_with_tools = self.llm.bind_tools(self.plan_tools)
+        response = await (plan_prompt | model_with_tools).ainvoke(self._plan_inputs(state))
         return {"plan_messages": [response]}
     
+    def meal_plan_optimizer(self, state: ScheduleState) -> ScheduleState:
+        # fast 모드: LLM 도구 호출 없이 영양소 행렬 위에서 식단을 바로 생성
+        meal_data, report = MealPlanOptimizer().optimize(
+            state["nutrient_table"],
+            state["user_profile"],
+            include_tags=state.get("include_tags") or (),
+            exclude_tags=state.get("exclude_tags") or (),
+            keywords=state.get("keywords", ""),
+        )
+        return {"meal_table": meal_data.model_dump(), "meal_nutrient_report": report.model_dump()}
+
+    async def ameal_plan_optimizer(self, state: ScheduleState) -> ScheduleState:
+        return await asyncio.to_thread(self.meal_plan_optimizer, state)
+
     def set_meal_table(self, state: ScheduleState) -> ScheduleState:
         meal_data = self.llm.with_structured_output(WeeklyMealPlan).invoke(state["plan_messages"][-1].content)
-        return {"meal_table": meal_data.model_dump()}    
+        return self._aggregate_meal_table(state, meal_data)
+
+    async def aset_meal_table(self, state: ScheduleState) -> ScheduleState:
+        meal_data = await self.llm.with_structured_output(WeeklyMealPlan).ainvoke(state["plan_messages"][-1].content)
+        return await asyncio.to_thread(self._aggregate_meal_table, state, meal_data)
+
+    def _aggregate_meal_table(self, state: ScheduleState, meal_data: WeeklyMealPlan) -> ScheduleState:
+        # 일일 영양 정보는 LLM 계산 대신 영양소 행렬로 직접 집계
+        try:
+            meal_data, report = NutrientAggregator().fill_daily_nutrients(meal_data, state.get("nutrient_table"))
+        except Exception as e:
+            logger.warning(f"식단 영양소 집계 실패, LLM이 계산한 값을 사용합니다: {e}")
+            return {"meal_table": meal_data.model_dump()}
+        if report.incomplete_days:
+            logger.warning(f"음식 {report.unresolved_foods}을 찾지 못해 {report.incomplete_days}번째 날은 LLM이 계산한 값을 사용합니다.")
+        return {"meal_table": meal_data.model_dump(), "meal_nutrient_report": report.model_dump()}
         
 
-schedule_agent = ScheduleAgent()
-logger.info("created schedule agent")
-        
-"""
-2015년 한국인 영양섭취기준
-
-구분	에너지(kcal/일)	단백질(g/일)
-남자	여자	남자	여자
-1~2세	1000	15
-3~5세	1400	20
-6~8세	1700	1500	30	25
-9~11세	2100	1800	40	40
-12~14세	2500	2000	55	50
-15~18세	2700	2000	65	50
-19~29세	2600	2100	65	55
-30~49세	2400	1900	60	50
-50~64세	2200	1800	60	50
-65~74세	2000	1600	55	45
-75~120세	2000	1600	55	45
-임신부/초기	+0	+0
-임신부/중기	+340	+15
-임신부/후기	+450	+30
-수유부	+340	+25
-용어해설서
-필요추정량건강하고 정상적인 활동을 하며, 정상 체격을 지닌 사람이 에너지의 평형을 유지하는데 필요한 양
-
-"""
\ No newline at end of file
+@singleton
+def get_schedule_agent() -> ScheduleAgent:
+    """기본 ScheduleAgent (프로세스 단위 싱글톤, 처음 호출될 때 생성)"""
+    schedule_agent = ScheduleAgent()
+    logger.info("created schedule agent")
+    return schedule_agent
+
+
+def warmup() -> None:
+    """
+    첫 요청이 느려지지 않도록 에이전트, 임베딩 모델, Qdrant 연결, 영양소 행렬, 음식 이름 색인을 미리 준비
+    FastAPI lifespan에서 백그라운드로 호출합니다.
+    """
+    from Agent.qdrant_manager import get_qdrant_manager
+    from db.nutrient_matrix import get_nutrient_matrix
+    from db.food_name_index import get_food_name_index
+
+    get_schedule_agent()
+    get_qdrant_manager()
+    try:
+        get_nutrient_matrix()
+    except Exception as e:
+        logger.warning(f"영양소 행렬을 불러오지 못했습니다: {e}")
+    try:
+        get_food_name_index()
+    except Exception as e:
+        logger.warning(f"음식 이름 색인을 만들지 못했습니다: {e}")
+    logger.info("schedule agent warmed up")
+
+
+def __getattr__(name: str):
+    # 기존 `from Agent.scheduler import schedule_agent` 사용처 호환 (접근 시점에 생성)
+    if name == "schedule_agent":
+        return get_schedule_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,86 @@
+from collections import Counter
+from typing import List
+from langchain_qdrant import SparseEmbeddings, SparseVector
+from dotenv import load_dotenv
+import logging
+import os
+import re
+import unicodedata
+import zlib
+
+"""
+하이브리드 검색용 희소(sparse) 임베딩
+
+"국밥_돼지머리"처럼 토큰이 정확히 일치해야 하는 음식 이름은 dense 검색만으로는 의미가 비슷한 다른 음식이 먼저 나옵니다.
+SPARSE_BACKEND 환경변수로 dense 벡터와 함께 저장할 BM25 계열 희소 벡터의 생성 방식을 고릅니다.
+- ngram: 한국어 음절 bigram + 단어 토큰을 해시한 BM25 TF 벡터 (모델 다운로드 없음)
+- bm25: fastembed Qdrant/bm25 (영어 기준 토크나이저, extra: uv sync --extra fastembed)
+IDF는 컬렉션의 희소 벡터 설정(Modifier.IDF)으로 Qdrant 서버가 계산합니다.
+"""
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SPARSE_BACKEND = os.getenv("SPARSE_BACKEND", "ngram").lower()
+SPARSE_BACKENDS = ("ngram", "bm25")
+# 음식 이름 기준 평균 토큰 수 (BM25 길이 정규화)
+SPARSE_AVG_LENGTH = float(os.getenv("SPARSE_AVG_LENGTH", 8))
+
+_TOKEN_PATTERN = re.compile(r"[0-9a-z가-힣]+")
+
+
+class KoreanNgramSparse(SparseEmbeddings):
+    """
+    단어 토큰과 음절 bigram의 BM25 TF 가중치 희소 벡터
+    "국밥_돼지머리" -> 국밥, 돼지머리, 국밥(bigram), 돼지, 지머, 머리 (띄어쓰기가 달라도 bigram이 겹침)
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, avg_length: float = SPARSE_AVG_LENGTH):
+        self.k1 = k1
+        self.b = b
+        self.avg_length = avg_length
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        words = _TOKEN_PATTERN.findall(unicodedata.normalize("NFC", text).lower())
+        tokens = [f"w:{word}" for word in words]
+        for word in words:
+            tokens += [f"b:{word[i:i + 2]}" for i in range(len(word) - 1)] if len(word) > 1 else [f"b:{word}"]
+        return tokens
+
+    @staticmethod
+    def token_index(token: str) -> int:
+        return zlib.crc32(token.encode("utf-8")) & 0x7FFFFFFF
+
+    def _vector(self, counts: Counter, length: int) -> SparseVector:
+        weights = {}
+        for token, tf in counts.items():
+            index = self.token_index(token)
+            weight = tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * length / self.avg_length))
+            weights[index] = weights.get(index, 0.0) + weight
+        return SparseVector(indices=list(weights), values=list(weights.values()))
+
+    def embed_documents(self, texts: List[str]) -> List[SparseVector]:
+        vectors = []
+        for text in texts:
+            tokens = self.tokenize(text)
+            vectors.append(self._vector(Counter(tokens), len(tokens)))
+        return vectors
+
+    def embed_query(self, text: str) -> SparseVector:
+        # 쿼리는 토큰마다 1 (IDF는 서버에서 곱함)
+        indices = list(dict.fromkeys(self.token_index(token) for token in self.tokenize(text)))
+        return SparseVector(indices=indices, values=[1.0] * len(indices))
+
+
+def create_sparse_embeddings(backend: str = SPARSE_BACKEND) -> SparseEmbeddings:
+    """backend에 맞는 희소 임베딩 생성"""
+    if backend not in SPARSE_BACKENDS:
+        raise ValueError(f"지원하지 않는 희소 임베딩 백엔드입니다: {backend} (가능한 값: {', '.join(SPARSE_BACKENDS)})")
+    logger.info(f"creating sparse embeddings: {backend}")
+    if backend == "bm25":
+        from langchain_qdrant import FastEmbedSparse
+
+        return FastEmbedSparse(model_name="Qdrant/bm25")
+    return KoreanNgramSparse()
@@ -0,0 +1,144 @@
+from typing import Dict, Sequence
+import numpy as np
+import logging
+
+from db.nutrient_matrix import MANDATORY_COLUMNS
+from model.schemas.agent import NutrientData, UserProfile
+
+"""
+한국인 영양섭취기준(DRI)과 TDEE로 일일 권장 영양성분(NutrientData 9가지)을 계산하는 규칙 기반 계산기
+
+nutrient_recommender의 LLM + retriever 루프를 대신하는 fast 모드용 경로로, 여러 프로필을 배열로 한 번에 계산합니다.
+- 열량: 성인은 Mifflin-St Jeor 기초대사량 x 활동 계수, 18세 이하는 DRI 에너지 필요추정량
+- 단백질: DRI 권장섭취량 (성인은 체중 1kg당 0.91g과 비교해 큰 값)
+- 탄수화물/지방/당류/포화지방/트랜스지방: 열량 대비 비율
+- 나트륨: 연령별 만성질환위험감소섭취량, 콜레스테롤: 300mg 상한
+- 질병별 규칙(고혈압 나트륨, 당뇨 당류/탄수화물, 고지혈증 포화지방/콜레스테롤, 비만 열량)을 마지막에 적용
+  (열량 조정은 성인에게만 적용하고, 18세 이하는 연령 구간 필요추정량의 일정 비율 아래로 내려가지 않음)
+"""
+
+logger = logging.getLogger(__name__)
+
+# 2015년 한국인 영양섭취기준 (연령 구간 하한, 에너지 필요추정량 kcal/일, 단백질 권장섭취량 g/일)
+DRI_AGE_BANDS = np.array([1, 3, 6, 9, 12, 15, 19, 30, 50, 65, 75])
+DRI_ENERGY_KCAL = {
+    "male": np.array([1000, 1400, 1700, 2100, 2500, 2700, 2600, 2400, 2200, 2000, 2000], dtype=np.float64),
+    "female": np.array([1000, 1400, 1500, 1800, 2000, 2000, 2100, 1900, 1800, 1600, 1600], dtype=np.float64),
+}
+DRI_PROTEIN_G = {
+    "male": np.array([15, 20, 30, 40, 55, 65, 65, 60, 60, 55, 55], dtype=np.float64),
+    "female": np.array([15, 20, 25, 40, 50, 50, 55, 50, 50, 45, 45], dtype=np.float64),
+}
+# 나트륨 만성질환위험감소섭취량 (mg/일), DRI_AGE_BANDS와 같은 구간
+DRI_SODIUM_MG = np.array([1200, 1600, 1900, 2300, 2300, 2300, 2300, 2300, 2300, 2100, 1700], dtype=np.float64)
+
+ADULT_AGE = 19
+ADULT_PROTEIN_G_PER_KG = 0.91
+CHOLESTEROL_LIMIT_MG = 300.0
+
+ACTIVITY_FACTORS: Dict[str, float] = {
+    "sedentary": 1.2,
+    "lightly_exercising": 1.375,
+    "moderately_exercising": 1.55,
+    "heavy_exercising": 1.725,
+}
+
+# 열량 대비 비율 (탄수화물/당류 4kcal/g, 지방류 9kcal/g)
+ENERGY_RATIOS: Dict[str, float] = {
+    "carbohydrate_g": 0.6,
+    "fat_g": 0.25,
+    "sugars_g": 0.2,
+    "saturated_fat_g": 0.07,
+    "trans_fat_g": 0.01,
+}
+KCAL_PER_G = {"carbohydrate_g": 4.0, "sugars_g": 4.0, "fat_g": 9.0, "saturated_fat_g": 9.0, "trans_fat_g": 9.0}
+
+# 질병별 규칙: 열량 대비 비율 변경, 절대 상한, 열량 조정
+DISEASE_ENERGY_RATIOS: Dict[str, Dict[str, float]] = {
+    "당뇨": {"sugars_g": 0.1, "carbohydrate_g": 0.5},
+    "당뇨병": {"sugars_g": 0.1, "carbohydrate_g": 0.5},
+    "고지혈증": {"saturated_fat_g": 0.05},
+    "이상지질혈증": {"saturated_fat_g": 0.05},
+}
+DISEASE_LIMITS: Dict[str, Dict[str, float]] = {
+    "고혈압": {"sodium_mg": 2000.0},
+    "고지혈증": {"cholesterol_mg": 200.0},
+    "이상지질혈증": {"cholesterol_mg": 200.0},
+}
+DISEASE_ENERGY_DELTA: Dict[str, float] = {
+    "비만": -500.0,
+}
+MIN_ENERGY_KCAL = {"male": 1500.0, "female": 1200.0}
+# 18세 이하 열량 하한 (연령 구간 에너지 필요추정량 대비 비율)
+CHILD_MIN_ENERGY_RATIO = 0.9
+
+_FEMALE = {"여성", "여자", "여", "female", "f"}
+
+
+def is_female(gender: str) -> bool:
+    return gender.strip().lower() in _FEMALE
+
+
+def activity_factor(activity_level: str) -> float:
+    activity_level = activity_level.strip().lower()
+    if activity_level not in ACTIVITY_FACTORS:
+        raise ValueError(f"활동 수준이 올바르지 않습니다. 활동 수준은 {', '.join(repr(level) for level in ACTIVITY_FACTORS)} 중 하나여야 합니다.")
+    return ACTIVITY_FACTORS[activity_level]
+
+
+def basal_metabolic_rate(age: np.ndarray, weight: np.ndarray, height: np.ndarray, female: np.ndarray) -> np.ndarray:
+    """Mifflin-St Jeor 기초대사량 (kcal/일)"""
+    return 10 * weight + 6.25 * height - 5 * age + np.where(female, -161.0, 5.0)
+
+
+def calculate_tdee(age: float, weight: float, height: float, activity_level: str, female: bool = False) -> float:
+    """일일 총 에너지 소비량(TDEE) = 기초대사량 x 활동 계수"""
+    bmr = basal_metabolic_rate(np.float64(age), np.float64(weight), np.float64(height), np.bool_(female))
+    return float(bmr * activity_factor(activity_level))
+
+
+def calculate_nutrient_targets(profiles: Sequence[UserProfile]) -> np.ndarray:
+    """프로필 목록의 일일 권장 영양성분 (프로필 x MANDATORY_COLUMNS)"""
+    age = np.array([profile.age for profile in profiles], dtype=np.float64)
+    weight = np.array([profile.weight for profile in profiles], dtype=np.float64)
+    height = np.array([profile.height for profile in profiles], dtype=np.float64)
+    female = np.array([is_female(profile.gender) for profile in profiles], dtype=bool)
+    factor = np.array([activity_factor(profile.activity_level) for profile in profiles], dtype=np.float64)
+    band = np.clip(np.searchsorted(DRI_AGE_BANDS, age, side="right") - 1, 0, len(DRI_AGE_BANDS) - 1)
+    adult = age >= ADULT_AGE
+
+    dri_energy = np.where(female, DRI_ENERGY_KCAL["female"][band], DRI_ENERGY_KCAL["male"][band])
+    dri_protein = np.where(female, DRI_PROTEIN_G["female"][band], DRI_PROTEIN_G["male"][band])
+    energy = np.where(adult, basal_metabolic_rate(age, weight, height, female) * factor, dri_energy)
+    protein = np.where(adult, np.maximum(dri_protein, weight * ADULT_PROTEIN_G_PER_KG), dri_protein)
+
+    ratios = {column: np.full(len(profiles), ratio) for column, ratio in ENERGY_RATIOS.items()}
+    ratios["saturated_fat_g"][~adult] = 0.08
+    limits = {
+        "sodium_mg": DRI_SODIUM_MG[band].copy(),
+        "cholesterol_mg": np.full(len(profiles), CHOLESTEROL_LIMIT_MG),
+    }
+    for i, profile in enumerate(profiles):
+        for disease in profile.diseases:
+            disease = disease.strip()
+            for column, ratio in DISEASE_ENERGY_RATIOS.get(disease, {}).items():
+                ratios[column][i] = min(ratios[column][i], ratio)
+            for column, limit in DISEASE_LIMITS.get(disease, {}).items():
+                limits[column][i] = min(limits[column][i], limit)
+            if adult[i]:
+                energy[i] += DISEASE_ENERGY_DELTA.get(disease, 0.0)
+    min_energy = np.where(female, MIN_ENERGY_KCAL["female"], MIN_ENERGY_KCAL["male"])
+    energy = np.maximum(energy, np.where(adult, min_energy, dri_energy * CHILD_MIN_ENERGY_RATIO))
+
+    targets = {
+        "energy_kcal": energy,
+        "protein_g": protein,
+        **{column: energy * ratio / KCAL_PER_G[column] for column, ratio in ratios.items()},
+        **limits,
+    }
+    return np.round(np.stack([targets[column] for column in MANDATORY_COLUMNS], axis=1), 1)
+
+
+def calculate_nutrient_data(profile: UserProfile) -> NutrientData:
+    """프로필 하나의 일일 권장 영양성분"""
+    return NutrientData(**dict(zip(MANDATORY_COLUMNS, calculate_nutrient_targets([profile])[0].tolist())))
@@ -0,0 +1,295 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+from datetime import date, time, timedelta
+import numpy as np
+import logging
+import re
+
+from db.nutrient_matrix import NutrientMatrix, MANDATORY_COLUMNS, get_nutrient_matrix
+from Agent.tools.nutrient_aggregator import NutrientAggregator, PlanNutrientReport
+from model.schemas.agent import NutrientData, FoodItem, Meal, DailyPlan, WeeklyMealPlan, UserProfile
+
+"""
+LLM 없이 영양소 행렬 위에서 주간 식단을 만드는 최적화기 (탐욕 선택 + 지역 탐색)
+
+1. 후보 음식 풀: 영양 정보가 있고, 싫어하는 음식/제외 태그에 걸리지 않는 음식 중 pool_size개를 표본 추출
+   (식단 키워드에 DB 태그 이름이 있으면 포함 태그로, "제외/빼고/없이/알레르기"가 붙은 구절에 있으면 제외 태그로 사용)
+2. 탐욕 선택: 식사마다 슬롯을 하나씩 채우며, 식사 목표 대비 오차가 가장 작아지는 후보를 벡터 연산으로 고름
+3. 지역 탐색: 하루 단위로 각 슬롯을 다른 후보로 바꿔 보며 일일 목표 오차가 줄어들면 교체
+
+목적 함수는 목표 대비 비율 x에 대해 에너지/단백질/탄수화물/지방은 (x - 1)^2,
+당류/나트륨/콜레스테롤/포화지방/트랜스지방은 상한만 두어 max(0, x - 1)^2에 가중치를 곱한 합입니다.
+"""
+
+logger = logging.getLogger(__name__)
+
+# 식사 시간과 하루 목표 중 차지하는 비율
+MEAL_SLOTS: Tuple[Tuple[time, float], ...] = (
+    (time(8, 0), 0.3),
+    (time(12, 30), 0.35),
+    (time(18, 30), 0.35),
+)
+
+# 넘지 않아야 하는 영양소(상한), 나머지는 목표에 맞춰야 하는 영양소
+UPPER_BOUND_NUTRIENTS = ("sugars_g", "sodium_mg", "cholesterol_mg", "saturated_fat_g", "trans_fat_g")
+
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "energy_kcal": 4.0,
+    "protein_g": 2.0,
+    "fat_g": 1.0,
+    "carbohydrate_g": 1.0,
+    "sugars_g": 1.0,
+    "sodium_mg": 1.0,
+    "cholesterol_mg": 0.5,
+    "saturated_fat_g": 0.5,
+    "trans_fat_g": 0.5,
+}
+
+# 질병별로 더 엄격하게 지켜야 하는 영양소 가중치
+DISEASE_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "고혈압": {"sodium_mg": 8.0},
+    "당뇨": {"sugars_g": 8.0, "carbohydrate_g": 2.0},
+    "당뇨병": {"sugars_g": 8.0, "carbohydrate_g": 2.0},
+    "고지혈증": {"cholesterol_mg": 6.0, "saturated_fat_g": 6.0, "trans_fat_g": 6.0},
+    "이상지질혈증": {"cholesterol_mg": 6.0, "saturated_fat_g": 6.0, "trans_fat_g": 6.0},
+    "비만": {"energy_kcal": 8.0, "sugars_g": 3.0},
+}
+
+# 1회 분량(g)의 허용 범위
+MIN_PORTION_G = 30.0
+MAX_PORTION_G = 400.0
+
+# 반복 한도를 풀었을 때 이미 쓴 음식에 주는 벌점 (다른 어떤 벌점보다 크게)
+RELAXED_REPEAT_PENALTY = 10.0
+
+# 키워드 구절에 이 단어가 있으면 그 구절의 태그는 제외 태그
+_EXCLUDE_MARKERS = ("제외", "빼고", "없이", "말고", "알레르기", "알러지", "못 먹", "못먹", "금지")
+_KEYWORD_SPLIT = re.compile(r"[,\n;/]+")
+
+
+def tags_from_keywords(keywords: str, tag_names: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """식단 키워드에서 DB 태그 이름을 찾아 (포함 태그, 제외 태그)로 나눔"""
+    include, exclude = [], []
+    for phrase in _KEYWORD_SPLIT.split(keywords or ""):
+        tags = [tag for tag in tag_names if tag and tag in phrase]
+        if any(marker in phrase for marker in _EXCLUDE_MARKERS):
+            exclude += tags
+        else:
+            include += tags
+    return list(dict.fromkeys(include)), list(dict.fromkeys(exclude))
+
+
+def find_food_ids(disliked_foods: Sequence[str], exclude_tags: Sequence[str], include_tags: Sequence[str]) -> Tuple[List[str], List[str], List[str]]:
+    """싫어하는 음식, 제외 태그, 포함 태그에 해당하는 food_id 조회"""
+    from db.database import db_scope
+
+    with db_scope() as manager:
+        return (
+            manager.get_food_ids_by_name_keywords(disliked_foods),
+            manager.get_food_ids_by_tags(exclude_tags),
+            manager.get_food_ids_by_tags(include_tags),
+        )
+
+
+def find_tag_names() -> List[str]:
+    """DB의 태그 이름 목록"""
+    from db.database import db_scope
+
+    with db_scope() as manager:
+        return manager.get_tag_names()
+
+
+def find_food_names(food_ids: Sequence[str]) -> List[str | None]:
+    """food_id를 음식 이름으로 변환 (DB 일괄 조회, 캐시 사용)"""
+    from db.database import db_scope
+
+    with db_scope() as manager:
+        foods = manager.get_foods_by_ids(food_ids)
+    return [food.food_name if food is not None else None for food in foods]
+
+
+class MealPlanOptimizer:
+    """영양소 행렬 기반 주간 식단 생성기"""
+
+    def __init__(
+            self,
+            matrix: NutrientMatrix | None = None,
+            id_finder: Callable[[Sequence[str], Sequence[str], Sequence[str]], Tuple[List[str], List[str], List[str]]] = find_food_ids,
+            name_finder: Callable[[Sequence[str]], List[str | None]] = find_food_names,
+            tag_finder: Callable[[], List[str]] = find_tag_names,
+            items_per_meal: int = 3,
+            pool_size: int = 3000,
+            max_repeats: int = 2,
+            local_search_passes: int = 2,
+            seed: int = 0,
+        ):
+        self.matrix = matrix or get_nutrient_matrix()
+        self.id_finder = id_finder
+        self.name_finder = name_finder
+        self.tag_finder = tag_finder
+        self.items_per_meal = items_per_meal
+        self.pool_size = pool_size
+        self.max_repeats = max_repeats
+        self.local_search_passes = local_search_passes
+        self.seed = seed
+        self._cols = self.matrix.column_indices(MANDATORY_COLUMNS)
+        self._upper = np.array([column in UPPER_BOUND_NUTRIENTS for column in MANDATORY_COLUMNS])
+
+    def candidate_pool(self, exclude_ids: Sequence[str], include_ids: Sequence[str] | None, rng: np.random.Generator) -> np.ndarray:
+        """후보 음식의 행 인덱스"""
+        values = np.asarray(self.matrix.values[:, self._cols], dtype=np.float32)
+        mask = ~np.isnan(values[:, 0]) & (values[:, 0] > 0)
+        if include_ids:
+            include = np.zeros(len(self.matrix), dtype=bool)
+            idx = self.matrix.indices(include_ids)
+            include[idx[idx >= 0]] = True
+            mask &= include
+        if len(exclude_ids) > 0:
+            idx = self.matrix.indices(exclude_ids)
+            mask[idx[idx >= 0]] = False
+        pool = np.flatnonzero(mask)
+        if len(pool) > self.pool_size:
+            pool = np.sort(rng.choice(pool, size=self.pool_size, replace=False))
+        return pool
+
+    def weights(self, diseases: Sequence[str]) -> np.ndarray:
+        """질병을 반영한 영양소별 가중치"""
+        weights = dict(DEFAULT_WEIGHTS)
+        for disease in diseases:
+            for column, weight in DISEASE_WEIGHTS.get(disease.strip(), {}).items():
+                weights[column] = max(weights[column], weight)
+        return np.array([weights[column] for column in MANDATORY_COLUMNS], dtype=np.float32)
+
+    def score(self, ratios: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """목표 대비 비율(마지막 축이 영양소)에 대한 오차"""
+        error = ratios - 1.0
+        error = np.where(self._upper, np.maximum(error, 0.0), error)
+        return (weights * error * error).sum(axis=-1)
+
+    def optimize(
+            self,
+            target: NutrientData | Dict,
+            user_profile: UserProfile | None = None,
+            days: int = 7,
+            start_date: date | None = None,
+            include_tags: Sequence[str] = (),
+            exclude_tags: Sequence[str] = (),
+            keywords: str = "",
+        ) -> Tuple[WeeklyMealPlan, PlanNutrientReport]:
+        """목표 영양소에 맞춘 주간 식단과 영양소 집계 결과 생성 (keywords에 있는 태그는 include/exclude 태그에 더함)"""
+        rng = np.random.default_rng(self.seed)
+        target = target if isinstance(target, dict) else target.model_dump()
+        goal = np.array([max(float(target[column]), 1e-6) for column in MANDATORY_COLUMNS], dtype=np.float32)
+        disliked = user_profile.disliked_foods if user_profile else []
+        diseases = user_profile.diseases if user_profile else []
+        weights = self.weights(diseases)
+
+        if keywords:
+            keyword_include, keyword_exclude = tags_from_keywords(keywords, self.tag_finder())
+            include_tags = list(dict.fromkeys([*include_tags, *keyword_include]))
+            exclude_tags = list(dict.fromkeys([*exclude_tags, *keyword_exclude]))
+            if keyword_include or keyword_exclude:
+                logger.info(f"keyword tags: include={keyword_include}, exclude={keyword_exclude}")
+
+        disliked_ids, excluded_ids, included_ids = self.id_finder(disliked, exclude_tags, include_tags)
+        if include_tags and not included_ids:
+            logger.warning(f"포함 태그 {list(include_tags)}에 해당하는 음식이 없어 태그 조건을 무시합니다.")
+            included_ids = None
+        pool = self.candidate_pool(list(disliked_ids) + list(excluded_ids), included_ids, rng)
+        if len(pool) < self.items_per_meal:
+            raise ValueError("식단을 구성할 후보 음식이 부족합니다.")
+        if len(pool) * self.max_repeats < days * len(MEAL_SLOTS) * self.items_per_meal:
+            logger.warning(f"후보 음식 {len(pool)}개로는 반복 한도({self.max_repeats}회)를 지킬 수 없어, 한도에 걸린 음식도 덜 쓴 순서로 다시 사용합니다.")
+
+        # 후보별 1회 분량과 분량당 영양소(목표 대비 비율)
+        serving = np.asarray(self.matrix.serving_g[pool], dtype=np.float32)
+        reference = np.asarray(self.matrix.reference_g[pool], dtype=np.float32)
+        reference = np.where(reference > 0, reference, 100.0).astype(np.float32)
+        portion = np.clip(np.where(np.isnan(serving), reference, serving), MIN_PORTION_G, MAX_PORTION_G)
+        per_portion = np.nan_to_num(np.asarray(self.matrix.values[pool][:, self._cols], dtype=np.float32), nan=0.0) * (portion / reference)[:, None]
+        ratios = per_portion / goal
+        categories = np.asarray(self.matrix.category_codes[pool])
+
+        used = np.zeros(len(pool), dtype=np.int32)
+        plan_slots: List[List[List[int]]] = []
+        for _ in range(days):
+            day_slots = [self._fill_meal(ratios, categories, used, share, weights) for _, share in MEAL_SLOTS]
+            day_slots = self._improve_day(ratios, categories, used, day_slots, weights)
+            plan_slots.append(day_slots)
+
+        chosen = sorted({i for day_slots in plan_slots for meal in day_slots for i in meal})
+        chosen_ids = [str(food_id) for food_id in self.matrix.food_ids[pool[chosen]]]
+        names = dict(zip(chosen, self.name_finder(chosen_ids)))
+        name_to_id = {names[i] or chosen_ids[k]: chosen_ids[k] for k, i in enumerate(chosen)}
+
+        start_date = start_date or date.today()
+        plan = WeeklyMealPlan(days=[
+            DailyPlan(
+                day=start_date + timedelta(days=day_i),
+                meals=[
+                    Meal(
+                        time_slot=meal_time,
+                        food_list=[FoodItem(food_name=names[i] or str(self.matrix.food_ids[pool[i]]), food_amount=f"{portion[i]:.0f}g") for i in meal],
+                    )
+                    for (meal_time, _), meal in zip(MEAL_SLOTS, day_slots)
+                ],
+                nutrients=NutrientData(**{column: 0.0 for column in MANDATORY_COLUMNS}),
+            )
+            for day_i, day_slots in enumerate(plan_slots)
+        ])
+
+        aggregator = NutrientAggregator(matrix=self.matrix, resolver=lambda food_names: [name_to_id.get(name) for name in food_names])
+        return aggregator.fill_daily_nutrients(plan, target)
+
+    def _fill_meal(self, ratios: np.ndarray, categories: np.ndarray, used: np.ndarray, share: float, weights: np.ndarray) -> List[int]:
+        """식사 하나를 탐욕적으로 채우기"""
+        meal: List[int] = []
+        total = np.zeros(ratios.shape[1], dtype=np.float32)
+        for _ in range(self.items_per_meal):
+            scores = self.score((total + ratios) / share, weights) + self._penalty(categories, used, meal)
+            best = int(np.argmin(scores))
+            if np.isinf(scores[best]):
+                raise ValueError("식사에 넣을 수 있는 후보 음식이 없습니다.")
+            meal.append(best)
+            used[best] += 1
+            total += ratios[best]
+        return meal
+
+    def _improve_day(self, ratios: np.ndarray, categories: np.ndarray, used: np.ndarray, day_slots: List[List[int]], weights: np.ndarray) -> List[List[int]]:
+        """하루 단위 지역 탐색, 슬롯 하나를 바꿔 일일 오차가 줄면 교체"""
+        total = ratios[[i for meal in day_slots for i in meal]].sum(axis=0)
+        for _ in range(self.local_search_passes):
+            improved = False
+            for meal in day_slots:
+                for slot, current in enumerate(meal):
+                    others = meal[:slot] + meal[slot + 1:]
+                    base = total - ratios[current]
+                    used[current] -= 1
+                    scores = self.score(base + ratios, weights) + self._penalty(categories, used, others)
+                    best = int(np.argmin(scores))
+                    if scores[best] + 1e-9 < scores[current]:
+                        meal[slot] = best
+                        total = base + ratios[best]
+                        improved = True
+                    used[meal[slot]] += 1
+            if not improved:
+                break
+        return day_slots
+
+    def _penalty(self, categories: np.ndarray, used: np.ndarray, meal: List[int]) -> np.ndarray:
+        """
+        반복 사용, 같은 식사 내 같은 대분류/같은 음식에 대한 벌점
+        같은 식사에 이미 있는 음식은 항상 제외하고, 나머지 후보가 모두 반복 한도에 걸렸을 때만
+        한도를 풀어 덜 쓴 음식부터 고르도록 큰 유한 벌점을 줍니다 (모두 inf면 argmin이 0번을 고르게 됨).
+        """
+        over = used >= self.max_repeats
+        available = ~over
+        available[meal] = False
+        if available.any():
+            penalty = np.where(over, np.inf, 0.05 * used).astype(np.float32)
+        else:
+            penalty = np.where(over, RELAXED_REPEAT_PENALTY * (used - self.max_repeats + 1), 0.05 * used).astype(np.float32)
+        if meal:
+            meal_categories = categories[meal]
+            penalty += np.where((categories >= 0) & np.isin(categories, meal_categories), 0.5, 0.0).astype(np.float32)
+            penalty[meal] = np.inf
+        return penalty
@@ -0,0 +1,172 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+from pydantic import BaseModel, Field
+import numpy as np
+import logging
+import re
+
+from db.nutrient_matrix import NutrientMatrix, MANDATORY_COLUMNS, get_nutrient_matrix, parse_amount_g, parse_number
+from model.schemas.agent import NutrientData, WeeklyMealPlan
+
+"""
+식단(WeeklyMealPlan)의 영양소를 식사/일/주 단위로 한 번에 집계하는 모듈
+
+모든 음식 항목을 (항목 x 영양소) 배열 하나로 만든 뒤 np.add.at으로 식사, 날짜별로 모읍니다.
+LLM이 직접 더하던 일일 영양 정보(DailyPlan.nutrients)를 이 결과로 채웁니다.
+음식 이름은 음식 이름 색인 -> 벡터 검색 순서로 찾고, 찾지 못한 음식이 있는 날은 합계가 모자라므로 LLM 값을 그대로 둡니다.
+"""
+
+logger = logging.getLogger(__name__)
+
+# 분량 개수 ("2개", "1.5인분", "1/2 공기")
+_COUNT_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(?:\s*/\s*(\d+(?:\.\d+)?))?")
+
+
+def parse_portion(food_amount: str) -> Tuple[float, float]:
+    """
+    FoodItem.food_amount를 (g, 분량 개수)로 변환
+    '150g', '200ml'처럼 무게 단위가 있으면 (g, nan), '1인분', '2개', '1/2 공기'처럼 개수만 있으면 (nan, 개수)
+    아무 숫자도 없으면 1회 분량으로 간주합니다.
+    """
+    grams = parse_amount_g(food_amount)
+    if not np.isnan(grams):
+        return grams, np.nan
+    match = _COUNT_PATTERN.search(food_amount or "")
+    return np.nan, parse_number(match.group(1), match.group(2)) if match else 1.0
+
+
+def resolve_food_ids(food_names: Sequence[str]) -> List[str | None]:
+    """
+    음식 이름을 food_id로 변환
+    음식 이름 색인(정확/정규화/분량 떼기 일치)을 먼저 보고, 찾지 못한 이름만 모아 한 번에 벡터 검색합니다.
+    """
+    from db.food_name_index import get_food_name_index
+    from Agent.qdrant_manager import get_qdrant_manager
+
+    food_names = list(food_names)
+    try:
+        food_ids = get_food_name_index().lookup_many(food_names)
+    except Exception as e:
+        logger.warning(f"음식 이름 색인 조회 실패: {e}")
+        food_ids = [None] * len(food_names)
+
+    misses = [i for i, food_id in enumerate(food_ids) if food_id is None]
+    if misses:
+        try:
+            qdrant_manager = get_qdrant_manager()
+            results = qdrant_manager.get_documents_batch([food_names[i] for i in misses], collection_name=qdrant_manager.collection_names.food_name_collection, limit=1)
+        except Exception as e:
+            logger.warning(f"음식 이름 벡터 검색 실패: {e}")
+            results = [[] for _ in misses]
+        for i, points in zip(misses, results):
+            food_ids[i] = points[0].payload.get("metadata", {}).get("food_id", None) if points else None
+    return food_ids
+
+
+class PlanNutrientReport(BaseModel):
+    """식단 영양소 집계 결과"""
+    columns: List[str] = Field(..., description="영양소 컬럼 순서")
+    meal_index: List[Tuple[int, int]] = Field(..., description="meal_totals 각 행의 (날짜 순번, 식사 순번)")
+    meal_totals: List[List[float]] = Field(..., description="식사별 영양소 합계")
+    daily_totals: List[List[float]] = Field(..., description="날짜별 영양소 합계")
+    weekly_total: List[float] = Field(..., description="주간 영양소 합계")
+    daily_deviation: List[Dict[str, float]] | None = Field(None, description="목표 대비 날짜별 편차 비율 ((합계 - 목표) / 목표)")
+    unresolved_foods: List[str] = Field(default_factory=list, description="영양 정보를 찾지 못한 음식 이름")
+    incomplete_days: List[int] = Field(default_factory=list, description="영양 정보를 찾지 못한 음식이 있어 합계가 모자라는 날짜 순번")
+
+    def daily_nutrients(self, day_index: int) -> NutrientData:
+        """날짜별 합계를 NutrientData(9가지 영양소)로 변환"""
+        totals = dict(zip(self.columns, self.daily_totals[day_index]))
+        return NutrientData(**{column: round(totals[column], 3) for column in MANDATORY_COLUMNS})
+
+
+class NutrientAggregator:
+    """NutrientMatrix 기반 식단 영양소 집계기"""
+
+    def __init__(self, matrix: NutrientMatrix | None = None, resolver: Callable[[Sequence[str]], List[str | None]] = resolve_food_ids):
+        self.matrix = matrix or get_nutrient_matrix()
+        self.resolver = resolver
+
+    def item_nutrients(self, food_ids: Sequence[str | None], food_amounts: Sequence[str]) -> np.ndarray:
+        """음식 항목별 섭취량을 반영한 영양소 (항목 x 영양소), 찾지 못한 항목은 0"""
+        keys = [food_id or "" for food_id in food_ids]
+        idx = self.matrix.indices(keys)
+        found = idx >= 0
+        per_gram = self.matrix.rows(keys, per_gram=True)
+
+        portions = np.array([parse_portion(amount) for amount in food_amounts], dtype=np.float32).reshape(-1, 2)
+        grams, counts = portions[:, 0], portions[:, 1]
+        serving_g = np.full(len(keys), np.nan, dtype=np.float32)
+        reference_g = np.full(len(keys), np.nan, dtype=np.float32)
+        serving_g[found] = self.matrix.serving_g[idx[found]]
+        reference_g[found] = self.matrix.reference_g[idx[found]]
+        unit_g = np.where(np.isnan(serving_g), reference_g, serving_g)
+        grams = np.where(np.isnan(grams), counts * unit_g, grams)
+
+        return np.nan_to_num(per_gram * grams[:, None], nan=0.0)
+
+    def aggregate(self, plan: WeeklyMealPlan, target: NutrientData | Dict | None = None) -> PlanNutrientReport:
+        """식사/일/주 단위 영양소 합계와 목표 대비 편차 계산"""
+        names, amounts, item_meal, item_day, meal_index = [], [], [], [], []
+        for day_i, daily_plan in enumerate(plan.days):
+            for meal_i, meal in enumerate(daily_plan.meals):
+                for food_item in meal.food_list:
+                    names.append(food_item.food_name)
+                    amounts.append(food_item.food_amount)
+                    item_meal.append(len(meal_index))
+                    item_day.append(day_i)
+                meal_index.append((day_i, meal_i))
+
+        food_ids = self.resolver(names) if names else []
+        items = self.item_nutrients(food_ids, amounts)
+        n_columns = len(self.matrix.columns)
+
+        meal_totals = np.zeros((len(meal_index), n_columns), dtype=np.float64)
+        np.add.at(meal_totals, np.asarray(item_meal, dtype=np.int64), items)
+        daily_totals = np.zeros((len(plan.days), n_columns), dtype=np.float64)
+        np.add.at(daily_totals, np.asarray([day_i for day_i, _ in meal_index], dtype=np.int64), meal_totals)
+        weekly_total = daily_totals.sum(axis=0)
+
+        daily_deviation = None
+        if target is not None:
+            target = target if isinstance(target, dict) else target.model_dump()
+            cols = self.matrix.column_indices(MANDATORY_COLUMNS)
+            goal = np.array([target[column] for column in MANDATORY_COLUMNS], dtype=np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                deviation = np.where(goal > 0, (daily_totals[:, cols] - goal) / goal, 0.0)
+            daily_deviation = [dict(zip(MANDATORY_COLUMNS, np.round(row, 4).tolist())) for row in deviation]
+
+        found = self.matrix.indices([food_id or "" for food_id in food_ids]) >= 0
+        unresolved = sorted({name for name, is_found in zip(names, found) if not is_found})
+        incomplete_days = sorted({day_i for day_i, is_found in zip(item_day, found) if not is_found})
+        if unresolved:
+            logger.warning(f"영양 정보를 찾지 못한 음식 {len(unresolved)}건: {unresolved}")
+
+        return PlanNutrientReport(
+            columns=list(self.matrix.columns),
+            meal_index=meal_index,
+            meal_totals=meal_totals.tolist(),
+            daily_totals=daily_totals.tolist(),
+            weekly_total=weekly_total.tolist(),
+            daily_deviation=daily_deviation,
+            unresolved_foods=unresolved,
+            incomplete_days=incomplete_days,
+        )
+
+    def fill_daily_nutrients(self, plan: WeeklyMealPlan, target: NutrientData | Dict | None = None) -> Tuple[WeeklyMealPlan, PlanNutrientReport]:
+        """
+        DailyPlan.nutrients를 집계 결과로 덮어쓴 식단과 집계 결과 반환
+        모든 음식을 찾은 날만 덮어쓰고, 찾지 못한 음식이 있는 날(report.incomplete_days)은 원래(LLM) 값을 유지합니다.
+        """
+        report = self.aggregate(plan, target)
+        filled = plan.model_copy(deep=True)
+        incomplete = set(report.incomplete_days)
+        for day_i, daily_plan in enumerate(filled.days):
+            if day_i not in incomplete:
+                daily_plan.nutrients = report.daily_nutrients(day_i)
+        return filled, report
+
+
+def sum_nutrient_data(nutrient_data: Sequence[NutrientData]) -> NutrientData:
+    """NutrientData 목록의 합계"""
+    values = np.array([[getattr(nutrient, column) or 0.0 for column in MANDATORY_COLUMNS] for nutrient in nutrient_data], dtype=np.float64).reshape(-1, len(MANDATORY_COLUMNS))
+    return NutrientData(**dict(zip(MANDATORY_COLUMNS, values.sum(axis=0).tolist())))
@@ -1,12 +1,15 @@
-from langchain_core.tools.retriever import create_retriever_tool
-from langchain_core.prompts import PromptTemplate
+from langchain_core.prompts import PromptTemplate, format_document
 from langchain_core.tools import tool
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Sequence
 from pydantic import BaseModel, Field
 from datetime import time, date
 
-from db.db_manager import DBManager
-from qdrant_manager import qdrant_manager
+from db.database import db_scope
+from model.schemas.agent import NutrientData, FoodItem, Meal, DailyPlan, WeeklyMealPlan
+from Agent.tools.nutrient_aggregator import resolve_food_ids, sum_nutrient_data
+from Agent.tools import dri_calculator
+from db.cache import singleton
+from Agent.qdrant_manager import get_qdrant_manager, build_filter
 
 
 # @tool
@@ -52,17 +55,93 @@ def search_food_tag(
         예시: {"tag_id": "T001", "tag_name": "고단백"}
     """
     try:
-        result = qdrant_manager.get_documents(food_tag, collection_name=qdrant_manager.collection_names.food_tag_collection)
-        if result:
-            result = result[0].payload.get("metadata", None)
-            return {"tag_id": result.get("tag_id", None), "tag_name": result.get("tag_name", None)}
-        else:
-            return None  # 검색 결과가 없을 경우 None 반환
+        return _search_food_tags([food_tag])[0]
     except Exception as e:
         print(f"Error in search_food_tag: {e}")
         return None  # 에러 발생 시 None 반환
 
 
+@tool
+def search_food_tags(
+    food_tags: List[str]
+) -> Dict[str, Dict[str, str] | None]:
+    """
+    여러 태그 이름을 한 번에 검색하여 각 태그와 가장 유사한 태그의 tag_id와 tag_name을 반환합니다.
+    태그가 여러 개라면 search_food_tag를 여러 번 호출하는 대신 이 툴을 한 번 호출하세요.
+
+    Args:
+        food_tags: 검색할 태그 이름 목록
+
+    Returns:
+        검색한 태그 이름을 키로, {"tag_id", "tag_name"} 사전(찾지 못하면 None)을 값으로 하는 사전.
+        예시: {"고단백": {"tag_id": "T001", "tag_name": "고단백"}, "없는태그": None}
+    """
+    try:
+        return dict(zip(food_tags, _search_food_tags(food_tags)))
+    except Exception as e:
+        print(f"Error in search_food_tags: {e}")
+        return {food_tag: None for food_tag in food_tags}
+
+
+def _search_food_tags(food_tags: Sequence[str]) -> List[Dict[str, str] | None]:
+    """태그 이름 목록을 한 번에 임베딩/검색해 가장 유사한 태그 정보 목록 반환"""
+    qdrant_manager = get_qdrant_manager()
+    results = qdrant_manager.get_documents_batch(list(food_tags), collection_name=qdrant_manager.collection_names.food_tag_collection, limit=1)
+    tags = []
+    for points in results:
+        metadata = points[0].payload.get("metadata", None) if points else None
+        tags.append({"tag_id": metadata.get("tag_id", None), "tag_name": metadata.get("tag_name", None)} if metadata else None)
+    return tags
+
+
+@tool
+def search_similar_foods(
+    query: str,
+    major_category: str | None = None,
+    include_tags: List[str] | None = None,
+    exclude_tags: List[str] | None = None,
+    limit: int = 10,
+) -> List[Dict[str, Any]] | str:
+    """
+    음식 이름과 비슷한 음식을 대분류와 태그 조건으로 걸러서 검색합니다.
+    "X와 비슷하지만 밥류이고 Y 태그는 없는 음식"처럼 조건이 있는 대체 음식을 찾을 때 사용하세요.
+
+    Args:
+        query: 기준이 되는 음식 이름 (예: "김치볶음밥")
+        major_category: 식품대분류명 조건 (예: "밥류"), 없으면 전체
+        include_tags: 이 태그 중 하나라도 가진 음식만 검색
+        exclude_tags: 이 태그 중 하나라도 가진 음식은 제외
+        limit: 최대 결과 수
+
+    Returns:
+        유사도 순서의 음식 목록. 각 항목은 food_id, food_name, major_category_name, tags, score를 가집니다.
+        검색에 실패하면 실패 사유 문자열을 반환합니다.
+    """
+    try:
+        qdrant_manager = get_qdrant_manager()
+        points = qdrant_manager.get_documents(
+            query,
+            collection_name=qdrant_manager.collection_names.food_name_collection,
+            limit=limit,
+            query_filter=build_filter(
+                must={"major_category_name": major_category, "tags": include_tags},
+                must_not={"tags": exclude_tags},
+            ),
+        )
+        return [
+            {
+                "food_id": point.payload.get("metadata", {}).get("food_id"),
+                "food_name": point.payload.get("metadata", {}).get("food_name"),
+                "major_category_name": point.payload.get("metadata", {}).get("major_category_name"),
+                "tags": point.payload.get("metadata", {}).get("tags", []),
+                "score": point.score,
+            }
+            for point in points
+        ]
+    except Exception as e:
+        return f"'{query}'와 비슷한 음식을 찾는 데 실패했습니다. {e}"
+
+
 # @tool
 # def get_nutrient_info(
 #     food_id: str
@@ -162,38 +241,53 @@ def get_food_nutrient(food_name: str) -> Dict[str, float | None] | str:
         }
     """
     try:
-        datas = qdrant_manager.get_documents(food_name, collection_name=qdrant_manager.collection_names.food_name_collection)
-        if len(datas) == 0:
-            return f"'{food_name}'에 대한 음식 ID를 찾을 수 없거나 검색에 실패했습니다."
-        
-        payload = datas[0].payload
-        food_id = payload.get("metadata", {}).get("food_id", None)
-
-        if food_id is None:
-            return f"'{food_name}'에 대한 음식 ID를 찾을 수 없거나 검색에 실패했습니다."
-
-        db = DBManager()
-        with db as manager:
-            food_info = manager.get_food_info(food_id)
-            if food_info.get("nutrition", None) is None:
-                return f"'{food_name}'에 대한 영양 정보를 찾을 수 없습니다."
-            else:
-                return food_info["nutrition"]
+        return _get_food_nutrients([food_name])[0]
     except Exception as e:
         return f"'{food_name}'에 대한 영양 정보를 찾는 데 실패했습니다. {e}"
 
 
-class NutrientData(BaseModel):
-    """사용자의 일일 권장 영양소 섭취량 데이터."""
-    energy_kcal: float = Field(..., description="권장 일일 에너지 섭취량 (kcal).")
-    protein_g: float = Field(..., description="권장 일일 단백질 섭취량 (g).")
-    fat_g: float = Field(..., description="권장 일일 지방 섭취량 (g).")
-    carbohydrate_g: float = Field(..., description="권장 일일 탄수화물 섭취량 (g).")
-    sugars_g: float = Field(..., description="권장 일일 당류 섭취량 (g).")
-    sodium_mg: float = Field(..., description="권장 일일 나트륨 섭취량 (mg).")
-    cholesterol_mg: float = Field(..., description="권장 일일 콜레스테롤 섭취량 (mg).")
-    saturated_fat_g: float = Field(..., description="권장 일일 포화지방 섭취량 (g).")
-    trans_fat_g: float = Field(..., description="권장 일일 트랜스지방 섭취량 (g).")
+@tool
+def get_food_nutrients(food_names: List[str]) -> Dict[str, Dict[str, float | str | None] | str]:
+    """
+    여러 음식 이름으로 각 음식의 영양 정보를 한 번에 가져옵니다.
+    식단에 들어갈 음식이 여러 개라면 get_food_nutrient를 여러 번 호출하는 대신 이 툴을 한 번 호출하세요.
+
+    Args:
+        food_names: 검색할 음식 이름 목록
+
+    Returns:
+        음식 이름을 키로, 영양 정보 사전(get_food_nutrient의 반환 형식과 같음)을 값으로 하는 사전.
+        정보를 찾지 못한 음식은 값으로 실패 사유 문자열을 가집니다.
+    """
+    try:
+        return dict(zip(food_names, _get_food_nutrients(food_names)))
+    except Exception as e:
+        return {food_name: f"'{food_name}'에 대한 영양 정보를 찾는 데 실패했습니다. {e}" for food_name in food_names}
+
+
+def _resolve_food_ids(food_names: Sequence[str]) -> List[str | None]:
+    """음식 이름의 food_id 목록 (식단 영양소 집계와 같은 경로: 음식 이름 색인 -> 벡터 검색)"""
+    return resolve_food_ids(food_names)
+
+
+def _get_food_nutrients(food_names: Sequence[str]) -> List[Dict[str, float | str | None] | str]:
+    """음식 이름 목록의 food_id를 찾은 뒤 DB에서 영양 정보를 일괄 조회"""
+    food_ids = _resolve_food_ids(food_names)
+
+    with db_scope() as manager:
+        foods = manager.get_foods_by_ids([food_id for food_id in food_ids if food_id is not None])
+    foods_by_id = {food.food_id: food for food in foods if food is not None}
+
+    nutrients = []
+    for food_name, food_id in zip(food_names, food_ids):
+        food = foods_by_id.get(food_id)
+        if food_id is None:
+            nutrients.append(f"'{food_name}'에 대한 음식 ID를 찾을 수 없거나 검색에 실패했습니다.")
+        elif food is None or food.food_nutrition is None:
+            nutrients.append(f"'{food_name}'에 대한 영양 정보를 찾을 수 없습니다.")
+        else:
+            nutrients.append(food.food_nutrition.model_dump())
+    return nutrients
 
 
 @tool
@@ -207,46 +301,11 @@ def format_nutrient_json(nutrient_data: NutrientData) -> Dict:
     return nutrient_data.model_dump()
 
 @tool
-def calculate_nutrient_sum(nutrient_data: List[NutrientData]) -> NutrientData:
+def calculate_nutrient_sum(nutrient_data: List[NutrientData]) -> Dict:
     """
-    일일 권장 영양소 섭취량 데이터를 합산하여 일일 영양 정보를 계산합니다.
+    여러 영양소 섭취량 데이터를 합산하여 일일 영양 정보를 계산합니다.
     """
-    total_nutrient_data = NutrientData()
-    for nutrient in nutrient_data:
-        total_nutrient_data.energy_kcal += nutrient.energy_kcal if nutrient.energy_kcal is not None else 0
-        total_nutrient_data.protein_g += nutrient.protein_g if nutrient.protein_g is not None else 0
-        total_nutrient_data.fat_g += nutrient.fat_g if nutrient.fat_g is not None else 0
-        total_nutrient_data.carbohydrate_g += nutrient.carbohydrate_g if nutrient.carbohydrate_g is not None else 0
-        total_nutrient_data.sugars_g += nutrient.sugars_g if nutrient.sugars_g is not None else 0
-        total_nutrient_data.sodium_mg += nutrient.sodium_mg if nutrient.sodium_mg is not None else 0
-        total_nutrient_data.cholesterol_mg += nutrient.cholesterol_mg if nutrient.cholesterol_mg is not None else 0
-        total_nutrient_data.saturated_fat_g += nutrient.saturated_fat_g if nutrient.saturated_fat_g is not None else 0
-        total_nutrient_data.trans_fat_g += nutrient.trans_fat_g if nutrient.trans_fat_g is not None else 0
-    return total_nutrient_data.model_dump()
-
-# 음식 이름과 영양 정보를 함께 담을 Pydantic 모델
-class FoodItem(BaseModel):
-    """식단 내의 단일 음식 항목입니다. 이름과 함께 9가지 영양 정보를 포함합니다."""
-    food_name: str = Field(..., description="음식의 이름입니다.")
-    food_amount: str = Field(..., description="섭취할 음식의 양입니다.")
-
-# 각 식사를 나타내는 Pydantic 모델 (food_list 타입 변경)
-class Meal(BaseModel):
-    """단일 식사에 대한 상세 정보입니다."""
-    time_slot: time = Field(..., description="식사 시간입니다. 'HH:MM' 형식의 분 단위 시간으로 표시됩니다 (예: '13:00').")
-    food_list: List[FoodItem] = Field(..., description="해당 식사에 포함되는 음식 목록입니다.")
-
-# 하루의 식단 계획을 나타내는 Pydantic 모델
-class DailyPlan(BaseModel):
-    """하루의 식단 계획 정보입니다."""
-    day: date = Field(..., description="해당 식단 계획의 날짜입니다. 'YYYY-MM-DD' 형식의 일단위 날짜로 표시됩니다 (예: '2025-06-23').")
-    meals: List[Meal] = Field(..., description="해당 요일의 식사 목록입니다.")
-    nutrients: NutrientData = Field(..., description="해당 날짜의 9가지 영양 정보입니다.")
-
-# 주간 식단 계획 전체를 나타내는 Pydantic 모델
-class WeeklyMealPlan(BaseModel):
-    """7일간의 주간 식단 계획 전체입니다."""
-    days: List[DailyPlan] = Field(..., description="각 요일의 식단 계획 목록입니다. 총 7개의 DailyPlan 객체를 포함해야 합니다.")
+    return sum_nutrient_data(nutrient_data).model_dump()
 
 
 @tool
@@ -290,33 +349,31 @@ def calculate_tdee(
         계산에 실패하면 오류 메시지를 반환합니다.
     """
     try:
-        if activity_level == "sedentary":
-            tdee = 1.2 * (10 * weight + 6.25 * height - 5 * age + 5)
-        elif activity_level == "lightly_exercise":
-            tdee = 1.375 * (10 * weight + 6.25 * height - 5 * age + 5)
-        elif activity_level == "moderately_exercising":
-            tdee = 1.55 * (10 * weight + 6.25 * height - 5 * age + 5)
-        elif activity_level == "heavy_exercising":
-            tdee = 1.725 * (10 * weight + 6.25 * height - 5 * age + 5)
-        else:
-            return f"활동 수준이 올바르지 않습니다. 활동 수준은 'sedentary', 'lightly_exercising', 'moderately_exercising', 'heavy_exercising' 중 하나여야 합니다."
-        
-        return tdee
+        return dri_calculator.calculate_tdee(age, weight, height, activity_level)
+    except ValueError as e:
+        return str(e)
     except Exception as e:
         return f"TDEE 계산에 실패했습니다. {e}"
 
 
-qdrant_retriever = qdrant_manager.get_retriever(qdrant_manager.collection_names.food_docs_collection)
-
-retriever_tool = create_retriever_tool(
-    qdrant_retriever, 
-    name="retriever",
-    description="공식 지침 및 영양학, 생리학 문서를 검색할 때 사용하세요.", 
-    document_prompt=PromptTemplate.from_template(
-        "<document><context>{page_content}</context><source>{source}</source></document>"
-    )
+RETRIEVER_DOCUMENT_PROMPT = PromptTemplate.from_template(
+    "<document><context>{page_content}</context><source>{source}</source></document>"
 )
 
 
+@singleton
+def get_docs_retriever():
+    """공식 지침 문서 retriever (처음 호출될 때 임베딩 모델과 Qdrant 연결 생성)"""
+    qdrant_manager = get_qdrant_manager()
+    return qdrant_manager.get_retriever(qdrant_manager.collection_names.food_docs_collection)
+
+
+@tool("retriever")
+def retriever_tool(query: str) -> str:
+    """공식 지침 및 영양학, 생리학 문서를 검색할 때 사용하세요."""
+    documents = get_docs_retriever().invoke(query)
+    return "\n\n".join(format_document(document, RETRIEVER_DOCUMENT_PROMPT) for document in documents)
+
+
 if __name__ == "__main__":
     print(get_food_nutrient())
\ No newline at end of file
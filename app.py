@@ -4,6 +4,11 @@ import sys
 # 프로젝트 루트 경로를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
+import asyncio
+import logging
+
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
@@ -12,6 +17,43 @@ import uvicorn
 from router.user.user_router import user_router
 from router.food.food_router import food_router
 from router.agent.agent_router import agent_router
+from db.database import get_pool_stats
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# 시작 시 에이전트/임베딩 모델/Qdrant를 백그라운드로 미리 준비할지 여부
+AGENT_WARMUP = os.getenv("AGENT_WARMUP", "true").lower() == "true"
+
+# 백그라운드 준비 상태 (pending / ready / failed / disabled)
+warmup_state = {"agent": "disabled"}
+
+
+def _warmup():
+    # 에이전트 모듈 import도 무거우므로 이벤트 루프가 아니라 스레드에서 실행
+    from Agent.scheduler import warmup
+    warmup()
+
+
+async def warmup_agent():
+    warmup_state["agent"] = "pending"
+    try:
+        await asyncio.to_thread(_warmup)
+        warmup_state["agent"] = "ready"
+    except Exception as e:
+        warmup_state["agent"] = "failed"
+        logger.error(f"agent warmup failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 모델 로딩을 기다리지 않고 바로 요청을 받을 수 있도록 준비 작업은 백그라운드 태스크로 실행
+    warmup_task = asyncio.create_task(warmup_agent()) if AGENT_WARMUP else None
+    yield
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+
 
 app = FastAPI(
     title="AI Agent API",
@@ -20,6 +62,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
 # 정적 파일 설정
@@ -33,6 +76,16 @@ app.include_router(user_router)
 app.include_router(food_router)
 app.include_router(agent_router)
 
+# 헬스 체크 (에이전트 준비 여부와 관계없이 즉시 응답)
+@app.get("/health")
+async def health():
+    return {"status": "ok", **warmup_state}
+
+# DB 커넥션 풀 사용량 (사용 중/overflow 연결 수, 연결 대기 시간)
+@app.get("/health/db")
+async def health_db():
+    return get_pool_stats()
+
 # 템플릿 라우트 핸들러들
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
@@ -1,33 +1,116 @@
+from typing import Iterator
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from tqdm import tqdm
 from langchain_core.documents import Document
 from Agent.qdrant_manager import QdrantManager, collections
+from db.database import DBManager
 from langchain_text_splitters import RecursiveCharacterTextSplitter, MarkdownTextSplitter
 import pymupdf
+import bisect
+import itertools
+import multiprocessing
+import shutil
 import os
 
+# add_documents 진행 기록 디렉터리 (중단 후 다시 실행하면 완료된 배치를 건너뜀)
+INGEST_PROGRESS_DIR = os.getenv("INGEST_PROGRESS_DIR", "data/ingest_progress")
+# PDF 파싱 프로세스 수, 작업 단위 페이지 수, 표 추출 여부
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", os.cpu_count() or 1))
+PDF_SHARD_PAGES = int(os.getenv("PDF_SHARD_PAGES", 16))
+PDF_EXTRACT_TABLES = os.getenv("PDF_EXTRACT_TABLES", "true").lower() == "true"
+# food_name 컬렉션 원본: db(대분류/태그 payload 포함) 또는 file(food_name_path)
+FOOD_NAME_SOURCE = os.getenv("FOOD_NAME_SOURCE", "db").lower()
+
 
 class FoodReader:
+    """파일을 한 줄씩 읽어 Document를 하나씩 yield"""
+
     @staticmethod
-    def get_docs_from_food_name(food_name_path: str) -> list[Document]:
-        documents = []
+    def get_docs_from_food_name(food_name_path: str) -> Iterator[Document]:
         with open(food_name_path, "r", encoding="utf-8") as f:
-            for line in tqdm(f.readlines(), desc="Getting food name documents"):
+            for line in tqdm(f, desc="Getting food name documents"):
+                if not line.strip():
+                    continue
                 food_id, food_name = line.split(",", 1)
-                documents.append(Document(page_content=food_name.strip(), metadata={"food_id": food_id.strip(), "food_name": food_name.strip()}))
-        return documents
+                yield Document(id=f"food:{food_id.strip()}", page_content=food_name.strip(), metadata={"food_id": food_id.strip(), "food_name": food_name.strip()})
     
     @staticmethod
-    def get_docs_from_food_tag(food_tag_path: str) -> list[Document]:
-        documents = []
+    def get_docs_from_food_db(batch_size: int = 1000) -> Iterator[Document]:
+        """
+        DB의 음식 목록으로 Document를 yield (payload 필터용 대분류, 데이터구분코드, 태그 포함)
+        id는 get_docs_from_food_name과 같아서 원본을 바꿔도 같은 포인트를 갱신합니다.
+        """
+        with DBManager() as manager:
+            for food in tqdm(manager.iter_food_payloads(batch_size=batch_size), desc="Getting food documents from db"):
+                yield Document(id=f"food:{food['food_id']}", page_content=food["food_name"].strip(), metadata=food)
+
+    @staticmethod
+    def get_docs_from_food_tag(food_tag_path: str) -> Iterator[Document]:
         with open(food_tag_path, "r", encoding="utf-8") as f:
-            for line in tqdm(f.readlines(), desc="Getting food tag documents"):
+            for line in tqdm(f, desc="Getting food tag documents"):
+                if not line.strip():
+                    continue
                 tag_id, tag_name = line.split(",", 1)
-                documents.append(Document(page_content=tag_name.strip(), metadata={"tag_id": tag_id.strip(), "tag_name": tag_name.strip()}))
-        return documents
+                yield Document(id=f"tag:{tag_id.strip()}", page_content=tag_name.strip(), metadata={"tag_id": tag_id.strip(), "tag_name": tag_name.strip()})
 
 class PdfReader:
     @staticmethod
-    def get_docs_from_pdf(pdf_path: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> list[Document]:
+    def get_docs_from_pdf(
+            pdf_path: str, 
+            chunk_size: int = 1000, 
+            chunk_overlap: int = 200,
+            workers: int = PDF_WORKERS,
+            shard_pages: int = PDF_SHARD_PAGES,
+            extract_tables: bool = PDF_EXTRACT_TABLES,
+        ) -> Iterator[Document]:
+        """
+        페이지 단위로 청크를 yield (첫 페이지 묶음을 읽자마자 임베딩을 시작할 수 있음)
+        workers가 2 이상이면 shard_pages쪽씩 나눈 페이지 구간을 프로세스 풀에서 파싱하고, 페이지 순서대로 yield합니다.
+        표 추출(page.find_tables)은 느리므로 extract_tables로 끌 수 있습니다.
+        """
+        with pymupdf.open(pdf_path) as doc:
+            page_count = doc.page_count
+            toc_pages, toc_titles = PdfReader.get_toc_index(doc.get_toc())
+        file_name = os.path.basename(pdf_path)
+        shards = [(start, min(start + shard_pages, page_count)) for start in range(0, page_count, shard_pages)]
+        args = (pdf_path, chunk_size, chunk_overlap, extract_tables, toc_pages, toc_titles)
+
+        with tqdm(total=page_count, desc=f"document화 진행 중: {file_name}") as pbar:
+            if workers <= 1:
+                for start, end in shards:
+                    yield from PdfReader.parse_pages(*args, start, end)
+                    pbar.update(end - start)
+                return
+
+            # 메모리가 파싱 결과로 쌓이지 않도록 workers * 2개 구간까지만 미리 제출
+            # 임베딩/업로드 스레드가 도는 프로세스를 fork하면 잠긴 락이 복사될 수 있어 spawn으로 새 인터프리터를 띄움
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                shard_iter = iter(shards)
+                futures = deque(
+                    (executor.submit(PdfReader.parse_pages, *args, start, end), end - start)
+                    for start, end in itertools.islice(shard_iter, workers * 2)
+                )
+                while futures:
+                    future, n_pages = futures.popleft()
+                    for start, end in itertools.islice(shard_iter, 1):
+                        futures.append((executor.submit(PdfReader.parse_pages, *args, start, end), end - start))
+                    yield from future.result()
+                    pbar.update(n_pages)
+
+    @staticmethod
+    def parse_pages(
+            pdf_path: str, 
+            chunk_size: int, 
+            chunk_overlap: int, 
+            extract_tables: bool, 
+            toc_pages: list[int], 
+            toc_titles: list[str], 
+            start: int, 
+            end: int,
+        ) -> list[Document]:
+        """[start, end) 페이지를 파싱 (프로세스 풀 작업 단위)"""
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
@@ -37,8 +120,8 @@ class PdfReader:
         documents = []
         with pymupdf.open(pdf_path) as doc:
             file_name = os.path.basename(pdf_path)
-            for page_num in tqdm(range(doc.page_count), desc=f"document화 진행 중: {file_name}"):
-                current_section = PdfReader.get_section_to_idx(doc, page_num+1)
+            for page_num in range(start, end):
+                current_section = PdfReader.get_section(toc_pages, toc_titles, page_num+1, doc.page_count)
                 page = doc.load_page(page_num)
                 text_docs = PdfReader.docs_from_texts(
                         texts=text_splitter.split_text(page.get_text()), 
@@ -50,7 +133,7 @@ class PdfReader:
                         }
                     )
                 tables_docs = PdfReader.docs_from_tables(
-                    tables=page.find_tables(), 
+                    tables=page.find_tables() if extract_tables else [], 
                     metadata={
                         "source": file_name, 
                         "page": page_num+1, 
@@ -59,7 +142,7 @@ class PdfReader:
                     }
                 )
                 links_docs = PdfReader.docs_from_links(
-                    links=page.find_links(), 
+                    links=page.get_links(), 
                     metadata={
                         "source": file_name, 
                         "page": page_num+1, 
@@ -68,26 +151,30 @@ class PdfReader:
                     }
                 )
                 contents_docs = text_docs + tables_docs + links_docs
+                for i, document in enumerate(contents_docs):
+                    document.id = f"{file_name}:{page_num+1}:{i}"
                 documents.extend(contents_docs)
         return documents
 
     @staticmethod
-    def get_section_to_idx(doc, page_num):
-        toc = doc.get_toc()
-        if not toc:
+    def get_toc_index(toc: list) -> tuple[list[int], list[str]]:
+        """목차를 (시작 페이지의 누적 최댓값, 제목) 목록으로 변환 (한 번만 만들고 get_section에서 bisect로 조회)"""
+        toc_pages, toc_titles = [], []
+        for level, title, start_page_num in toc:
+            toc_pages.append(max(start_page_num, toc_pages[-1]) if toc_pages else start_page_num)
+            toc_titles.append(title)
+        return toc_pages, toc_titles
+
+    @staticmethod
+    def get_section(toc_pages: list[int], toc_titles: list[str], page_num: int, page_count: int) -> str:
+        if not toc_pages:
             return "N/A"
-        if page_num < toc[0][2]:
+        if page_num < toc_pages[0]:
             return "cover page"
-        if page_num > doc.page_count:
+        if page_num > page_count:
             return "N/A"
-
-        # 섹션 찾기
-        last_section = toc[0][1]
-        for i, (level, title, start_page_num) in enumerate(toc):
-            if page_num < start_page_num:
-                return last_section
-            last_section = title
-        return last_section  # 마지막 섹션 이후면 마지막 섹션 반환
+        # 시작 페이지가 page_num 이하인 마지막 섹션
+        return toc_titles[bisect.bisect_right(toc_pages, page_num) - 1]
     
     @staticmethod
     def docs_from_texts(texts: list[str], metadata: dict):
@@ -100,7 +187,7 @@ class PdfReader:
         return contents_docs
     
     @staticmethod
-    def docs_from_tables(tables: list[pymupdf.Table], metadata: dict):
+    def docs_from_tables(tables: list[pymupdf.table.Table], metadata: dict):
         contents_docs = []
         for table in tables:
             contents_docs.append(Document(
@@ -110,7 +197,7 @@ class PdfReader:
         return contents_docs
     
     @staticmethod
-    def docs_from_links(links: list[pymupdf.Link], metadata: dict):
+    def docs_from_links(links: list[dict], metadata: dict):
         contents_docs = []
         for link in links:
             if link['kind'] == pymupdf.LINK_URI:
@@ -122,70 +209,95 @@ class PdfReader:
     
 class GuidelinesReader:
     @staticmethod
-    def get_docs_from_guidelines(guidelines_dir: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> list[Document]:
-        documents = []
+    def get_docs_from_guidelines(guidelines_dir: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> Iterator[Document]:
+        """파일 단위로 청크를 yield"""
         markdown_splitter = MarkdownTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-        for file in tqdm(list(guidelines_dir.glob("*.md")), desc="Getting guidelines documents"):
+        for file in tqdm(sorted(Path(guidelines_dir).glob("*.md")), desc="Getting guidelines documents"):
             with open(file, "r", encoding="utf-8") as f:
                 texts = markdown_splitter.split_text(f.read())
-                for i, text in enumerate(texts):
-                    documents.append(Document(page_content=text, metadata={"source": file.name, "chunk_id": i}))
-        return documents
+            for i, text in enumerate(texts):
+                yield Document(id=f"guidelines/{file.name}:{i}", page_content=text, metadata={"source": file.name, "chunk_id": i})
 
 
 class QdrantSetter:
-    def __init__(self, pdf_paths: list[str], guidelines_dir: str, food_name_path: str, food_tag_path: str, batch_size: int = 1000):
+    def __init__(self, pdf_paths: list[str], guidelines_dir: str, food_name_path: str, food_tag_path: str, batch_size: int = 1000, progress_dir: str = INGEST_PROGRESS_DIR, food_name_source: str = FOOD_NAME_SOURCE):
         self.qdrant_manager = QdrantManager()
         self.batch_size = batch_size
+        self.progress_dir = progress_dir
+        self.food_name_source = food_name_source
         self.pdf_paths = pdf_paths
         self.guidelines_dir = guidelines_dir
         self.food_name_path = food_name_path
         self.food_tag_path = food_tag_path
     
-    def set_all(self, reset: bool = False):
+    def set_all(self, reset: bool = False, delete_missing: bool = True):
+        """
+        모든 원본을 컬렉션에 반영 (바뀐 문서만 임베딩해 업로드)
+        delete_missing이면 이번에 읽은 원본에 없는 포인트를 컬렉션에서 삭제합니다.
+        """
         if reset:
             print("Resetting qdrant")
             self.qdrant_manager.reset_collection(collections.food_docs_collection)
             self.qdrant_manager.reset_collection(collections.food_name_collection)
             self.qdrant_manager.reset_collection(collections.food_tag_collection)
+            shutil.rmtree(self.progress_dir, ignore_errors=True)
         
         print("Setting documents to qdrant")
-        self.set_pdf()
-        self.set_guidelines()
-        self.set_food_name()
-        self.set_food_tag()
+        point_ids = {
+            collections.food_docs_collection: self.set_pdf() | self.set_guidelines(),
+            collections.food_name_collection: self.set_food_name(),
+            collections.food_tag_collection: self.set_food_tag(),
+        }
+        if delete_missing:
+            for collection_name, ids in point_ids.items():
+                self.qdrant_manager.delete_missing(collection_name, ids)
+
+    def progress_path(self, collection_name: str, source: str) -> str:
+        os.makedirs(self.progress_dir, exist_ok=True)
+        return os.path.join(self.progress_dir, f"{collection_name}__{os.path.basename(str(source))}.json")
 
-    def set_pdf(self):
+    def set_pdf(self) -> set[str]:
+        point_ids = set()
         for i, pdf_path in enumerate(self.pdf_paths):
             print(f"Adding pdf documents to qdrant: {i+1}/{len(self.pdf_paths)} {pdf_path}")
-            self.qdrant_manager.add_documents(
+            point_ids |= self.qdrant_manager.add_documents(
                 documents=PdfReader.get_docs_from_pdf(pdf_path), 
                 collection_name=collections.food_docs_collection, 
-                batch_size=self.batch_size
+                batch_size=self.batch_size,
+                progress_path=self.progress_path(collections.food_docs_collection, pdf_path)
             )
+        return point_ids
 
-    def set_guidelines(self):
+    def set_guidelines(self) -> set[str]:
         print(f"Adding guidelines documents to qdrant: {self.guidelines_dir}")
-        self.qdrant_manager.add_documents(
+        return self.qdrant_manager.add_documents(
             documents=GuidelinesReader.get_docs_from_guidelines(self.guidelines_dir), 
             collection_name=collections.food_docs_collection, 
-            batch_size=self.batch_size
+            batch_size=self.batch_size,
+            progress_path=self.progress_path(collections.food_docs_collection, self.guidelines_dir)
         )
 
-    def set_food_name(self):
-        print(f"Adding food name documents to qdrant: {self.food_name_path}")
-        self.qdrant_manager.add_documents(
-            documents=FoodReader.get_docs_from_food_name(self.food_name_path), 
+    def set_food_name(self) -> set[str]:
+        if self.food_name_source == "db":
+            print("Adding food name documents to qdrant: db")
+            documents, source = FoodReader.get_docs_from_food_db(), "db"
+        else:
+            print(f"Adding food name documents to qdrant: {self.food_name_path}")
+            documents, source = FoodReader.get_docs_from_food_name(self.food_name_path), self.food_name_path
+        return self.qdrant_manager.add_documents(
+            documents=documents, 
             collection_name=collections.food_name_collection, 
-            batch_size=self.batch_size
+            batch_size=self.batch_size,
+            progress_path=self.progress_path(collections.food_name_collection, source)
         )
 
-    def set_food_tag(self):
+    def set_food_tag(self) -> set[str]:
         print(f"Adding food tag documents to qdrant: {self.food_tag_path}")
-        self.qdrant_manager.add_documents(
+        return self.qdrant_manager.add_documents(
             documents=FoodReader.get_docs_from_food_tag(self.food_tag_path), 
             collection_name=collections.food_tag_collection, 
-            batch_size=self.batch_size
+            batch_size=self.batch_size,
+            progress_path=self.progress_path(collections.food_tag_collection, self.food_tag_path)
         )
 
 if __name__ == "__main__":
@@ -0,0 +1,13 @@
+"""
+모든 테이블 모델이 상속하는 Base
+
+테이블 모듈은 db.database 대신 여기서 Base를 임포트합니다.
+db.database는 믹스인을 통해 테이블 모듈을 임포트하므로, 테이블 모듈이 db.database를 임포트하면
+어느 쪽을 먼저 임포트하느냐에 따라 순환 임포트가 생깁니다.
+"""
+from sqlalchemy.orm import DeclarativeBase
+
+
+# SQLAlchemy 2.0 스타일 Base 클래스 정의
+class Base(DeclarativeBase):
+    pass
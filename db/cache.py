@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, TypeVar
+import functools
+import threading
+import time
+
+
+_MISSING = object()
+
+T = TypeVar("T")
+
+
+def singleton(func: Callable[[], T]) -> Callable[[], T]:
+    """
+    인자 없는 lazy getter를 프로세스 단위 싱글톤으로 만드는 데코레이터
+    functools.lru_cache만 쓰면 warmup 스레드와 첫 요청이 동시에 호출할 때 둘 다 생성하므로, 처음 생성하는 동안은 락으로 기다리게 합니다.
+    cache_clear()로 버리면 다음 호출에서 다시 생성합니다.
+    """
+    cached = functools.lru_cache(maxsize=None)(func)
+    lock = threading.RLock()
+
+    @functools.wraps(func)
+    def wrapper() -> T:
+        if cached.cache_info().currsize:
+            return cached()
+        with lock:
+            return cached()
+
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.cache_info = cached.cache_info
+    return wrapper
+
+
+class TTLCache:
+    """
+    스레드 안전한 LRU + TTL 캐시
+    maxsize를 넘으면 가장 오래 사용되지 않은 항목부터 제거하고,
+    ttl(초)이 지난 항목은 조회 시점에 만료 처리합니다. ttl이 None이면 만료되지 않습니다.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        if maxsize <= 0:
+            raise ValueError("maxsize는 1 이상이어야 합니다.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시 조회, 없거나 만료되었으면 default 반환"""
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """캐시 저장, 용량을 넘으면 LRU 항목 제거"""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """단일 항목 무효화"""
+        with self._lock:
+            return self._data.pop(key, _MISSING) is not _MISSING
+
+    def clear(self) -> None:
+        """전체 무효화"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/실패 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,29 +1,96 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
-from contextlib import contextmanager
+from sqlalchemy import create_engine, exc
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterator, Tuple
 from dotenv import load_dotenv
+import asyncio
+import functools
+import logging
 import os
+import threading
+import time
 
+from db.base import Base
 from db.db_mixin.user_mixin import UserMixin
 from db.db_mixin.food_mixin import FoodMixin
 
+if TYPE_CHECKING:
+    # sqlalchemy.ext.asyncio는 greenlet이 필요하므로 비동기 엔진을 처음 만들 때 불러옴
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 MYSQL_USER = os.getenv("MYSQL_USER")
 MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD")
 MYSQL_HOST = os.getenv("MYSQL_HOST")
 MYSQL_PORT = os.getenv("MYSQL_PORT")
 MYSQL_DATABASE = os.getenv("MYSQL_DATABASE")
+# 비동기 엔진 드라이버 (aiomysql 또는 asyncmy)
+MYSQL_ASYNC_DRIVER = os.getenv("MYSQL_ASYNC_DRIVER", "aiomysql")
 
 DATABASE_URL = f'mysql+mysqlconnector://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}'
+ASYNC_DATABASE_URL = f'mysql+{MYSQL_ASYNC_DRIVER}://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}'
+
+
+
+class PoolWaitStats:
+    """커넥션 풀에서 연결을 얻기까지 걸린 시간 통계 (새 연결 생성 시간 포함)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+
+    def observe(self, seconds: float, timeout: bool = False) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            self.timeouts += timeout
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "avg_ms": self.total / self.count * 1000 if self.count else 0.0,
+                "max_ms": self.max * 1000,
+                "timeouts": self.timeouts,
+            }
+
+
+class _TimedPoolMixin:
+    """풀에서 연결을 꺼낼 때마다 대기 시간을 wait_stats에 기록"""
 
-# SQLAlchemy 2.0 스타일 Base 클래스 정의
-# 이 Base 객체를 모든 모델 파일에서 임포트하여 사용합니다.
-class Base(DeclarativeBase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats.observe(time.perf_counter() - start, timeout=True)
+            raise
+        self.wait_stats.observe(time.perf_counter() - start)
+        return connection
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
     pass
 
-engine = create_engine(
-    DATABASE_URL,
+
+ENGINE_OPTIONS = dict(
     pool_pre_ping=True,      # 연결 사용 전에 유효성 검사
     pool_size=10,            # 풀에 최소 10개의 연결 유지
     max_overflow=20,         # 최대 20개까지 추가 연결 허용
@@ -31,50 +98,259 @@ engine = create_engine(
     pool_timeout=30,         # 연결을 얻기 위해 최대 30초 대기
 )
 
+engine = create_engine(DATABASE_URL, poolclass=TimedQueuePool, **ENGINE_OPTIONS)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@functools.lru_cache(maxsize=1)
+def get_async_engine() -> 'AsyncEngine':
+    """비동기 엔진 (드라이버와 sqlalchemy.ext.asyncio는 처음 사용할 때 로드)"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    return create_async_engine(ASYNC_DATABASE_URL, poolclass=TimedAsyncQueuePool, **ENGINE_OPTIONS)
+
+
+@functools.lru_cache(maxsize=1)
+def get_async_sessionmaker() -> 'async_sessionmaker[AsyncSession]':
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    # 커밋 후 속성을 다시 읽으려면 await가 필요하므로 만료시키지 않음
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+def pool_stats(pool: Pool) -> Dict[str, Any]:
+    """커넥션 풀 사용량 (checked_out: 사용 중, overflow: pool_size를 넘어 연 연결 수)"""
+    stats = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    if isinstance(pool, _TimedPoolMixin):
+        stats["wait"] = pool.wait_stats.stats()
+    return stats
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """동기/비동기 엔진의 풀 사용량 (비동기 엔진은 생성된 경우만)"""
+    stats = {"sync": pool_stats(engine.pool)}
+    if get_async_engine.cache_info().currsize:
+        stats["async"] = pool_stats(get_async_engine().pool)
+    return stats
+
+
 class DBManager(UserMixin, FoodMixin):
     """
     데이터베이스 관리 클래스
     세션을 효율적으로 관리하며 음식 및 태그 정보를 다룹니다.
+
+    쓰기 메서드는 기본적으로 flush만 하고, 가장 바깥 transaction() 또는 with 블록이 예외 없이 끝날 때 한 번 커밋합니다 (unit of work).
+    메서드마다 커밋하던 기존 호출부는 DBManager(autocommit=True)를 사용합니다.
     """
     
-    def __init__(self):
-        """DBManager 초기화"""
-        self.session = None
-    
-    def __enter__(self):
-        """컨텍스트 매니저 진입 시 세션 시작"""
+    def __init__(self, session: Session | None = None, autocommit: bool = False):
+        """DBManager 초기화 (session을 넘기면 그 세션을 사용하고 닫지 않음)"""
+        self.session = session
+        self.autocommit = autocommit
+        # flush 후 아직 커밋하지 않은 변경이 있는지
+        self.uncommitted = False
+        self._owns_session = False
+        # 중첩된 with/transaction 깊이 (가장 바깥 블록이 끝날 때만 세션을 닫거나 커밋)
+        self._depth = 0
+        self._transaction_depth = 0
+
+    def _open(self) -> None:
         if self.session is None:
             self.session = SessionLocal()
+            self._owns_session = True
+        self._depth += 1
+
+    def _close(self, rollback: bool) -> None:
+        self._depth -= 1
+        try:
+            if rollback and self.session:
+                self.session.rollback()
+                self.uncommitted = False
+            elif self._depth == 0 and self._owns_session and self.uncommitted:
+                # transaction() 없이 쓴 변경도 버리지 않고 블록이 끝날 때 커밋
+                self.session.commit()
+                self.uncommitted = False
+        finally:
+            if self._depth == 0 and self._owns_session:
+                self.uncommitted = False
+                self.session.close()
+                self.session = None
+                self._owns_session = False
+
+    def __enter__(self):
+        """컨텍스트 매니저 진입 시 세션 시작"""
+        self._open()
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """컨텍스트 매니저 종료 시 세션 종료"""
-        if exc_type is not None:
-            # 예외 발생 시 롤백
-            if self.session:
-                self.session.rollback()
-        
-        if self.session:
-            self.session.close()
-            self.session = None
+        """컨텍스트 매니저 종료 시 커밋하지 않은 변경을 커밋하고 세션 종료 (예외 발생 시 롤백)"""
+        self._close(rollback=exc_type is not None)
 
     @contextmanager
     def transaction(self):
-        """트랜잭션 컨텍스트 매니저"""
+        """트랜잭션 컨텍스트 매니저 (중첩되면 가장 바깥 블록에서만 커밋, 직접 연 세션은 끝날 때 닫음)"""
+        self._open()
+        self._transaction_depth += 1
+        failed = False
+        try:
+            yield self
+            if self._transaction_depth == 1:
+                self.session.commit()
+                self.uncommitted = False
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._transaction_depth -= 1
+            self._close(rollback=failed)
+
+
+# 현재 스레드/태스크에서 열린 DBManager ((소유자, manager))
+_current_db_manager: ContextVar[Tuple[Tuple[int, Any], DBManager] | None] = ContextVar("db_manager", default=None)
+
+
+def _scope_owner() -> Tuple[int, Any]:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return threading.get_ident(), task
+
+
+@contextmanager
+def db_scope() -> Iterator[DBManager]:
+    """
+    현재 요청/태스크의 DBManager
+    같은 스레드와 태스크 안에서 중첩해 부르면 바깥 세션을 재사용하고,
+    컨텍스트를 복사해 간 다른 스레드나 태스크는 세션을 공유하지 않고 각자 엽니다.
+    """
+    owner = _scope_owner()
+    current = _current_db_manager.get()
+    if current is not None and current[0] == owner:
+        yield current[1]
+        return
+    with DBManager() as manager:
+        token = _current_db_manager.set((owner, manager))
+        try:
+            yield manager
+        finally:
+            _current_db_manager.reset(token)
+
+
+def get_db_manager() -> Iterator[DBManager]:
+    """요청마다 세션을 열고 응답 후 닫는 FastAPI 의존성"""
+    with DBManager() as manager:
+        yield manager
+
+
+class AsyncDBManager:
+    """
+    DBManager의 비동기 버전
+    AsyncSession 위에서 UserMixin/FoodMixin 메서드를 그대로 코루틴으로 제공합니다.
+    각 메서드는 AsyncSession.run_sync로 실행되므로 MySQL 왕복 동안 이벤트 루프를 막지 않습니다.
+
+    async with AsyncDBManager() as manager:
+        user = await manager.get_user_by_uuid(uuid)
+
+    쓰기는 DBManager와 같이 flush만 하고, 가장 바깥 transaction() 또는 async with 블록이 예외 없이 끝날 때 커밋합니다.
+    """
+
+    def __init__(self, session: 'AsyncSession | None' = None, autocommit: bool = False):
+        """AsyncDBManager 초기화 (session을 넘기면 그 세션을 사용하고 닫거나 커밋하지 않음)"""
+        self.session = session
+        self.autocommit = autocommit
+        # run_sync에서 flush 후 아직 커밋하지 않은 변경이 있는지
+        self.uncommitted = False
+        self._owns_session = False
+        self._depth = 0
+        self._transaction_depth = 0
+
+    def _open(self) -> None:
         if self.session is None:
-            self.session = SessionLocal()
+            self.session = get_async_sessionmaker()()
+            self._owns_session = True
+        self._depth += 1
+
+    async def _close(self, rollback: bool) -> None:
+        self._depth -= 1
+        try:
+            if rollback and self.session:
+                await self.session.rollback()
+                self.uncommitted = False
+            elif self._depth == 0 and self._owns_session and self.uncommitted:
+                # transaction() 없이 쓴 변경도 버리지 않고 블록이 끝날 때 커밋
+                await self.session.commit()
+                self.uncommitted = False
+        finally:
+            if self._depth == 0 and self._owns_session:
+                self.uncommitted = False
+                await self.session.close()
+                self.session = None
+                self._owns_session = False
+
+    async def __aenter__(self):
+        self._open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """블록 종료 시 커밋하지 않은 변경을 커밋하고 세션 종료 (예외 발생 시 롤백)"""
+        await self._close(rollback=exc_type is not None)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator['AsyncDBManager']:
+        """트랜잭션 컨텍스트 매니저 (중첩되면 가장 바깥 블록에서만 커밋, 직접 연 세션은 끝날 때 닫음)"""
+        self._open()
+        self._transaction_depth += 1
+        failed = False
         try:
             yield self
-            self.session.commit()
-        except Exception as e:
-            self.session.rollback()
-            raise e
-        
+            if self._transaction_depth == 1:
+                await self.session.commit()
+                self.uncommitted = False
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._transaction_depth -= 1
+            await self._close(rollback=failed)
+
+    async def run_sync(self, func: Callable[[DBManager], Any]) -> Any:
+        """동기 DBManager를 받는 함수를 현재 비동기 세션에서 실행"""
+        if self.session is None:
+            raise RuntimeError("세션이 활성화되지 않았습니다. 반드시 async with문 또는 transaction 컨텍스트 내에서 사용하세요.")
+
+        def call(session: Session) -> Any:
+            manager = DBManager(session, autocommit=self.autocommit)
+            try:
+                return func(manager)
+            finally:
+                # 호출마다 만드는 DBManager의 쓰기 여부를 모아 블록이 끝날 때 커밋
+                self.uncommitted |= manager.uncommitted
+
+        return await self.session.run_sync(call)
+
+    def __getattr__(self, name: str):
+        method = getattr(DBManager, name, None)
+        if name.startswith("_") or not callable(method):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            return await self.run_sync(lambda manager: method(manager, *args, **kwargs))
+        return wrapper
+
+
+async def get_async_db_manager() -> AsyncIterator[AsyncDBManager]:
+    """요청마다 비동기 세션을 열고 응답 후 닫는 FastAPI 의존성"""
+    async with AsyncDBManager() as manager:
+        yield manager
 
-db_manager = DBManager()
 
 class DBManagerTest:
     def __init__(self):
@@ -1,16 +1,26 @@
 from db.tables.food_table import FoodTag, FoodInfo, FoodInfoTag, FoodCategory, FoodSourceInfo, FoodCompany, FoodNutrition
 import model.domain.food as food_domain
-from typing import List, Optional
+from db.cache import TTLCache
+from sqlalchemy import event, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, selectinload
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 import functools
 import logging
+import os
+import unicodedata
 
 """
 food:
     create
         name only not id
     search by id
+    search by ids (batch)
     search by name
+    search by names (batch)
     search by tag
+    list tag names
+    iterate search payloads (food_id, name, data type, major category, tags)
     update
         add tags
         remove tags
@@ -19,15 +29,100 @@ food:
 
 logger = logging.getLogger(__name__)
 
+FOOD_CACHE_SIZE = int(os.getenv("FOOD_CACHE_SIZE", 10000))
+FOOD_CACHE_TTL = float(os.getenv("FOOD_CACHE_TTL", 3600))
+
+# 음식 정보는 사실상 정적인 기준 데이터이므로 프로세스 단위로 캐싱합니다.
+# 캐시에 담긴 도메인 객체는 여러 요청이 공유하므로 읽기 전용으로 다뤄야 합니다.
+food_cache = TTLCache(maxsize=FOOD_CACHE_SIZE, ttl=FOOD_CACHE_TTL)  # food_id -> Food
+# DB 조회(FoodInfo.food_name == 이름)와 같은 기준으로 찾도록 이름을 그대로 키로 사용
+food_name_cache = TTLCache(maxsize=FOOD_CACHE_SIZE, ttl=FOOD_CACHE_TTL)  # food_name -> food_id
+
+
+def normalize_food_name(food_name: str) -> str:
+    """음식 이름 정규화 (유니코드 NFC, 공백 정리, 소문자), 이름 색인(FoodNameIndex)의 키에 사용"""
+    return " ".join(unicodedata.normalize("NFC", food_name).split()).lower()
+
+
+def cache_food(food: food_domain.Food) -> None:
+    """음식 캐시에 저장"""
+    food_cache.set(food.food_id, food)
+    food_name_cache.set(food.food_name, food.food_id)
+
+
+def invalidate_food(food_id: str, food_name: str | None = None) -> None:
+    """음식 캐시 무효화"""
+    food_cache.invalidate(food_id)
+    if food_name is not None:
+        food_name_cache.invalidate(food_name)
+
+
+def invalidate_food_after_commit(session: Session, food_id: str, food_name: str | None = None) -> None:
+    """
+    트랜잭션이 끝난 뒤 음식 캐시 무효화
+    커밋 전에 지우면 다른 요청이 커밋 전의 옛 값을 다시 캐시에 넣을 수 있으므로, 세션에 모아 두었다가 커밋(또는 롤백) 후에 지웁니다.
+    """
+    session.info.setdefault("invalidated_foods", set()).add((food_id, food_name))
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_pending_foods(session: Session) -> None:
+    # 롤백이어도 트랜잭션 안에서 읽어 캐시에 넣은 flush 상태 값이 있을 수 있어 함께 지움
+    for food_id, food_name in session.info.pop("invalidated_foods", ()):
+        invalidate_food(food_id, food_name)
+
+
+def refresh_food_name_index_after_commit(session: Session) -> None:
+    """음식 이름 목록이 바뀌었으니 커밋 후 이름 색인(FoodNameIndex)을 다시 만들도록 표시"""
+    session.info["food_names_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _refresh_food_name_index(session: Session) -> None:
+    if session.info.pop("food_names_changed", False):
+        # food_name_index가 이 모듈을 import하므로 순환 import를 피해 여기서 불러옴
+        from db.food_name_index import refresh_food_name_index
+        refresh_food_name_index()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_food_name_index_refresh(session: Session) -> None:
+    session.info.pop("food_names_changed", None)
+
+
+def get_food_cache_stats() -> Dict[str, Any]:
+    """음식 캐시 통계"""
+    return {"food": food_cache.stats(), "food_name": food_name_cache.stats()}
+
+# IN 절 하나에 넣을 최대 키 개수
+BATCH_QUERY_CHUNK_SIZE = 500
+
+# 도메인 모델 변환에 필요한 관계를 한 번에 읽어오는 로더 옵션
+FOOD_LOAD_OPTIONS = (
+    selectinload(FoodInfo.nutrition),
+    selectinload(FoodInfo.category),
+    selectinload(FoodInfo.tags),
+)
+
 class FoodMixin:
     """음식 관련 DB입출력 기능 모음, 상속해서 사용"""
 
     def check_session(func):
-        """세션 체크 및 트랜잭션 관리 데코레이터"""
+        """
+        세션 체크 및 쓰기 관리 데코레이터
+        기본(unit of work)은 호출마다 SAVEPOINT(begin_nested) 안에서 실행해 flush만 하고, 커밋은 바깥 transaction()/with 블록이 한 번에 함
+        실패하면 이 호출의 쓰기만 SAVEPOINT로 되돌리므로 앞서 flush한 쓰기는 남고 세션도 계속 쓸 수 있음, autocommit이면 호출마다 커밋/롤백
+        """
         @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
             if self.session is None:
                 raise RuntimeError("세션이 활성화되지 않았습니다. 반드시 with문 또는 transaction 컨텍스트 내에서 사용하세요.")
+            if not self.autocommit:
+                with self.session.begin_nested():
+                    result = func(self, *args, **kwargs)
+                self.uncommitted = True
+                return result
             try:
                 result = func(self, *args, **kwargs)
                 self.session.commit()
@@ -37,26 +132,142 @@ class FoodMixin:
                 raise e
         return wrapper
     
-    def get_food_by_id(self, food_id: str) -> food_domain.Food:
-        """음식 조회"""
+    def get_food_by_id(self, food_id: str) -> food_domain.Food | None:
+        """음식 조회 (캐시 우선)"""
         if self.session is None:
             raise RuntimeError("세션이 활성화되지 않았습니다. 반드시 with문 또는 transaction 컨텍스트 내에서 사용하세요.")
-        food_info = self.session.query(FoodInfo).filter(FoodInfo.food_id == food_id).first()
-        return food_domain.Food.from_db_model(food_info)
+        if (food := food_cache.get(food_id)) is not None:
+            return food
+        food_info = self.session.query(FoodInfo).options(*FOOD_LOAD_OPTIONS).filter(FoodInfo.food_id == food_id).first()
+        if food_info is None:
+            return None
+        food = food_domain.Food.from_db_model(food_info)
+        cache_food(food)
+        return food
     
-    def get_food_by_name(self, food_name: str) -> food_domain.Food:
-        """음식 조회"""
+    def get_food_by_name(self, food_name: str) -> food_domain.Food | None:
+        """음식 조회 (캐시 우선)"""
         if self.session is None:
             raise RuntimeError("세션이 활성화되지 않았습니다. 반드시 with문 또는 transaction 컨텍스트 내에서 사용하세요.")
-        food_info = self.session.query(FoodInfo).filter(FoodInfo.food_name == food_name).first()
-        return food_domain.Food.from_db_model(food_info)
+        if (food_id := food_name_cache.get(food_name)) is not None:
+            if (food := food_cache.get(food_id)) is not None:
+                return food
+        food_info = self.session.query(FoodInfo).options(*FOOD_LOAD_OPTIONS).filter(FoodInfo.food_name == food_name).first()
+        if food_info is None:
+            return None
+        food = food_domain.Food.from_db_model(food_info)
+        cache_food(food)
+        return food
+
+    def get_foods_by_ids(self, food_ids: Sequence[str]) -> List[food_domain.Food | None]:
+        """
+        여러 음식을 한 번에 조회 (캐시 우선)
+        관계(영양성분, 분류, 태그)까지 고정된 횟수의 쿼리로 읽어오며,
+        결과는 입력 순서를 따르고 찾지 못한 자리는 None으로 채웁니다.
+        """
+        cached = {food_id: food for food_id in food_ids if (food := food_cache.get(food_id)) is not None}
+        foods = self._get_foods_by_column(FoodInfo.food_id, [food_id for food_id in food_ids if food_id not in cached])
+        for food in foods:
+            cache_food(food)
+        return self._ordered_foods(food_ids, list(cached.values()) + foods, key="food_id")
+
+    def get_foods_by_names(self, food_names: Sequence[str]) -> List[food_domain.Food | None]:
+        """
+        여러 음식을 이름으로 한 번에 조회 (캐시 우선)
+        결과는 입력 순서를 따르고 찾지 못한 자리는 None으로 채웁니다.
+        """
+        cached = {}
+        for food_name in food_names:
+            food_id = food_name_cache.get(food_name)
+            if food_id is not None and (food := food_cache.get(food_id)) is not None:
+                cached[food_name] = food
+        foods = self._get_foods_by_column(FoodInfo.food_name, [food_name for food_name in food_names if food_name not in cached])
+        for food in foods:
+            cache_food(food)
+        food_map = {food.food_name: food for food in foods}
+        food_map.update(cached)
+        missing = [food_name for food_name in dict.fromkeys(food_names) if food_name not in food_map]
+        if missing:
+            logger.warning(f"음식 {len(missing)}건을 찾을 수 없습니다 (food_name): {missing}")
+        return [food_map.get(food_name) for food_name in food_names]
     
     def get_food_by_tag(self, tag_name: str) -> List[food_domain.Food]:
         """음식 태그 조회"""
         if self.session is None:
             raise RuntimeError("세션이 활성화되지 않았습니다. 반드시 with문 또는 transaction 컨텍스트 내에서 사용하세요.")
-        food_infos = self.session.query(FoodInfo).filter(FoodInfo.tags.any(FoodTag.tag_name == tag_name)).all()
+        food_infos = self.session.query(FoodInfo).options(*FOOD_LOAD_OPTIONS).filter(FoodInfo.tags.any(FoodTag.tag_name == tag_name)).all()
         return [food_domain.Food.from_db_model(food_info) for food_info in food_infos]
+
+    def get_tag_names(self) -> List[str]:
+        """음식에 붙은 태그 이름 목록 (중복 제거)"""
+        if self.session is None:
+            raise RuntimeError("세션이 활성화되지 않았습니다. 반드시 with문 또는 transaction 컨텍스트 내에서 사용하세요.")
+        return sorted(row.tag_name for row in self.session.query(FoodTag.tag_name).distinct())
+
+    def get_food_ids_by_tags(self, tag_names: Sequence[str]) -> List[str]:
+        """태그 중 하나라도 가진 음식의 food_id 목록 (관계를 읽지 않는 가벼운 조회)"""
+        if self.session is None:
+            raise RuntimeError("세션이 활성화되지 않았습니다. 반드시 with문 또는 transaction 컨텍스트 내에서 사용하세요.")
+        if not tag_names:
+            return []
+        rows = self.session.query(FoodInfo.food_id).filter(FoodInfo.tags.any(FoodTag.tag_name.in_(list(tag_names)))).all()
+        return [row.food_id for row in rows]
+
+    def get_food_ids_by_name_keywords(self, keywords: Sequence[str]) -> List[str]:
+        """이름에 키워드 중 하나라도 포함된 음식의 food_id 목록"""
+        if self.session is None:
+            raise RuntimeError("세션이 활성화되지 않았습니다. 반드시 with문 또는 transaction 컨텍스트 내에서 사용하세요.")
+        keywords = [keyword.strip() for keyword in keywords if keyword and keyword.strip()]
+        if not keywords:
+            return []
+        rows = self.session.query(FoodInfo.food_id).filter(or_(*[FoodInfo.food_name.contains(keyword, autoescape=True) for keyword in keywords])).all()
+        return [row.food_id for row in rows]
+
+    def iter_food_payloads(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        벡터 검색 payload용 음식 요약을 food_id 순서로 하나씩 yield
+        food_id 기준 키셋 페이지네이션으로 batch_size개씩 읽으므로 전체 목록을 메모리에 올리지 않습니다.
+        """
+        if self.session is None:
+            raise RuntimeError("세션이 활성화되지 않았습니다. 반드시 with문 또는 transaction 컨텍스트 내에서 사용하세요.")
+        last_food_id = None
+        while True:
+            query = self.session.query(FoodInfo).options(selectinload(FoodInfo.category), selectinload(FoodInfo.tags))
+            if last_food_id is not None:
+                query = query.filter(FoodInfo.food_id > last_food_id)
+            food_infos = query.order_by(FoodInfo.food_id).limit(batch_size).all()
+            if not food_infos:
+                return
+            for food_info in food_infos:
+                yield {
+                    "food_id": food_info.food_id,
+                    "food_name": food_info.food_name,
+                    "data_type_code": food_info.data_type_code,
+                    "major_category_name": food_info.category.major_category_name if food_info.category else None,
+                    "tags": sorted(tag.tag_name for tag in food_info.tags),
+                }
+            last_food_id = food_infos[-1].food_id
+
+    def _get_foods_by_column(self, column, values: Sequence[str]) -> List[food_domain.Food]:
+        """column IN (values) 조회를 청크 단위로 수행하고 도메인 모델로 변환"""
+        if self.session is None:
+            raise RuntimeError("세션이 활성화되지 않았습니다. 반드시 with문 또는 transaction 컨텍스트 내에서 사용하세요.")
+        unique_values = list(dict.fromkeys(value for value in values if value is not None))
+        foods = []
+        for i in range(0, len(unique_values), BATCH_QUERY_CHUNK_SIZE):
+            chunk = unique_values[i:i + BATCH_QUERY_CHUNK_SIZE]
+            food_infos = self.session.query(FoodInfo).options(*FOOD_LOAD_OPTIONS).filter(column.in_(chunk)).all()
+            foods.extend(food_domain.Food.from_db_model(food_info) for food_info in food_infos)
+        return foods
+
+    @staticmethod
+    def _ordered_foods(keys: Sequence[str], foods: List[food_domain.Food], key: str) -> List[food_domain.Food | None]:
+        """조회 결과를 입력 순서대로 정렬하고 누락된 키를 기록"""
+        food_map = {getattr(food, key): food for food in foods}
+        missing = [k for k in dict.fromkeys(keys) if k not in food_map]
+        if missing:
+            logger.warning(f"음식 {len(missing)}건을 찾을 수 없습니다 ({key}): {missing}")
+        return [food_map.get(k) for k in keys]
     
 
     @check_session
@@ -108,89 +319,91 @@ class FoodMixin:
         saturated_fat_g: str | None = None,
         trans_fat_g: str | None = None,
         tags: list[str] | None = None) -> bool:
-        """음식 생성"""
-
+        """음식 생성 (이미 있는 food_id 등으로 저장에 실패하면 그 음식만 되돌리고 False)"""
+        food = FoodInfo(
+            food_id=food_id,
+            food_name=name,
+            data_type_code=data_type_code,
+            category=FoodCategory(
+                major_category_name=major_category_name,
+                medium_category_name=medium_category_name,
+                minor_category_name=minor_category_name,
+                detail_category_name=detail_category_name,
+                representative_food_name=representative_food_name,
+            ),
+            source_info=FoodSourceInfo(
+                origin_name=origin_name,
+                source_name=source_name,
+                generation_method_name=generation_method_name,
+                reference_date=reference_date,
+            ),
+            company=FoodCompany(
+                company_name=company_name,
+                manufacturer_name=manufacturer_name,
+                origin_country_name=origin_country_name,
+                importer_name=importer_name,
+                distributor_name=distributor_name,
+                mfg_report_no=mfg_report_no,
+            ),
+            nutrition=FoodNutrition(
+                weight=weight,
+                serving_size_g=serving_size_g,
+                nutrient_reference_amount_g=nutrient_reference_amount_g,
+                energy_kcal=energy_kcal,
+                moisture_g=moisture_g,
+                protein_g=protein_g,
+                fat_g=fat_g,
+                ash_g=ash_g,
+                carbohydrate_g=carbohydrate_g,
+                sugars_g=sugars_g,
+                dietary_fiber_g=dietary_fiber_g,
+                calcium_mg=calcium_mg,
+                iron_mg=iron_mg,
+                phosphorus_mg=phosphorus_mg,
+                potassium_mg=potassium_mg,
+                sodium_mg=sodium_mg,
+                vitamin_a_ug_rae=vitamin_a_ug_rae,
+                retinol_ug=retinol_ug,
+                beta_carotene_ug=beta_carotene_ug,
+                thiamin_mg=thiamin_mg,
+                riboflavin_mg=riboflavin_mg,
+                niacin_mg=niacin_mg,
+                vitamin_c_mg=vitamin_c_mg,
+                vitamin_d_ug=vitamin_d_ug,
+                cholesterol_mg=cholesterol_mg,
+                saturated_fat_g=saturated_fat_g,
+                trans_fat_g=trans_fat_g,
+            ),
+            tags=[FoodTag(tag_name=tag) for tag in tags or []],
+        )
         try:
-            food = FoodInfo(
-                food_id=food_id,
-                food_name=name,
-                data_type_code=data_type_code,
-                category=FoodCategory(
-                    major_category_name=major_category_name,
-                    medium_category_name=medium_category_name,
-                    minor_category_name=minor_category_name,
-                    detail_category_name=detail_category_name,
-                    representative_food_name=representative_food_name,
-                ),
-                source_info=FoodSourceInfo(
-                    origin_name=origin_name,
-                    source_name=source_name,
-                    generation_method_name=generation_method_name,
-                    reference_date=reference_date,
-                ),
-                company=FoodCompany(
-                    company_name=company_name,
-                    manufacturer_name=manufacturer_name,
-                    origin_country_name=origin_country_name,
-                    importer_name=importer_name,
-                    distributor_name=distributor_name,
-                    mfg_report_no=mfg_report_no,
-                ),
-                nutrition=FoodNutrition(
-                    weight=weight,
-                    serving_size_g=serving_size_g,
-                    nutrient_reference_amount_g=nutrient_reference_amount_g,
-                    energy_kcal=energy_kcal,
-                    moisture_g=moisture_g,
-                    protein_g=protein_g,
-                    fat_g=fat_g,
-                    ash_g=ash_g,
-                    carbohydrate_g=carbohydrate_g,
-                    sugars_g=sugars_g,
-                    dietary_fiber_g=dietary_fiber_g,
-                    calcium_mg=calcium_mg,
-                    iron_mg=iron_mg,
-                    phosphorus_mg=phosphorus_mg,
-                    potassium_mg=potassium_mg,
-                    sodium_mg=sodium_mg,
-                    vitamin_a_ug_rae=vitamin_a_ug_rae,
-                    retinol_ug=retinol_ug,
-                    beta_carotene_ug=beta_carotene_ug,
-                    thiamin_mg=thiamin_mg,
-                    riboflavin_mg=riboflavin_mg,
-                    niacin_mg=niacin_mg,
-                    vitamin_c_mg=vitamin_c_mg,
-                    vitamin_d_ug=vitamin_d_ug,
-                    cholesterol_mg=cholesterol_mg,
-                    saturated_fat_g=saturated_fat_g,
-                    trans_fat_g=trans_fat_g,
-                ),
-                tags=[FoodTag(tag_name=tag) for tag in tags],
-            )
-            self.session.add(food)
-            self.session.commit()
-            return True
-        except Exception as e:
-            self.session.rollback()
+            with self.session.begin_nested():
+                self.session.add(food)
+        except SQLAlchemyError as e:
             logger.error(f"음식 생성 실패: {e}")
             return False
+        invalidate_food_after_commit(self.session, food_id, name)
+        refresh_food_name_index_after_commit(self.session)
+        return True
     
 
     @check_session
     def update_food_tags(self, food_id: str, tags: list[str]) -> bool:
         """음식 태그 업데이트"""
-        food = self.get_food_by_id(food_id)
-        if food is None:
+        food_info = self.session.query(FoodInfo).filter(FoodInfo.food_id == food_id).first()
+        if food_info is None:
             return False
-        food.tags = [FoodTag(tag_name=tag) for tag in tags]
+        food_info.tags = [FoodTag(tag_name=tag) for tag in tags]
+        invalidate_food_after_commit(self.session, food_id, food_info.food_name)
         return True
     
 
     @check_session
     def delete_food_tags(self, food_id: str) -> bool:
         """음식 태그 삭제"""
-        food = self.get_food_by_id(food_id)
-        if food is None:
+        food_info = self.session.query(FoodInfo).filter(FoodInfo.food_id == food_id).first()
+        if food_info is None:
             return False
-        food.tags = []
+        food_info.tags = []
+        invalidate_food_after_commit(self.session, food_id, food_info.food_name)
         return True
\ No newline at end of file
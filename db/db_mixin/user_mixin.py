@@ -2,12 +2,17 @@ from db.tables.user_table import *
 import model.domain.user as user_domain
 from datetime import datetime
 from typing import Dict, Any, Union, Literal
+import bcrypt
+import hmac
 import uuid
+import re
 import functools
 
 """
 user:
     search by uuid
+    search by email
+    verify email + password
     create
             nickname, email, (password or social_code), 
             body(age, tall, weight, sleep_pattern, activity_level, 
@@ -21,15 +26,41 @@ log:
 """
 
 
+# bcrypt 해시 형식 ($2b$12$ + salt/해시 53자)
+BCRYPT_HASH = re.compile(r"\$2[abxy]\$\d{2}\$[./A-Za-z0-9]{53}")
+
+
+def hash_password(password: str) -> str:
+    """
+    bcrypt 해시 (password 테이블에 저장하는 값)
+    해시 도입 전에 평문으로 저장된 비밀번호는 verify_user에서 로그인에 성공할 때 이 해시로 바꿔 저장합니다.
+    """
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+
+def is_password_hash(stored: str) -> bool:
+    """password 테이블의 값이 bcrypt 해시인지 (아니면 해시 도입 전의 평문)"""
+    return BCRYPT_HASH.fullmatch(stored) is not None
+
+
 class UserMixin:
     """유저 관련 DB입출력 기능 모음, 상속해서 사용"""
 
     def check_session(func):
-        """세션 체크 및 트랜잭션 관리 데코레이터"""
+        """
+        세션 체크 및 쓰기 관리 데코레이터
+        기본(unit of work)은 호출마다 SAVEPOINT(begin_nested) 안에서 실행해 flush만 하고, 커밋은 바깥 transaction()/with 블록이 한 번에 함
+        실패하면 이 호출의 쓰기만 SAVEPOINT로 되돌리므로 앞서 flush한 쓰기는 남고 세션도 계속 쓸 수 있음, autocommit이면 호출마다 커밋/롤백
+        """
         @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
             if self.session is None:
                 raise RuntimeError("세션이 활성화되지 않았습니다. 반드시 with문 또는 transaction 컨텍스트 내에서 사용하세요.")
+            if not self.autocommit:
+                with self.session.begin_nested():
+                    result = func(self, *args, **kwargs)
+                self.uncommitted = True
+                return result
             try:
                 result = func(self, *args, **kwargs)
                 self.session.commit()
@@ -54,7 +85,37 @@ class UserMixin:
         if self.session is None:
             raise RuntimeError("세션이 활성화되지 않았습니다. 반드시 with문 또는 transaction 컨텍스트 내에서 사용하세요.")
         user_info = self.session.query(UserInfo).filter(UserInfo.uuid == uuid).first()
+        if user_info is None:
+            return None
         return user_domain.User.from_db_model(user_info)
+
+    def get_user_by_email(self, email: str) -> user_domain.User | None:
+        """이메일로 사용자 정보 조회"""
+        if self.session is None:
+            raise RuntimeError("세션이 활성화되지 않았습니다. 반드시 with문 또는 transaction 컨텍스트 내에서 사용하세요.")
+        user_info = self.session.query(UserInfo).join(UserAuth).filter(UserAuth.email == email).first()
+        if user_info is None:
+            return None
+        return user_domain.User.from_db_model(user_info)
+
+    def verify_user(self, email: str, password: str) -> user_domain.User | None:
+        """
+        이메일과 비밀번호가 맞으면 사용자 정보, 아니면 None
+        저장된 값이 평문(해시 도입 전 가입)이면 평문으로 비교하고, 맞으면 bcrypt 해시로 바꿔 씀 (바깥 블록이 끝날 때 커밋)
+        """
+        user = self.get_user_by_email(email)
+        if user is None or not user.password:
+            return None
+        if is_password_hash(user.password):
+            try:
+                matched = bcrypt.checkpw(password.encode("utf-8"), user.password.encode("utf-8"))
+            except ValueError:
+                return None
+            return user if matched else None
+        if not hmac.compare_digest(password.encode("utf-8"), user.password.encode("utf-8")):
+            return None
+        self.update_password(user.uuid, password)
+        return user
     
     @check_session
     def create_user(
@@ -105,7 +166,7 @@ class UserMixin:
         if password:
             user_info.password = Password(
                 uuid=user_uuid,
-                password=password
+                password=hash_password(password)
             )
         elif social_code:
             user_info.social_login = SocialLogin(
@@ -274,12 +335,12 @@ class UserMixin:
         
         if password_info:
             # 기존 비밀번호 정보 업데이트
-            password_info.password = password
+            password_info.password = hash_password(password)
         else:
             # 새 비밀번호 정보 추가
             password_info = Password(
                 uuid=uuid,
-                password=password
+                password=hash_password(password)
             )
             self.session.add(password_info)
         
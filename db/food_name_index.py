@@ -0,0 +1,116 @@
+"""
+food_info.food_name 인메모리 색인
+
+LLM이 넘기는 음식 이름은 DB에 그대로 있는 경우가 많은데, 매번 임베딩 + 벡터 검색을 거치면 CPU 모델 시간이 대부분을 차지합니다.
+FoodNameIndex는 시작 시 (food_id, food_name)만 읽어 다음 순서로 이름을 찾고, 찾지 못한 이름만 벡터 검색으로 넘깁니다.
+1. 원래 이름 정확히 일치 (dict)
+2. 정규화 키 일치: NFC, 소문자, 공백/밑줄 제거 ("국밥 돼지머리" == "국밥_돼지머리")
+3. 이름 뒤에 분량/설명만 붙은 경우: 뒤에 남는 부분이 분량("1인분", "200g", "2개")이나 괄호("(국물 포함)")일 때만 떼고 찾음
+   ("김치찌개 1인분" -> "김치찌개", "김치볶음밥"은 "김치"로 줄이지 않고 벡터 검색으로 넘김)
+색인은 처음 조회할 때 만들고, create_food가 커밋되면 다음 조회에서 다시 만듭니다.
+"""
+from typing import Any, Dict, Iterable, List, Tuple
+from sqlalchemy.orm import Session
+import bisect
+import logging
+import re
+
+from db.cache import singleton
+from db.db_mixin.food_mixin import normalize_food_name
+from db.tables.food_table import FoodInfo
+
+
+logger = logging.getLogger(__name__)
+
+# 이름 뒤에서 뗄 수 있는 분량/설명 (정규화 키 기준이라 공백 없음): "1인분", "1/2공기", "200g", "2개(국물포함)", "(대)"
+PORTION_SUFFIX = re.compile(
+    r"(?:\d+(?:[./]\d+)?(?:인분|회분|g|kg|ml|l|개|공기|그릇|접시|컵|조각|마리|쪽|장|큰술|작은술|스푼)?)?(?:\(.*\))?"
+)
+
+
+class FoodNameIndex:
+    def __init__(self, foods: Iterable[Tuple[str, str]]):
+        """foods: (food_id, food_name) 목록"""
+        self.exact: Dict[str, str] = {}
+        self.normalized: Dict[str, str | None] = {}
+        for food_id, food_name in foods:
+            self.exact[food_name] = food_id
+            key = self.key(food_name)
+            # 정규화하면 이름이 같아지는 음식이 둘 이상이면 모호하므로 None으로 표시
+            self.normalized[key] = food_id if self.normalized.get(key, food_id) == food_id else None
+        self.keys = sorted(self.normalized)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+    @staticmethod
+    def key(food_name: str) -> str:
+        return "".join(normalize_food_name(food_name).replace("_", " ").split())
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[Tuple[str, str | None]]:
+        """정규화 키가 prefix로 시작하는 (키, food_id) 목록 (최대 limit개)"""
+        key = self.key(prefix)
+        if not key:
+            return []
+        matches = []
+        for i in range(bisect.bisect_left(self.keys, key), len(self.keys)):
+            if not self.keys[i].startswith(key) or len(matches) >= limit:
+                break
+            matches.append((self.keys[i], self.normalized[self.keys[i]]))
+        return matches
+
+    def strip_portion_match(self, key: str) -> str | None:
+        """key 자신, 또는 뒤의 분량/괄호 설명(PORTION_SUFFIX)을 뗀 정규화 키의 food_id (없거나 모호하면 None)"""
+        if key in self.normalized:
+            return self.normalized[key]
+        for end in range(len(key) - 1, 0, -1):
+            if key[:end] in self.normalized and PORTION_SUFFIX.fullmatch(key[end:]):
+                return self.normalized[key[:end]]
+        return None
+
+    def lookup(self, food_name: str) -> str | None:
+        """음식 이름의 food_id (찾지 못하거나 모호하면 None)"""
+        food_id = self.exact.get(food_name)
+        if food_id is None:
+            food_id = self.strip_portion_match(self.key(food_name))
+        if food_id is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return food_id
+
+    def lookup_many(self, food_names: Iterable[str]) -> List[str | None]:
+        return [self.lookup(food_name) for food_name in food_names]
+
+    @classmethod
+    def build(cls, session: Session, batch_size: int = 5000) -> 'FoodNameIndex':
+        """food_info에서 (food_id, food_name)만 batch_size개씩 읽어 색인 생성"""
+        rows = session.query(FoodInfo.food_id, FoodInfo.food_name).yield_per(batch_size)
+        index = cls((row.food_id, row.food_name) for row in rows)
+        logger.info(f"food name index built: {len(index)} foods")
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+@singleton
+def get_food_name_index() -> FoodNameIndex:
+    """프로세스에서 공유하는 음식 이름 색인 (최초 호출 시 DB에서 생성)"""
+    from db.database import SessionLocal
+
+    with SessionLocal() as session:
+        return FoodNameIndex.build(session)
+
+
+def refresh_food_name_index() -> None:
+    """음식 목록이 바뀌었을 때 색인을 버리고 다음 호출에서 다시 생성"""
+    get_food_name_index.cache_clear()
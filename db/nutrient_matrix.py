@@ -0,0 +1,331 @@
+from typing import Dict, Iterable, List, Sequence, Tuple
+from sqlalchemy.orm import Session
+from pathlib import Path
+from dotenv import load_dotenv
+import numpy as np
+import logging
+import json
+import os
+import re
+import time
+
+from db.tables.food_table import FoodNutrition, FoodCategory
+from db.cache import singleton
+
+"""
+food_nutrition 테이블을 (음식 x 영양소) float32 행렬로 내보내고 memory-map으로 읽어오는 모듈
+
+파일 구성 (NUTRIENT_MATRIX_DIR, {version}은 meta.json의 version):
+    values.{version}.npy       float32 (N, len(NUTRIENT_COLUMNS)), 값이 없으면 NaN
+    food_ids.{version}.npy     food_id 배열 (정렬됨, searchsorted로 조회)
+    reference_g.{version}.npy  영양성분함량기준량(g), 행렬 값이 몇 g 기준인지
+    serving_g.{version}.npy    1회 섭취참고량(g), 알 수 없으면 NaN
+    category_codes.{version}.npy  식품대분류 코드 (meta.json의 categories 인덱스, 없으면 -1)
+    meta.json        버전, 컬럼 목록, 대분류 목록, 행 개수 (마지막에 교체하므로 이 파일이 가리키는 버전이 현재 행렬)
+
+uvicorn 워커들이 같은 파일을 mmap_mode="r"로 열기 때문에 페이지 캐시를 공유하고,
+프로세스별 추가 메모리는 거의 들지 않습니다.
+"""
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+NUTRIENT_MATRIX_DIR = os.getenv("NUTRIENT_MATRIX_DIR", "data/food/nutrient_matrix")
+
+# food_nutrition의 수치형 영양소 컬럼 (행렬의 열 순서)
+NUTRIENT_COLUMNS: Tuple[str, ...] = (
+    "energy_kcal",
+    "moisture_g",
+    "protein_g",
+    "fat_g",
+    "ash_g",
+    "carbohydrate_g",
+    "sugars_g",
+    "dietary_fiber_g",
+    "calcium_mg",
+    "iron_mg",
+    "phosphorus_mg",
+    "potassium_mg",
+    "sodium_mg",
+    "vitamin_a_ug_rae",
+    "retinol_ug",
+    "beta_carotene_ug",
+    "thiamin_mg",
+    "riboflavin_mg",
+    "niacin_mg",
+    "vitamin_c_mg",
+    "vitamin_d_ug",
+    "cholesterol_mg",
+    "saturated_fat_g",
+    "trans_fat_g",
+)
+
+# MandatoryNutrition의 9가지 필수 영양소
+MANDATORY_COLUMNS: Tuple[str, ...] = (
+    "energy_kcal",
+    "protein_g",
+    "fat_g",
+    "carbohydrate_g",
+    "sugars_g",
+    "sodium_mg",
+    "cholesterol_mg",
+    "saturated_fat_g",
+    "trans_fat_g",
+)
+
+DEFAULT_REFERENCE_G = 100.0
+
+# 행렬 파일 이름 (meta.json 외)
+MATRIX_FILES: Tuple[str, ...] = ("food_ids", "values", "reference_g", "serving_g", "category_codes")
+
+
+def matrix_file(directory: Path, name: str, version: str | None) -> Path:
+    """버전별 행렬 파일 경로 (version이 없으면 버전 도입 전 이름)"""
+    return directory / (f"{name}.{version}.npy" if version else f"{name}.npy")
+
+# 숫자(소수, 분수 "1/2" 포함) + 단위. 단위가 없거나 g로 바꿀 수 없는 단위("공기", "개", "slices")는 매칭하지 않음
+_NUMBER = r"(\d+(?:\.\d+)?)(?:\s*/\s*(\d+(?:\.\d+)?))?"
+_UNIT_TO_G = {
+    "g": 1.0, "그램": 1.0,
+    "kg": 1000.0, "킬로그램": 1000.0,
+    "ml": 1.0, "밀리리터": 1.0,
+    "l": 1000.0, "리터": 1000.0,
+}
+_AMOUNT_PATTERN = re.compile(
+    _NUMBER + r"\s*(" + "|".join(sorted(_UNIT_TO_G, key=len, reverse=True)) + r")(?![^\W\d_])",
+    re.IGNORECASE,
+)
+_BARE_NUMBER_PATTERN = re.compile(r"^\s*" + _NUMBER + r"\s*$")
+
+
+def parse_number(numerator: str, denominator: str | None) -> float:
+    """정규식으로 잡은 숫자("1.5", "1"/"2")를 float로 변환"""
+    value = float(numerator)
+    if denominator is not None:
+        value = value / float(denominator) if float(denominator) else np.nan
+    return value
+
+
+def parse_amount_g(amount: str | None, default: float = np.nan, bare_number_g: bool = False) -> float:
+    """
+    '100g', '1.5kg', '200ml', '1/2 kg' 같은 문자열을 g 단위 숫자로 변환 (ml는 1g으로 간주)
+    단위가 없으면 default를 돌려줍니다 ("1 공기", "2개"는 무게가 아님).
+    bare_number_g=True면 숫자만 있는 문자열("100")을 g으로 읽습니다 (serving_size_g처럼 컬럼 단위가 g인 DB 값).
+    """
+    if amount is None or str(amount).strip() == "":
+        return default
+    amount = str(amount)
+    match = _AMOUNT_PATTERN.search(amount)
+    if match is not None:
+        return parse_number(match.group(1), match.group(2)) * _UNIT_TO_G[match.group(3).lower()]
+    if bare_number_g:
+        match = _BARE_NUMBER_PATTERN.match(amount)
+        if match is not None:
+            return parse_number(match.group(1), match.group(2))
+    return default
+
+
+class NutrientMatrix:
+    """음식별 영양소 행렬, 벡터 연산으로 합산/필터/정렬을 수행"""
+
+    def __init__(
+            self,
+            food_ids: np.ndarray,
+            values: np.ndarray,
+            reference_g: np.ndarray,
+            serving_g: np.ndarray,
+            columns: Sequence[str] = NUTRIENT_COLUMNS,
+            category_codes: np.ndarray | None = None,
+            categories: Sequence[str] = (),
+        ):
+        self.food_ids = food_ids
+        self.values = values
+        self.reference_g = reference_g
+        self.serving_g = serving_g
+        self.columns = tuple(columns)
+        self.category_codes = category_codes if category_codes is not None else np.full(len(food_ids), -1, dtype=np.int16)
+        self.categories = tuple(categories)
+        self._column_index = {column: i for i, column in enumerate(self.columns)}
+
+    def __len__(self) -> int:
+        return len(self.food_ids)
+
+    @classmethod
+    def load(cls, directory: str | os.PathLike = NUTRIENT_MATRIX_DIR, mmap: bool = True) -> 'NutrientMatrix':
+        """내보낸 행렬 파일 읽기, mmap=True면 memory-map으로 연다"""
+        directory = Path(directory)
+        mmap_mode = "r" if mmap else None
+        with open(directory / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        version = meta.get("version")
+        category_path = matrix_file(directory, "category_codes", version)
+        matrix = cls(
+            food_ids=np.load(matrix_file(directory, "food_ids", version), mmap_mode=mmap_mode),
+            values=np.load(matrix_file(directory, "values", version), mmap_mode=mmap_mode),
+            reference_g=np.load(matrix_file(directory, "reference_g", version), mmap_mode=mmap_mode),
+            serving_g=np.load(matrix_file(directory, "serving_g", version), mmap_mode=mmap_mode),
+            columns=meta["columns"],
+            category_codes=np.load(category_path, mmap_mode=mmap_mode) if category_path.exists() else None,
+            categories=meta.get("categories", []),
+        )
+        rows = meta.get("rows", len(matrix))
+        lengths = [len(matrix.food_ids), len(matrix.values), len(matrix.reference_g), len(matrix.serving_g), len(matrix.category_codes)]
+        if any(length != rows for length in lengths) or matrix.values.shape[1:] != (len(matrix.columns),):
+            raise ValueError(f"영양소 행렬 파일이 meta.json과 맞지 않습니다 ({directory}, version={version}, rows={rows}, lengths={lengths})")
+        logger.info(f"loaded nutrient matrix: {len(matrix)} foods x {len(matrix.columns)} nutrients ({directory})")
+        return matrix
+
+    @staticmethod
+    def build(session: Session, directory: str | os.PathLike = NUTRIENT_MATRIX_DIR, batch_size: int = 5000) -> int:
+        """
+        food_nutrition 테이블을 행렬 파일로 내보내기
+        새 버전 이름으로 모든 배열을 쓴 뒤 meta.json을 마지막에 교체하므로, 읽는 쪽은 항상 한 버전의 파일 묶음만 봅니다.
+        직전 버전 파일은 meta.json을 먼저 읽은 프로세스를 위해 남기고, 그보다 오래된 파일만 지웁니다.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        total = session.query(FoodNutrition).count()
+        food_ids = np.empty(total, dtype="<U19")
+        values = np.full((total, len(NUTRIENT_COLUMNS)), np.nan, dtype=np.float32)
+        reference_g = np.full(total, DEFAULT_REFERENCE_G, dtype=np.float32)
+        serving_g = np.full(total, np.nan, dtype=np.float32)
+        category_codes = np.full(total, -1, dtype=np.int16)
+        categories: Dict[str, int] = {}
+
+        query = session.query(
+            FoodNutrition.food_id,
+            FoodNutrition.nutrient_reference_amount_g,
+            FoodNutrition.serving_size_g,
+            FoodCategory.major_category_name,
+            *[getattr(FoodNutrition, column) for column in NUTRIENT_COLUMNS],
+        ).outerjoin(FoodCategory, FoodCategory.food_id == FoodNutrition.food_id).order_by(FoodNutrition.food_id).yield_per(batch_size)
+
+        count = 0
+        for row in query:
+            if count >= total:
+                break
+            food_ids[count] = row[0]
+            reference_g[count] = parse_amount_g(row[1], default=DEFAULT_REFERENCE_G, bare_number_g=True)
+            serving_g[count] = parse_amount_g(row[2], bare_number_g=True)
+            if row[3] is not None:
+                category_codes[count] = categories.setdefault(row[3], len(categories))
+            values[count] = [np.nan if value is None else float(value) for value in row[4:]]
+            count += 1
+
+        # DB 정렬 규칙(collation)과 numpy 정렬 순서가 다를 수 있어 다시 정렬
+        order = np.argsort(food_ids[:count], kind="stable")
+        arrays = {
+            "food_ids": food_ids[:count][order],
+            "values": values[:count][order],
+            "reference_g": reference_g[:count][order],
+            "serving_g": serving_g[:count][order],
+            "category_codes": category_codes[:count][order],
+        }
+        previous = None
+        if (directory / "meta.json").exists():
+            with open(directory / "meta.json", "r", encoding="utf-8") as f:
+                previous = json.load(f).get("version")
+        version = f"{time.time_ns():x}"
+        for name, array in arrays.items():
+            np.save(matrix_file(directory, name, version), array)
+        tmp_path = directory / "meta.json.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": version, "columns": list(NUTRIENT_COLUMNS), "categories": list(categories), "rows": count}, f, ensure_ascii=False)
+        os.replace(tmp_path, directory / "meta.json")
+
+        keep = {matrix_file(directory, name, v) for name in MATRIX_FILES for v in (version, previous)}
+        for name in MATRIX_FILES:
+            for path in directory.glob(f"{name}.*npy"):
+                if path not in keep:
+                    path.unlink(missing_ok=True)
+
+        logger.info(f"built nutrient matrix: {count} foods ({directory})")
+        return count
+
+    def column_indices(self, columns: Iterable[str] | None = None) -> List[int]:
+        """컬럼 이름을 열 인덱스로 변환"""
+        if columns is None:
+            return list(range(len(self.columns)))
+        return [self._column_index[column] for column in columns]
+
+    def indices(self, food_ids: Sequence[str]) -> np.ndarray:
+        """food_id 목록을 행 인덱스로 변환, 없는 food_id는 -1"""
+        keys = np.asarray(food_ids, dtype=self.food_ids.dtype)
+        if len(self.food_ids) == 0:
+            return np.full(len(keys), -1, dtype=np.int64)
+        positions = np.searchsorted(self.food_ids, keys)
+        positions = np.clip(positions, 0, len(self.food_ids) - 1)
+        found = self.food_ids[positions] == keys
+        return np.where(found, positions, -1).astype(np.int64)
+
+    def rows(self, food_ids: Sequence[str], columns: Iterable[str] | None = None, per_gram: bool = False) -> np.ndarray:
+        """
+        food_id 목록에 해당하는 영양소 행 (len(food_ids), len(columns))
+        없는 food_id의 행은 NaN, per_gram=True면 1g 기준 값으로 변환
+        """
+        idx = self.indices(food_ids)
+        cols = self.column_indices(columns)
+        result = np.full((len(idx), len(cols)), np.nan, dtype=np.float32)
+        found = idx >= 0
+        result[found] = self.values[idx[found]][:, cols]
+        if per_gram:
+            result[found] /= self.reference_g[idx[found]][:, None]
+        return result
+
+    def mandatory(self, food_ids: Sequence[str]) -> np.ndarray:
+        """9가지 필수 영양소 행"""
+        return self.rows(food_ids, MANDATORY_COLUMNS)
+
+    def sum(self, food_ids: Sequence[str], amounts_g: Sequence[float] | None = None, columns: Iterable[str] | None = None) -> np.ndarray:
+        """
+        음식들의 영양소 합계
+        amounts_g가 주어지면 각 음식의 섭취량(g)에 비례해 환산하고, 없으면 기준량 그대로 합산합니다.
+        값이 없는 영양소(NaN)는 0으로 취급합니다.
+        """
+        if amounts_g is None:
+            rows = self.rows(food_ids, columns)
+        else:
+            rows = self.rows(food_ids, columns, per_gram=True) * np.asarray(amounts_g, dtype=np.float32)[:, None]
+        return np.nansum(rows, axis=0)
+
+    def filter(self, bounds: Dict[str, Tuple[float | None, float | None]], mask: np.ndarray | None = None) -> np.ndarray:
+        """
+        영양소 범위 조건으로 행 마스크 생성
+        예: filter({"sodium_mg": (None, 500), "protein_g": (10, None)})
+        """
+        result = np.ones(len(self), dtype=bool) if mask is None else mask.copy()
+        for column, (low, high) in bounds.items():
+            column_values = self.values[:, self._column_index[column]]
+            if low is not None:
+                result &= column_values >= low
+            if high is not None:
+                result &= column_values <= high
+        return result
+
+    def rank(self, column: str, k: int = 10, ascending: bool = False, mask: np.ndarray | None = None) -> List[str]:
+        """영양소 값 기준 상위 k개 food_id, 값이 없는 음식은 제외"""
+        column_values = np.asarray(self.values[:, self._column_index[column]], dtype=np.float32)
+        candidates = np.flatnonzero(~np.isnan(column_values) if mask is None else (~np.isnan(column_values) & mask))
+        if len(candidates) == 0:
+            return []
+        scores = column_values[candidates] if ascending else -column_values[candidates]
+        k = min(k, len(candidates))
+        top = np.argpartition(scores, k - 1)[:k]
+        top = top[np.argsort(scores[top], kind="stable")]
+        return [str(food_id) for food_id in self.food_ids[candidates[top]]]
+
+
+@singleton
+def get_nutrient_matrix() -> NutrientMatrix:
+    """프로세스에서 공유하는 영양소 행렬 (최초 호출 시 memory-map)"""
+    return NutrientMatrix.load(NUTRIENT_MATRIX_DIR)
+
+
+if __name__ == "__main__":
+    from db.database import SessionLocal
+
+    with SessionLocal() as session:
+        rows = NutrientMatrix.build(session, NUTRIENT_MATRIX_DIR)
+    print(f"{rows}개 음식의 영양소 행렬을 {NUTRIENT_MATRIX_DIR}에 저장했습니다.")
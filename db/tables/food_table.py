@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Date, Numeric, Boolean, BigInteger
 from sqlalchemy.orm import relationship
-from ..database import Base
+from db.base import Base
 
 __all__ = [
     "FoodInfo",
@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, func, PrimaryKeyConstraint
 from sqlalchemy.orm import relationship
-from db.database import Base
+from db.base import Base
 
 
 __all__ = [
@@ -12,12 +12,12 @@ from model.domain.food import Food
 class SleepPatternItem(BaseModel):
     start: str = Field(
         ...,
-        regex=r"^(?:[01]\d|2[0-3]):[0-5]\d$",
+        pattern=r"^(?:[01]\d|2[0-3]):[0-5]\d$",
         description="시작 시간(HH:MM 형식, 00:00~23:59, 예: 07:30)"
     )
     end: str = Field(
         ...,
-        regex=r"^(?:[01]\d|2[0-3]):[0-5]\d$",
+        pattern=r"^(?:[01]\d|2[0-3]):[0-5]\d$",
         description="종료 시간(HH:MM 형식, 00:00~23:59, 예: 23:00)"
     )
 
@@ -0,0 +1,97 @@
+from pydantic import BaseModel, Field, field_validator
+from datetime import time, date
+from typing import Dict, List, Literal
+
+
+class NutrientData(BaseModel):
+    """사용자의 일일 권장 영양소 섭취량 데이터."""
+    energy_kcal: float = Field(..., description="권장 일일 에너지 섭취량 (kcal).")
+    protein_g: float = Field(..., description="권장 일일 단백질 섭취량 (g).")
+    fat_g: float = Field(..., description="권장 일일 지방 섭취량 (g).")
+    carbohydrate_g: float = Field(..., description="권장 일일 탄수화물 섭취량 (g).")
+    sugars_g: float = Field(..., description="권장 일일 당류 섭취량 (g).")
+    sodium_mg: float = Field(..., description="권장 일일 나트륨 섭취량 (mg).")
+    cholesterol_mg: float = Field(..., description="권장 일일 콜레스테롤 섭취량 (mg).")
+    saturated_fat_g: float = Field(..., description="권장 일일 포화지방 섭취량 (g).")
+    trans_fat_g: float = Field(..., description="권장 일일 트랜스지방 섭취량 (g).")
+
+
+# 음식 이름과 영양 정보를 함께 담을 Pydantic 모델
+class FoodItem(BaseModel):
+    """식단 내의 단일 음식 항목입니다. 이름과 함께 9가지 영양 정보를 포함합니다."""
+    food_name: str = Field(..., description="음식의 이름입니다.")
+    food_amount: str = Field(..., description="섭취할 음식의 양입니다.")
+
+# 각 식사를 나타내는 Pydantic 모델 (food_list 타입 변경)
+class Meal(BaseModel):
+    """단일 식사에 대한 상세 정보입니다."""
+    time_slot: time = Field(..., description="식사 시간입니다. 'HH:MM' 형식의 분 단위 시간으로 표시됩니다 (예: '13:00').")
+    food_list: List[FoodItem] = Field(..., description="해당 식사에 포함되는 음식 목록입니다.")
+
+# 하루의 식단 계획을 나타내는 Pydantic 모델
+class DailyPlan(BaseModel):
+    """하루의 식단 계획 정보입니다."""
+    day: date = Field(..., description="해당 식단 계획의 날짜입니다. 'YYYY-MM-DD' 형식의 일단위 날짜로 표시됩니다 (예: '2025-06-23').")
+    meals: List[Meal] = Field(..., description="해당 요일의 식사 목록입니다.")
+    nutrients: NutrientData = Field(..., description="해당 날짜의 9가지 영양 정보입니다.")
+
+# 주간 식단 계획 전체를 나타내는 Pydantic 모델
+class WeeklyMealPlan(BaseModel):
+    """7일간의 주간 식단 계획 전체입니다."""
+    days: List[DailyPlan] = Field(..., description="각 요일의 식단 계획 목록입니다. 총 7개의 DailyPlan 객체를 포함해야 합니다.")
+
+
+# 활동 수준 (Agent.tools.dri_calculator.ACTIVITY_FACTORS의 키)
+ACTIVITY_LEVELS = ("sedentary", "lightly_exercising", "moderately_exercising", "heavy_exercising")
+
+
+class UserProfile(BaseModel):
+    """
+    사용자의 신체 및 건강, 식습관 정보를 담는 Pydantic 모델.
+    """
+    age: int = Field(..., description="사용자의 나이 (만 나이, 1세 이상 120세 이하)", ge=1, le=120)
+    gender: str = Field(..., description="사용자의 성별 ('남성' 또는 '여성')")
+    height: float = Field(..., description="사용자의 키 (cm, 50.0cm 이상 250.0cm 이하)", ge=50.0, le=250.0)
+    weight: float = Field(..., description="사용자의 몸무게 (kg, 10.0kg 이상 300.0kg 이하)", ge=10.0, le=300.0)
+    diseases: List[str] = Field(default_factory=list, description="사용자가 앓고 있는 질병 목록 (없으면 빈 리스트)")
+    favorite_foods: List[str] = Field(default_factory=list, description="사용자가 좋아하는 음식 목록 (없으면 빈 리스트)")
+    disliked_foods: List[str] = Field(default_factory=list, description="사용자가 싫어하는 음식 목록 (없으면 빈 리스트)")
+    activity_level: str = Field(..., description="사용자의 활동 수준 (sedentary, lightly_exercising, moderately_exercising, heavy_exercising)")
+
+    @field_validator('activity_level')
+    def activity_level_validation(cls, v):
+        # 그래프 실행 중(DRI 계산기)이 아니라 요청 단계에서 잘못된 활동 수준을 거절
+        v = v.strip().lower()
+        if v not in ACTIVITY_LEVELS:
+            raise ValueError(f"활동 수준은 {', '.join(ACTIVITY_LEVELS)} 중 하나여야 합니다.")
+        return v
+
+    def to_dict(self) -> Dict:
+        return {
+            "age": self.age,
+            "gender": self.gender,
+            "height": self.height,
+            "weight": self.weight,
+            "diseases": ", ".join(self.diseases) if len(self.diseases) > 0 else "해당사항없음",
+            "favorite_foods": ", ".join(self.favorite_foods) if len(self.favorite_foods) > 0 else "해당사항없음",
+            "disliked_foods": ", ".join(self.disliked_foods) if len(self.disliked_foods) > 0 else "해당사항없음",
+            "activity_level": self.activity_level,
+        }
+
+
+# 식단 생성 요청 스키마
+class ScheduleRequest(BaseModel):
+    user_profile: UserProfile
+    keywords: str = Field("", description="식단 생성 관련 키워드")
+    include_tags: List[str] = Field(default_factory=list, description="fast 모드에서 이 태그 중 하나라도 가진 음식만 사용")
+    exclude_tags: List[str] = Field(default_factory=list, description="fast 모드에서 이 태그를 가진 음식은 제외")
+    mode: Literal["llm", "fast"] = Field("llm", description="식단 생성 방식 (llm: LLM 도구 루프, fast: DRI 계산기 + 최적화기)")
+    thread_id: str | None = Field(None, description="이어서 실행할 그래프 스레드 ID, 없으면 새로 생성")
+
+
+# 식단 생성 응답 스키마
+class ScheduleResponse(BaseModel):
+    thread_id: str
+    nutrient_table: Dict | None = None
+    meal_table: Dict | None = None
+    meal_nutrient_report: Dict | None = None
@@ -1,8 +1,143 @@
 from fastapi import APIRouter
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict
+import asyncio
+import json
+import uuid
+
+from Agent.nutrient_cache import nutrient_cache
+from model.schemas.agent import ScheduleRequest, ScheduleResponse
 
 agent_router = APIRouter(prefix="/agent", tags=["agent"])
 
+# 진행 상황으로 내보낼 그래프 노드
+SCHEDULE_NODES = {
+    "nutrient_cache_lookup",
+    "nutrient_calculator",
+    "nutrient_recommender",
+    "nutrient_recommender_tools",
+    "set_nutrient_table",
+    "meal_plan_generator",
+    "meal_plan_generator_tools",
+    "meal_plan_optimizer",
+    "set_meal_table",
+}
+
+
+def _schedule_inputs(request: ScheduleRequest) -> Dict[str, Any]:
+    """그래프 입력 상태"""
+    return {
+        "user_profile": request.user_profile,
+        "keywords": request.keywords,
+        "include_tags": request.include_tags,
+        "exclude_tags": request.exclude_tags,
+        "mode": request.mode,
+    }
+
+
+def _load_schedule_agent():
+    # 에이전트 모듈은 LLM/Qdrant 클라이언트 import 비용이 커서 서버 시작 시점이 아니라 warmup 또는 첫 요청 때 불러옴
+    from Agent.scheduler import get_schedule_agent
+    return get_schedule_agent()
+
+
+async def _schedule_agent():
+    # import와 생성(warmup 중이면 끝날 때까지 대기)이 이벤트 루프를 막지 않도록 스레드에서 실행
+    return await asyncio.to_thread(_load_schedule_agent)
+
+
+def _schedule_config(thread_id: str) -> Dict[str, Any]:
+    from Agent.scheduler import config as schedule_config
+    return {**schedule_config, "configurable": {"thread_id": thread_id}}
+
+
+def _sse(event: str, data: Any) -> str:
+    """server-sent event 한 건"""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), ensure_ascii=False, default=str)}\n\n"
+
+
+def _node_output(node: str, output: Any) -> Dict[str, Any]:
+    """노드 종료 이벤트에 실을 요약 정보"""
+    if not isinstance(output, dict):
+        return {}
+    if node in ("set_nutrient_table", "nutrient_calculator"):
+        return {"nutrient_table": output.get("nutrient_table")}
+    if node == "nutrient_cache_lookup":
+        return {"cached": output.get("nutrient_table") is not None, "nutrient_table": output.get("nutrient_table")}
+    for key in ("recommender_messages", "plan_messages"):
+        for message in output.get(key, []):
+            if tool_calls := getattr(message, "tool_calls", None):
+                return {"tool_calls": [{"name": call["name"], "args": call["args"]} for call in tool_calls]}
+    return {}
+
+
+async def _stream_schedule(request: ScheduleRequest, thread_id: str) -> AsyncIterator[str]:
+    """그래프를 astream_events로 실행하며 노드/도구 진행 상황을 SSE로 내보낸다"""
+    yield _sse("start", {"thread_id": thread_id, "mode": request.mode})
+    try:
+        schedule_agent = await _schedule_agent()
+        config = _schedule_config(thread_id)
+        async for event in schedule_agent.app.astream_events(_schedule_inputs(request), config, version="v2"):
+            kind, name = event["event"], event.get("name")
+            node = event.get("metadata", {}).get("langgraph_node")
+            if kind == "on_chain_start" and name in SCHEDULE_NODES and name == node:
+                yield _sse("node_start", {"node": name})
+            elif kind == "on_chain_end" and name in SCHEDULE_NODES and name == node:
+                yield _sse("node_end", {"node": name, **_node_output(name, event["data"].get("output"))})
+            elif kind == "on_tool_start":
+                yield _sse("tool_start", {"node": node, "tool": name, "input": event["data"].get("input")})
+            elif kind == "on_tool_end":
+                yield _sse("tool_end", {"node": node, "tool": name})
+        state = await schedule_agent.app.aget_state(config)
+        yield _sse("result", ScheduleResponse(
+            thread_id=thread_id,
+            nutrient_table=state.values.get("nutrient_table"),
+            meal_table=state.values.get("meal_table"),
+            meal_nutrient_report=state.values.get("meal_nutrient_report"),
+        ).model_dump())
+    except Exception as e:
+        yield _sse("error", {"thread_id": thread_id, "detail": str(e)})
+
 
 @agent_router.get("/list")
 async def get_agent_list():
-    return {"message": "Hello, World!"}
\ No newline at end of file
+    return {"message": "Hello, World!"}
+
+
+# 식단 생성 (완료 후 한 번에 응답)
+@agent_router.post("/schedule", response_model=ScheduleResponse)
+async def create_schedule(request: ScheduleRequest):
+    thread_id = request.thread_id or str(uuid.uuid4())
+    schedule_agent = await _schedule_agent()
+    state = await schedule_agent.app.ainvoke(_schedule_inputs(request), _schedule_config(thread_id))
+    return ScheduleResponse(
+        thread_id=thread_id,
+        nutrient_table=state.get("nutrient_table"),
+        meal_table=state.get("meal_table"),
+        meal_nutrient_report=state.get("meal_nutrient_report"),
+    )
+
+
+# 식단 생성 (진행 상황을 server-sent events로 스트리밍)
+@agent_router.post("/schedule/stream")
+async def stream_schedule(request: ScheduleRequest):
+    thread_id = request.thread_id or str(uuid.uuid4())
+    return StreamingResponse(
+        _stream_schedule(request, thread_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# 권장 영양성분 캐시 통계
+@agent_router.get("/nutrient-cache")
+async def get_nutrient_cache_stats():
+    return nutrient_cache.stats()
+
+
+# 권장 영양성분 캐시 전체 무효화 (프롬프트 변경 후 재배포 없이 비울 때)
+@agent_router.delete("/nutrient-cache")
+async def clear_nutrient_cache():
+    nutrient_cache.invalidate()
+    return nutrient_cache.stats()
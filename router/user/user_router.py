@@ -21,9 +21,8 @@ from starlette.status import HTTP_401_UNAUTHORIZED
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 # DB 모듈 임포트
-from db.database import SessionLocal
-from db.model.user_table import UserInfo, UserAuth, Password, SocialLogin
-from db.db_manager import DBManager
+from db.database import AsyncDBManager, get_async_db_manager
+from model.domain.user import User
 from model.schemas.user import UserRegister, UserLogin, Token, RefreshToken, UserRegisterResponse, UserInfoResponse, EmailVerificationRequest, EmailVerificationConfirm, OAuthRegister
 
 # 환경변수 로드
@@ -99,7 +98,7 @@ def create_refresh_token(data: dict):
     return encoded_jwt
 
 # 현재 사용자 가져오기
-async def get_current_user(token: str = Depends(oauth2_scheme), db_manager: DBManager = Depends(get_db_manager)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db_manager: AsyncDBManager = Depends(get_async_db_manager)):
     credentials_exception = HTTPException(
         status_code=HTTP_401_UNAUTHORIZED,
         detail="유효하지 않은 인증 정보입니다.",
@@ -114,25 +113,26 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db_manager: DBMa
     except JWTError:
         raise credentials_exception
         
-    user = db_manager.get_user_by_uuid(uuid)
+    user = await db_manager.get_user_by_uuid(uuid)
     if user is None:
         raise credentials_exception
     return user
 
 # 일반 회원가입 라우트
 @user_router.post("/register", response_model=UserRegisterResponse)
-async def register_user(user_data: UserRegister, db_manager: DBManager = Depends(get_db_manager)):
+async def register_user(user_data: UserRegister, db_manager: AsyncDBManager = Depends(get_async_db_manager)):
     try:
         # DBManager를 사용하여 사용자 생성
-        user_info = db_manager.create_user(
-            email=user_data.email,
-            password=user_data.password,
-            nickname=user_data.nickname,
-            phone=user_data.phone
-        )
+        async with db_manager.transaction():
+            user_uuid = await db_manager.create_user(
+                email=user_data.email,
+                password=user_data.password,
+                nickname=user_data.nickname,
+                phone=user_data.phone
+            )
         
         return {
-            "uuid": user_info["uuid"],
+            "uuid": user_uuid,
             "email": user_data.email,
             "message": "회원가입이 완료되었습니다. 이메일 인증을 진행해주세요.",
             "status": "success"
@@ -154,20 +154,21 @@ async def login_for_access_token(
     response: Response,
     user_data: UserLogin, 
     request: Request,
-    db_manager: DBManager = Depends(get_db_manager)
+    db_manager: AsyncDBManager = Depends(get_async_db_manager)
 ):
     # 사용자 인증
-    user = db_manager.verify_user(user_data.email, user_data.password)
+    user = await db_manager.verify_user(user_data.email, user_data.password)
     if not user:
         # 실패 로그 기록
         try:
-            user_info = db_manager.get_user_by_email(user_data.email)
+            user_info = await db_manager.get_user_by_email(user_data.email)
             if user_info:
-                db_manager.record_login(
-                    uuid=user_info["uuid"], 
-                    status_code=401, 
-                    ip=request.client.host
-                )
+                async with db_manager.transaction():
+                    await db_manager.record_login(
+                        uuid=user_info.uuid, 
+                        status_code=401, 
+                        ip=request.client.host
+                    )
         except:
             pass
             
@@ -178,22 +179,23 @@ async def login_for_access_token(
         )
     
     # 성공 로그 기록
-    db_manager.record_login(
-        uuid=user["uuid"], 
-        status_code=200, 
-        ip=request.client.host
-    )
+    async with db_manager.transaction():
+        await db_manager.record_login(
+            uuid=user.uuid, 
+            status_code=200, 
+            ip=request.client.host
+        )
     
     # 액세스 토큰 생성
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user["uuid"]}, 
+        data={"sub": user.uuid}, 
         expires_delta=access_token_expires
     )
     
     # 리프레시 토큰 생성
     refresh_token = create_refresh_token(
-        data={"sub": user["uuid"]}
+        data={"sub": user.uuid}
     )
     
     # JWT 쿠키 설정
@@ -220,7 +222,7 @@ async def refresh_token(
     token_data: RefreshToken = None,
     refresh_token: Optional[str] = Header(None),
     cookie_refresh_token: Optional[str] = None,
-    db_manager: DBManager = Depends(get_db_manager)
+    db_manager: AsyncDBManager = Depends(get_async_db_manager)
 ):
     # 리프레시 토큰 우선 순위: Body > Header > Cookie
     if token_data and token_data.refresh_token:
@@ -247,7 +249,7 @@ async def refresh_token(
             )
             
         # 사용자 확인
-        user = db_manager.get_user_by_uuid(uuid)
+        user = await db_manager.get_user_by_uuid(uuid)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -291,25 +293,32 @@ async def refresh_token(
 
 # OAuth 회원가입 라우트
 @user_router.post("/oauth/register", response_model=UserRegisterResponse)
-async def register_oauth_user(user_data: OAuthRegister, db_manager: DBManager = Depends(get_db_manager)):
+async def register_oauth_user(user_data: OAuthRegister, db_manager: AsyncDBManager = Depends(get_async_db_manager)):
     try:
-        # DBManager를 사용하여 OAuth 사용자 생성
-        user_info = db_manager.create_oauth_user(
-            email=user_data.email,
-            social_code=user_data.social_code,
-            access_token=user_data.access_token,
-            nickname=user_data.nickname
-        )
-        
-        message = "OAuth 회원가입이 완료되었습니다."
-        if user_info.get("status") == "existing":
-            message = "이미 등록된 사용자입니다. 로그인을 진행합니다."
+        # 이미 가입한 이메일이면 새로 만들지 않음
+        user = await db_manager.get_user_by_email(user_data.email)
+        if user is not None:
+            return {
+                "uuid": user.uuid,
+                "email": user_data.email,
+                "message": "이미 등록된 사용자입니다. 로그인을 진행합니다.",
+                "status": "existing"
+            }
+
+        # AsyncDBManager를 사용하여 OAuth 사용자 생성
+        async with db_manager.transaction():
+            user_uuid = await db_manager.create_user(
+                email=user_data.email,
+                social_code=user_data.social_code,
+                access_token=user_data.access_token,
+                nickname=user_data.nickname
+            )
         
         return {
-            "uuid": user_info["uuid"],
+            "uuid": user_uuid,
             "email": user_data.email,
-            "message": message,
-            "status": user_info.get("status", "success")
+            "message": "OAuth 회원가입이 완료되었습니다.",
+            "status": "success"
         }
     except ValueError as e:
         raise HTTPException(
@@ -327,10 +336,10 @@ async def register_oauth_user(user_data: OAuthRegister, db_manager: DBManager =
 async def request_email_verification(
     request: EmailVerificationRequest, 
     background_tasks: BackgroundTasks,
-    db_manager: DBManager = Depends(get_db_manager)
+    db_manager: AsyncDBManager = Depends(get_async_db_manager)
 ):
     # 해당 이메일이 등록되어 있는지 확인
-    user = db_manager.get_user_by_email(request.email)
+    user = await db_manager.get_user_by_email(request.email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -385,12 +394,12 @@ async def confirm_email_verification(verify: EmailVerificationConfirm):
 
 # 사용자 정보 조회 라우트
 @user_router.get("/me", response_model=UserInfoResponse)
-async def get_user_info(current_user: dict = Depends(get_current_user)):
+async def get_user_info(current_user: User = Depends(get_current_user)):
     return {
-        "uuid": current_user["uuid"],
-        "email": current_user["email"],
-        "nickname": current_user["nickname"],
-        "phone": current_user.get("phone")
+        "uuid": current_user.uuid,
+        "email": current_user.user_auth.email,
+        "nickname": current_user.nickname,
+        "phone": current_user.user_auth.phone
     }
 
 # 로그아웃 라우트
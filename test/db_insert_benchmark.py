@@ -0,0 +1,107 @@
+"""
+음식 대량 입력 벤치마크 (autocommit vs unit of work)
+
+DBManager.create_food로 테스트 음식 N개를 넣어 커밋 방식별로 다음을 출력합니다.
+- autocommit: DBManager(autocommit=True), 음식마다 커밋 (기존 방식)
+- unit_of_work: DBManager(), 메서드는 flush만 하고 transaction()이 --batch개마다 한 번 커밋
+- inserts/sec: 초당 입력한 음식 수
+- commits: 커밋 횟수
+
+테스트 음식은 food_id가 BENCH-로 시작하며, 모드마다 측정 후 삭제합니다.
+
+사용법:
+    python test/db_insert_benchmark.py --count 10000 --batch 10000
+    python test/db_insert_benchmark.py --database-url sqlite:///bench.db   # MySQL 없이 실행
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import argparse
+import time
+
+from sqlalchemy import create_engine, event
+
+from db.database import Base, DBManager, SessionLocal
+from db.tables.food_table import FoodCategory, FoodCompany, FoodInfo, FoodInfoTag, FoodNutrition, FoodSourceInfo
+
+FOOD_ID_PREFIX = "BENCH-"
+
+
+def food_id(i: int) -> str:
+    # food_id 컬럼 길이(19)에 맞춤
+    return f"{FOOD_ID_PREFIX}{i:013d}"
+
+
+def create_foods(manager: DBManager, start: int, stop: int) -> None:
+    for i in range(start, stop):
+        manager.create_food(
+            food_id=food_id(i),
+            name=f"벤치마크 음식 {i}",
+            data_type_code="D",
+            major_category_name="벤치마크",
+            energy_kcal="100",
+            protein_g="10",
+            fat_g="5",
+            carbohydrate_g="20",
+        )
+
+
+def cleanup() -> None:
+    with DBManager() as manager, manager.transaction():
+        for table in (FoodInfoTag, FoodNutrition, FoodCompany, FoodSourceInfo, FoodCategory, FoodInfo):
+            manager.session.query(table).filter(table.food_id.like(f"{FOOD_ID_PREFIX}%")).delete(synchronize_session=False)
+
+
+def run(mode: str, count: int, batch: int) -> dict:
+    commits = {"count": 0}
+    engine = SessionLocal.kw["bind"]
+
+    def on_commit(connection):
+        commits["count"] += 1
+
+    event.listen(engine, "commit", on_commit)
+    start = time.perf_counter()
+    try:
+        if mode == "autocommit":
+            with DBManager(autocommit=True) as manager:
+                create_foods(manager, 0, count)
+        else:
+            with DBManager() as manager:
+                for i in range(0, count, batch):
+                    with manager.transaction():
+                        create_foods(manager, i, min(i + batch, count))
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "commit", on_commit)
+    return {"mode": mode, "seconds": elapsed, "inserts_per_sec": count / elapsed, "commits": commits["count"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="음식 대량 입력 벤치마크")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--batch", type=int, default=10000, help="unit_of_work 모드에서 한 트랜잭션에 넣을 음식 수")
+    parser.add_argument("--modes", nargs="+", default=["autocommit", "unit_of_work"], choices=["autocommit", "unit_of_work"])
+    parser.add_argument("--database-url", default=None, help="지정하면 .env의 MySQL 대신 이 DB에 테이블을 만들고 실행")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+        Base.metadata.create_all(engine)
+        SessionLocal.configure(bind=engine)
+
+    cleanup()
+    print(f"count: {args.count}, batch: {args.batch}")
+    print(f"{'mode':<13} {'sec':>8} {'inserts/sec':>12} {'commits':>8}")
+    for mode in args.modes:
+        try:
+            result = run(mode, args.count, args.batch)
+        finally:
+            cleanup()
+        print(f"{mode:<13} {result['seconds']:>8.1f} {result['inserts_per_sec']:>12.1f} {result['commits']:>8}")
+
+
+if __name__ == "__main__":
+    main()
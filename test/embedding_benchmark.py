@@ -0,0 +1,137 @@
+"""
+임베딩 백엔드 벤치마크 (food_name 컬렉션 기준)
+
+각 백엔드로 food_name 컬렉션의 음식 이름 표본을 임베딩해 다음을 출력합니다.
+- docs/sec: 문서 임베딩 처리량
+- query p50/p95 (ms): 쿼리 1건 임베딩 지연
+- sample recall@10: 표본을 각 백엔드로 다시 임베딩했을 때 기존 모델(huggingface) top-10과 겹치는 비율
+- live recall@10: 기존 모델로 색인된 컬렉션을 각 백엔드의 쿼리 벡터로 검색했을 때 기존 모델 검색 결과와 겹치는 비율
+  (재색인 없이 쿼리 인코더만 바꿔도 되는지 확인)
+- RSS 증가량 (MB)
+
+사용법:
+    python test/embedding_benchmark.py --backends huggingface onnx onnx-int8 fastembed --sample 2000 --queries 200
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import argparse
+import gc
+import os
+import random
+import time
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import QueryRequest
+
+from Agent.embedding_backends import EMBEDDING_BACKENDS, create_embeddings
+from Agent.qdrant_manager import EMBEDDING_MODEL_NAME, QDRANT_HOST, QDRANT_PORT, collections
+
+BASELINE = "huggingface"
+
+
+def load_food_names(client: QdrantClient, sample: int) -> list[str]:
+    names, offset = [], None
+    while len(names) < sample:
+        points, offset = client.scroll(collections.food_name_collection, limit=min(1000, sample - len(names)), offset=offset, with_payload=True)
+        names += [point.payload["page_content"] for point in points if point.payload.get("page_content")]
+        if offset is None:
+            break
+    return names
+
+
+def top_k(corpus: np.ndarray, queries: np.ndarray, k: int = 10) -> np.ndarray:
+    corpus = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    return np.argsort(-(queries @ corpus.T), axis=1)[:, :k]
+
+
+def recall(result: list[set], baseline: list[set], k: int = 10) -> float:
+    return float(np.mean([len(a & b) / k for a, b in zip(result, baseline)]))
+
+
+def rss_mb() -> float:
+    """현재 프로세스의 RSS (Linux /proc 기준)"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+def run(backend: str, names: list[str], queries: list[str], batch_size: int, client: QdrantClient) -> dict:
+    rss_before = rss_mb()
+    model = create_embeddings(EMBEDDING_MODEL_NAME, backend)
+    model.embed_query("warmup")
+
+    start = time.perf_counter()
+    corpus = []
+    for i in range(0, len(names), batch_size):
+        corpus += model.embed_documents(names[i:i + batch_size])
+    docs_per_sec = len(names) / (time.perf_counter() - start)
+
+    latencies, query_vectors = [], []
+    for query in queries:
+        start = time.perf_counter()
+        query_vectors.append(model.embed_query(query))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    sample_top = [set(row) for row in top_k(np.asarray(corpus), np.asarray(query_vectors)).tolist()]
+    live_top = [
+        {str(point.id) for point in response.points}
+        for response in client.query_batch_points(
+            collections.food_name_collection,
+            requests=[QueryRequest(query=vector, limit=10) for vector in query_vectors],
+        )
+    ]
+    rss = rss_mb() - rss_before
+    del model
+    gc.collect()
+    return {
+        "backend": backend,
+        "docs_per_sec": docs_per_sec,
+        "query_p50_ms": float(np.percentile(latencies, 50)),
+        "query_p95_ms": float(np.percentile(latencies, 95)),
+        "rss_mb": rss,
+        "sample_top": sample_top,
+        "live_top": live_top,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 벤치마크")
+    parser.add_argument("--backends", nargs="+", default=list(EMBEDDING_BACKENDS), choices=EMBEDDING_BACKENDS)
+    parser.add_argument("--sample", type=int, default=2000, help="임베딩할 음식 이름 수")
+    parser.add_argument("--queries", type=int, default=200, help="쿼리 수 (표본에서 뽑아 공백을 제거)")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    client = QdrantClient(url=f"http://{QDRANT_HOST}:{QDRANT_PORT}")
+    names = load_food_names(client, args.sample)
+    random.seed(args.seed)
+    queries = ["".join(name.split()) for name in random.sample(names, min(args.queries, len(names)))]
+    print(f"model: {EMBEDDING_MODEL_NAME}, docs: {len(names)}, queries: {len(queries)}")
+
+    backends = [BASELINE] + [backend for backend in args.backends if backend != BASELINE]
+    results = []
+    for backend in backends:
+        try:
+            results.append(run(backend, names, queries, args.batch_size, client))
+        except Exception as e:
+            print(f"{backend}: 실패 ({e})")
+    baseline = next((result for result in results if result["backend"] == BASELINE), None)
+
+    print(f"{'backend':<12} {'docs/sec':>10} {'q p50 ms':>10} {'q p95 ms':>10} {'rss MB':>8} {'sample R@10':>12} {'live R@10':>10}")
+    for result in results:
+        sample_recall = recall(result["sample_top"], baseline["sample_top"]) if baseline else float("nan")
+        live_recall = recall(result["live_top"], baseline["live_top"]) if baseline else float("nan")
+        print(
+            f"{result['backend']:<12} {result['docs_per_sec']:>10.1f} {result['query_p50_ms']:>10.1f} {result['query_p95_ms']:>10.1f} "
+            f"{result['rss_mb']:>8.0f} {sample_recall:>12.3f} {live_recall:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+음식 이름 검색 오프라인 평가 (dense vs hybrid)
+
+food_name 컬렉션에서 음식 이름 표본을 뽑아 여러 형태의 쿼리로 바꾼 뒤 검색 모드별로 다음을 출력합니다.
+- top-1 accuracy: 1위 결과의 food_id가 원래 음식과 같은 비율 (쿼리 형태별)
+- p50/p95 (ms): 쿼리 1건 검색 지연 (임베딩은 미리 캐시에 올려 검색 시간만 측정)
+
+쿼리 형태:
+- exact: 원래 이름 ("국밥_돼지머리")
+- space: 밑줄을 공백으로 ("국밥 돼지머리")
+- nospace: 공백과 밑줄 제거 ("국밥돼지머리")
+- reversed: 밑줄로 나눈 단어 순서 뒤집기 ("돼지머리 국밥")
+
+hybrid 모드는 컬렉션에 희소 벡터가 있어야 하므로, HYBRID_COLLECTIONS에 food_name을 넣고
+reset_collection 후 다시 적재한 컬렉션에서 실행하세요.
+
+사용법:
+    python test/hybrid_search_eval.py --sample 1000 --modes dense hybrid
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from Agent.qdrant_manager import get_qdrant_manager
+
+QUERY_FORMS = {
+    "exact": lambda name: name,
+    "space": lambda name: " ".join(name.replace("_", " ").split()),
+    "nospace": lambda name: "".join(name.replace("_", " ").split()),
+    "reversed": lambda name: " ".join(reversed(name.replace("_", " ").split())),
+}
+
+
+def load_samples(qdrant_manager, collection_name: str, sample: int, seed: int) -> list[tuple[str, str]]:
+    """(food_id, food_name) 표본"""
+    foods, offset = [], None
+    while True:
+        points, offset = qdrant_manager.client.scroll(collection_name, limit=1000, offset=offset, with_payload=True)
+        foods += [
+            (point.payload["metadata"]["food_id"], point.payload["page_content"])
+            for point in points
+            if point.payload.get("metadata", {}).get("food_id")
+        ]
+        if offset is None:
+            break
+    random.seed(seed)
+    return random.sample(foods, min(sample, len(foods)))
+
+
+def evaluate(qdrant_manager, collection_name: str, samples: list[tuple[str, str]], mode: str) -> dict:
+    result = {"mode": mode, "latencies": []}
+    for form, transform in QUERY_FORMS.items():
+        correct = 0
+        for food_id, food_name in samples:
+            query = transform(food_name)
+            start = time.perf_counter()
+            points = qdrant_manager.get_documents(query, collection_name, limit=1, mode=mode)
+            result["latencies"].append((time.perf_counter() - start) * 1000)
+            correct += bool(points) and points[0].payload.get("metadata", {}).get("food_id") == food_id
+        result[form] = correct / len(samples)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="음식 이름 검색 평가 (dense vs hybrid)")
+    parser.add_argument("--sample", type=int, default=1000, help="평가할 음식 수")
+    parser.add_argument("--modes", nargs="+", default=["dense", "hybrid"], choices=["dense", "hybrid"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    qdrant_manager = get_qdrant_manager()
+    collection_name = qdrant_manager.collection_names.food_name_collection
+    samples = load_samples(qdrant_manager, collection_name, args.sample, args.seed)
+    print(f"collection: {collection_name}, samples: {len(samples)}, hybrid: {qdrant_manager.is_hybrid(collection_name)}")
+
+    # 임베딩은 모드와 관계없이 같으므로 미리 계산해 캐시에 올려 둠
+    qdrant_manager.embed_queries([transform(name) for transform in QUERY_FORMS.values() for _, name in samples])
+
+    print(f"{'mode':<8} " + " ".join(f"{form:>9}" for form in QUERY_FORMS) + f" {'p50 ms':>8} {'p95 ms':>8}")
+    for mode in args.modes:
+        try:
+            result = evaluate(qdrant_manager, collection_name, samples, mode)
+        except Exception as e:
+            print(f"{mode}: 실패 ({e})")
+            continue
+        print(
+            f"{mode:<8} " + " ".join(f"{result[form]:>9.3f}" for form in QUERY_FORMS)
+            + f" {np.percentile(result['latencies'], 50):>8.1f} {np.percentile(result['latencies'], 95):>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+PDF 파싱 벤치마크 (PdfReader.get_docs_from_pdf)
+
+프로세스 수와 표 추출 여부를 바꿔 가며 각 PDF를 끝까지 파싱해 다음을 출력합니다.
+- pages/sec: 초당 파싱한 페이지 수
+- docs: 만들어진 Document 수 (프로세스 수와 관계없이 같아야 함)
+
+사용법:
+    python test/pdf_benchmark.py --workers 1 4 8 --tables both
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import argparse
+import os
+import time
+
+import pymupdf
+
+from data.set_qdrant import PdfReader
+
+PHYSIOLOGY_PDFS = [
+    "docs/physiology/Essentials of Anatomy and Physiology ( PDFDrive ).pdf",
+    "docs/physiology/Guyton and Hall Textbook of Medical Physiology ( PDFDrive ).pdf",
+]
+
+
+def run(pdf_path: str, workers: int, extract_tables: bool, shard_pages: int) -> dict:
+    with pymupdf.open(pdf_path) as doc:
+        page_count = doc.page_count
+    start = time.perf_counter()
+    docs = sum(1 for _ in PdfReader.get_docs_from_pdf(pdf_path, workers=workers, shard_pages=shard_pages, extract_tables=extract_tables))
+    elapsed = time.perf_counter() - start
+    return {"pages": page_count, "docs": docs, "seconds": elapsed, "pages_per_sec": page_count / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 파싱 벤치마크")
+    parser.add_argument("--pdfs", nargs="+", default=PHYSIOLOGY_PDFS)
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, os.cpu_count() or 1])
+    parser.add_argument("--tables", choices=["on", "off", "both"], default="both", help="표 추출 여부")
+    parser.add_argument("--shard-pages", type=int, default=16)
+    args = parser.parse_args()
+
+    tables = {"on": [True], "off": [False], "both": [False, True]}[args.tables]
+    print(f"{'pdf':<40} {'workers':>7} {'tables':>6} {'pages':>6} {'docs':>7} {'sec':>8} {'pages/sec':>10}")
+    for pdf_path in args.pdfs:
+        if not os.path.exists(pdf_path):
+            print(f"{pdf_path}: 파일이 없습니다.")
+            continue
+        for extract_tables in tables:
+            for workers in args.workers:
+                result = run(pdf_path, workers, extract_tables, args.shard_pages)
+                print(
+                    f"{os.path.basename(pdf_path)[:40]:<40} {workers:>7} {str(extract_tables):>6} {result['pages']:>6} "
+                    f"{result['docs']:>7} {result['seconds']:>8.1f} {result['pages_per_sec']:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Qdrant 저장 프리셋 벤치마크 (memory / on_disk / scalar / binary)
+
+원본 컬렉션(기본 food_name)에서 벡터 표본을 읽어 프리셋마다 임시 컬렉션(bench_<preset>)에 적재한 뒤 다음을 출력합니다.
+- est RAM MB: 벡터 저장에 필요한 RAM 추정치 (RAM에 두는 원본/양자화 벡터 크기 합, HNSW 그래프 제외)
+- rss MB: 적재 전후 Qdrant 서버 memory_resident_bytes(/metrics) 차이 (다른 작업의 영향을 받는 참고값)
+- p50/p95 (ms): 검색 지연
+- recall@10: 같은 컬렉션의 정확한 검색(exact=True) top-10 대비 겹치는 비율
+양자화 프리셋은 rescore를 켠 경우와 끈 경우를 모두 측정합니다.
+
+사용법:
+    python test/qdrant_storage_benchmark.py --sample 20000 --queries 200 --presets memory scalar binary
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import argparse
+import random
+import time
+
+import httpx
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import (
+    CollectionStatus, Distance, PointStruct, QuantizationSearchParams, SearchParams, VectorParams,
+)
+
+from Agent.qdrant_manager import (
+    QDRANT_HOST, QDRANT_PORT, STORAGE_PRESETS, StoragePreset, collections, hnsw_config, quantization_config,
+)
+
+# 벡터 1개의 바이트 수 (차원 dim 기준)
+BYTES_PER_VECTOR = {
+    None: lambda dim: 0,
+    "scalar": lambda dim: dim,
+    "binary": lambda dim: dim / 8,
+}
+
+
+def load_vectors(client: QdrantClient, collection_name: str, sample: int) -> list[list[float]]:
+    vectors, offset = [], None
+    while len(vectors) < sample:
+        points, offset = client.scroll(collection_name, limit=min(1000, sample - len(vectors)), offset=offset, with_vectors=True)
+        for point in points:
+            vector = point.vector.get("", None) if isinstance(point.vector, dict) else point.vector
+            if vector is not None:
+                vectors.append(vector)
+        if offset is None:
+            break
+    return vectors
+
+
+def resident_mb() -> float:
+    """Qdrant 서버 RSS (MB), /metrics를 읽지 못하면 NaN"""
+    try:
+        metrics = httpx.get(f"http://{QDRANT_HOST}:{QDRANT_PORT}/metrics", timeout=5).text
+    except httpx.HTTPError:
+        return float("nan")
+    for line in metrics.splitlines():
+        if line.startswith("memory_resident_bytes"):
+            return float(line.split()[-1]) / 1024 / 1024
+    return float("nan")
+
+
+def estimated_ram_mb(preset: StoragePreset, n: int, dim: int) -> float:
+    original = 0 if preset.on_disk else n * dim * 4
+    return (original + n * BYTES_PER_VECTOR[preset.quantization](dim)) / 1024 / 1024
+
+
+def create(client: QdrantClient, name: str, preset: StoragePreset, vectors: list[list[float]], batch_size: int = 500) -> None:
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    client.create_collection(
+        collection_name=name,
+        vectors_config=VectorParams(size=len(vectors[0]), distance=Distance.COSINE, on_disk=preset.on_disk),
+        quantization_config=quantization_config(preset),
+        hnsw_config=hnsw_config(preset),
+    )
+    for i in range(0, len(vectors), batch_size):
+        client.upsert(name, points=[PointStruct(id=i + j, vector=vector) for j, vector in enumerate(vectors[i:i + batch_size])], wait=True)
+    # 인덱싱(HNSW, 양자화)이 끝날 때까지 대기
+    while client.get_collection(name).status != CollectionStatus.GREEN:
+        time.sleep(1)
+
+
+def search(client: QdrantClient, name: str, queries: list[list[float]], params: SearchParams, k: int = 10) -> tuple[list[set], list[float]]:
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        points = client.query_points(name, query=query, limit=k, search_params=params).points
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({point.id for point in points})
+    return results, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Qdrant 저장 프리셋 벤치마크")
+    parser.add_argument("--collection", default=collections.food_name_collection, help="벡터를 가져올 원본 컬렉션")
+    parser.add_argument("--presets", nargs="+", default=list(STORAGE_PRESETS), choices=list(STORAGE_PRESETS))
+    parser.add_argument("--sample", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--oversampling", type=float, default=2.0)
+    parser.add_argument("--hnsw-ef", type=int, default=None)
+    parser.add_argument("--keep", action="store_true", help="임시 컬렉션을 지우지 않음")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    client = QdrantClient(url=f"http://{QDRANT_HOST}:{QDRANT_PORT}", timeout=600)
+    vectors = load_vectors(client, args.collection, args.sample)
+    random.seed(args.seed)
+    queries = random.sample(vectors, min(args.queries, len(vectors)))
+    dim = len(vectors[0])
+    print(f"collection: {args.collection}, vectors: {len(vectors)}, dim: {dim}, queries: {len(queries)}")
+
+    print(f"{'preset':<10} {'rescore':>7} {'est RAM MB':>10} {'rss MB':>8} {'p50 ms':>8} {'p95 ms':>8} {'recall@10':>10}")
+    for name in args.presets:
+        preset = STORAGE_PRESETS[name]
+        collection_name = f"bench_{name}"
+        rss_before = resident_mb()
+        create(client, collection_name, preset, vectors)
+        rss = resident_mb() - rss_before
+        exact, _ = search(client, collection_name, queries, SearchParams(exact=True))
+        for rescore in ([True, False] if preset.quantization else [False]):
+            params = SearchParams(
+                hnsw_ef=args.hnsw_ef,
+                quantization=QuantizationSearchParams(rescore=rescore, oversampling=args.oversampling) if preset.quantization else None,
+            )
+            results, latencies = search(client, collection_name, queries, params)
+            recall = float(np.mean([len(result & truth) / len(truth) for result, truth in zip(results, exact) if truth]))
+            print(
+                f"{name:<10} {str(rescore):>7} {estimated_ram_mb(preset, len(vectors), dim):>10.1f} {rss:>8.1f} "
+                f"{np.percentile(latencies, 50):>8.2f} {np.percentile(latencies, 95):>8.2f} {recall:>10.3f}"
+            )
+        if not args.keep:
+            client.delete_collection(collection_name)
+
+
+if __name__ == "__main__":
+    main()
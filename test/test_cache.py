@@ -0,0 +1,39 @@
+"""
+singleton 데코레이터 동시 초기화 테스트
+
+사용법:
+    python -m pytest test/test_cache.py
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import threading
+import time
+
+from db.cache import singleton
+
+
+def test_singleton_created_once_under_concurrent_calls():
+    calls = []
+
+    @singleton
+    def get_resource():
+        calls.append(1)
+        time.sleep(0.1)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(get_resource())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len({id(result) for result in results}) == 1
+
+    get_resource.cache_clear()
+    assert get_resource() is not results[0]
+    assert len(calls) == 2
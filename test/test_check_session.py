@@ -0,0 +1,97 @@
+"""
+check_session SAVEPOINT(begin_nested) 테스트: 실패한 호출의 쓰기만 되돌리고 세션은 계속 사용
+
+사용법:
+    python -m pytest test/test_check_session.py
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pytest
+import sqlalchemy
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import db.tables.user_table  # noqa: F401 (food_table 관계 대상 등록)
+from db.base import Base
+from db.db_mixin.food_mixin import FoodMixin
+from db.tables.food_table import FoodInfo
+
+CATEGORY = dict(
+    data_type_code="D", major_category_name="a", medium_category_name="b",
+    minor_category_name="c", detail_category_name="d", representative_food_name="e",
+)
+
+
+class Manager(FoodMixin):
+    def __init__(self, session: Session, autocommit: bool = False):
+        self.session = session
+        self.autocommit = autocommit
+        self.uncommitted = False
+
+    @FoodMixin.check_session
+    def add_duplicate_food(self, food_id: str):
+        """flush 때 기본 키 중복으로 실패하는 쓰기"""
+        self.session.add(FoodInfo(food_id=food_id, food_name="중복", data_type_code="D"))
+
+
+@pytest.fixture
+def engine():
+    engine = sqlalchemy.create_engine("sqlite://", poolclass=sqlalchemy.pool.StaticPool)
+
+    # pysqlite는 SAVEPOINT 앞에 BEGIN을 내지 않으므로 트랜잭션 시작을 직접 관리
+    @event.listens_for(engine, "connect")
+    def connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def food_ids(engine) -> list[str]:
+    with Session(engine) as session:
+        return sorted(food_id for food_id, in session.query(FoodInfo.food_id))
+
+
+def test_failed_call_rolls_back_only_its_own_writes(engine):
+    with Session(engine) as session:
+        manager = Manager(session)
+        assert manager.create_food(food_id="F1", name="사과", **CATEGORY)
+        session.expunge_all()
+        with pytest.raises(IntegrityError):
+            manager.add_duplicate_food("F1")
+        assert manager.create_food(food_id="F2", name="배", **CATEGORY)
+        assert manager.uncommitted
+        session.commit()
+    assert food_ids(engine) == ["F1", "F2"]
+
+
+def test_create_food_returns_false_on_duplicate(engine):
+    with Session(engine) as session:
+        manager = Manager(session)
+        assert manager.create_food(food_id="F1", name="사과", **CATEGORY)
+        session.commit()
+        session.expunge_all()
+        assert manager.create_food(food_id="F1", name="사과2", **CATEGORY) is False
+        assert manager.create_food(food_id="F2", name="배", **CATEGORY)
+        session.commit()
+    assert food_ids(engine) == ["F1", "F2"]
+
+
+def test_autocommit_commits_each_call(engine):
+    with Session(engine) as session:
+        manager = Manager(session, autocommit=True)
+        assert manager.create_food(food_id="F1", name="사과", **CATEGORY)
+        session.expunge_all()
+        with pytest.raises(IntegrityError):
+            manager.add_duplicate_food("F1")
+        assert not manager.uncommitted
+    assert food_ids(engine) == ["F1"]
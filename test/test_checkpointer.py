@@ -0,0 +1,135 @@
+"""
+SQLiteCheckpointSaver 재개 / 압축(keep_last) / 정리(TTL, max_threads) / 비동기 경로 테스트
+
+사용법:
+    python -m pytest test/test_checkpointer.py
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import asyncio
+import operator
+import time
+from typing import Annotated, List, TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+
+from Agent.checkpointer import SQLiteCheckpointSaver
+
+
+class State(TypedDict):
+    messages: Annotated[List[str], operator.add]
+
+
+def build_graph(checkpointer: SQLiteCheckpointSaver):
+    """입력 메시지마다 "응답 n"을 덧붙이는 두 단계 그래프 (실행마다 체크포인트가 여러 개 생김)"""
+    def echo(state: State) -> State:
+        return {"messages": [f"echo {state['messages'][-1]}"]}
+
+    def count(state: State) -> State:
+        return {"messages": [f"응답 {len(state['messages'])}"]}
+
+    graph = StateGraph(State)
+    graph.add_node("echo", echo)
+    graph.add_node("count", count)
+    graph.add_edge(START, "echo")
+    graph.add_edge("echo", "count")
+    graph.add_edge("count", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def make_saver(path: Path, **kwargs) -> SQLiteCheckpointSaver:
+    return SQLiteCheckpointSaver(path=str(path), **{"ttl": None, "max_threads": None, "keep_last": None, **kwargs})
+
+
+def test_resume_by_thread_id_after_reopen(tmp_path):
+    path = tmp_path / "checkpoints.sqlite"
+    saver = make_saver(path)
+    build_graph(saver).invoke({"messages": ["안녕"]}, config("t1"))
+    build_graph(saver).invoke({"messages": ["다른 스레드"]}, config("t2"))
+    saver.close()
+
+    # 다른 워커가 같은 파일을 열어 이어받음
+    saver = make_saver(path)
+    result = build_graph(saver).invoke({"messages": ["다시"]}, config("t1"))
+    assert result["messages"] == ["안녕", "echo 안녕", "응답 2", "다시", "echo 다시", "응답 5"]
+    assert build_graph(saver).get_state(config("t2")).values["messages"][0] == "다른 스레드"
+    saver.close()
+
+
+def test_keep_last_compaction_still_resumes_latest(tmp_path):
+    saver = make_saver(tmp_path / "checkpoints.sqlite", keep_last=2)
+    graph = build_graph(saver)
+    for i in range(3):
+        graph.invoke({"messages": [f"질문 {i}"]}, config("t1"))
+
+    assert len(list(saver.list(config("t1")))) == 2
+    latest = saver.get_tuple(config("t1"))
+    assert latest.checkpoint["id"] == next(saver.list(config("t1"))).checkpoint["id"]
+    assert graph.get_state(config("t1")).values["messages"][-1] == "응답 8"
+
+    result = graph.invoke({"messages": ["질문 3"]}, config("t1"))
+    assert result["messages"][-3:] == ["질문 3", "echo 질문 3", "응답 11"]
+    assert len(result["messages"]) == 12
+    saver.close()
+
+
+def test_keep_last_below_two_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        make_saver(tmp_path / "checkpoints.sqlite", keep_last=1)
+
+
+def test_prune_ttl(tmp_path):
+    saver = make_saver(tmp_path / "checkpoints.sqlite", ttl=60, prune_interval=3600)
+    graph = build_graph(saver)
+    graph.invoke({"messages": ["오래됨"]}, config("old"))
+    graph.invoke({"messages": ["최근"]}, config("new"))
+    with saver.conn:
+        saver.conn.execute("UPDATE threads SET updated_at = ? WHERE thread_id = 'old'", (time.time() - 120,))
+
+    assert saver.prune() == 1
+    assert saver.get_tuple(config("old")) is None
+    assert saver.get_tuple(config("new")) is not None
+    assert saver.stats()["threads"] == 1
+    saver.close()
+
+
+def test_prune_max_threads_drops_least_recent(tmp_path):
+    saver = make_saver(tmp_path / "checkpoints.sqlite", max_threads=2, prune_interval=3600)
+    graph = build_graph(saver)
+    for thread_id in ("a", "b", "c"):
+        graph.invoke({"messages": [thread_id]}, config(thread_id))
+    # a를 다시 사용하면 가장 오래 안 쓴 스레드는 b
+    graph.invoke({"messages": ["a 다시"]}, config("a"))
+
+    assert saver.prune() == 1
+    assert [saver.get_tuple(config(thread_id)) is not None for thread_id in ("a", "b", "c")] == [True, False, True]
+    assert saver.conn.execute("SELECT COUNT(*) FROM writes WHERE thread_id = 'b'").fetchone() == (0,)
+    saver.close()
+
+
+def test_async_path(tmp_path):
+    saver = make_saver(tmp_path / "checkpoints.sqlite", keep_last=2)
+    graph = build_graph(saver)
+
+    async def run():
+        await graph.ainvoke({"messages": ["비동기"]}, config("t1"))
+        result = await graph.ainvoke({"messages": ["다시"]}, config("t1"))
+        listed = [item async for item in saver.alist(config("t1"))]
+        latest = await saver.aget_tuple(config("t1"))
+        await saver.adelete_thread("t1")
+        return result, listed, latest, await saver.aget_tuple(config("t1"))
+
+    result, listed, latest, deleted = asyncio.run(run())
+    assert result["messages"] == ["비동기", "echo 비동기", "응답 2", "다시", "echo 다시", "응답 5"]
+    assert len(listed) == 2 and listed[0].checkpoint["id"] == latest.checkpoint["id"]
+    assert deleted is None
+    saver.close()
@@ -0,0 +1,49 @@
+"""
+DRI 계산기 열량 하한 / 활동 수준 검증 테스트
+
+사용법:
+    python -m pytest test/test_dri_calculator.py
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pydantic
+import pytest
+
+from Agent.tools.dri_calculator import ACTIVITY_FACTORS, DRI_ENERGY_KCAL, calculate_nutrient_data
+from model.schemas.agent import ACTIVITY_LEVELS, UserProfile
+
+
+def make_profile(**kwargs) -> UserProfile:
+    profile = {"age": 40, "gender": "남성", "height": 175.0, "weight": 70.0, "activity_level": "sedentary"}
+    return UserProfile(**{**profile, **kwargs})
+
+
+@pytest.mark.parametrize("age, height, weight, eer", [
+    (2, 90.0, 13.0, DRI_ENERGY_KCAL["male"][0]),
+    (7, 125.0, 30.0, DRI_ENERGY_KCAL["male"][2]),
+    (16, 170.0, 80.0, DRI_ENERGY_KCAL["male"][5]),
+])
+def test_obesity_deficit_not_applied_to_children(age, height, weight, eer):
+    profile = make_profile(age=age, height=height, weight=weight, diseases=["비만"])
+    assert calculate_nutrient_data(profile).energy_kcal == pytest.approx(eer)
+
+
+def test_obesity_deficit_applied_to_adults():
+    healthy = calculate_nutrient_data(make_profile(weight=95.0))
+    obese = calculate_nutrient_data(make_profile(weight=95.0, diseases=["비만"]))
+    assert obese.energy_kcal == pytest.approx(healthy.energy_kcal - 500.0, abs=0.2)
+
+
+def test_activity_level_normalized():
+    assert make_profile(activity_level=" Moderately_Exercising ").activity_level == "moderately_exercising"
+    assert set(ACTIVITY_LEVELS) == set(ACTIVITY_FACTORS)
+
+
+@pytest.mark.parametrize("activity_level", ["보통", "active", ""])
+def test_invalid_activity_level_rejected(activity_level):
+    with pytest.raises(pydantic.ValidationError):
+        make_profile(activity_level=activity_level)
@@ -0,0 +1,41 @@
+"""
+is_symmetric 임베딩 백엔드별 쿼리/문서 임베딩 동일 여부 테스트
+
+사용법:
+    python -m pytest test/test_embedding_backends.py
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pytest
+from langchain_core.embeddings import FakeEmbeddings
+
+from Agent.embedding_backends import FastEmbedEmbeddings, is_symmetric
+
+
+def test_fastembed_is_asymmetric():
+    # 쿼리는 query_embed로 따로 계산 (모델 로딩 없이 클래스 속성만 확인)
+    assert is_symmetric(FastEmbedEmbeddings.__new__(FastEmbedEmbeddings)) is False
+
+
+@pytest.mark.parametrize("query_encode_kwargs, symmetric", [
+    ({}, True),
+    ({"prompt_name": "query"}, False),
+])
+def test_huggingface_depends_on_query_encode_kwargs(query_encode_kwargs, symmetric):
+    langchain_huggingface = pytest.importorskip("langchain_huggingface")
+    embeddings = langchain_huggingface.HuggingFaceEmbeddings.model_construct(query_encode_kwargs=query_encode_kwargs)
+    assert is_symmetric(embeddings) is symmetric
+
+
+class SymmetricFakeEmbeddings(FakeEmbeddings):
+    symmetric: bool = True
+
+
+def test_explicit_attribute_and_unknown_backend():
+    assert is_symmetric(SymmetricFakeEmbeddings(size=4)) is True
+    # 알 수 없는 백엔드는 쿼리와 문서를 따로 계산
+    assert is_symmetric(FakeEmbeddings(size=4)) is False
@@ -0,0 +1,56 @@
+"""
+FoodNameIndex 이름 조회 테스트
+
+사용법:
+    python -m pytest test/test_food_name_index.py
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pytest
+
+from db.food_name_index import FoodNameIndex
+
+FOODS = [
+    ("F1", "사과"),
+    ("F2", "사과잼"),
+    ("F3", "김치찌개"),
+    ("F4", "국밥_돼지머리"),
+    ("F5", "두부조림"),
+    ("F6", "두부 조림"),
+    ("F7", "배"),
+]
+
+
+@pytest.mark.parametrize("food_name, food_id", [
+    ("사과", "F1"),
+    ("사과잼", "F2"),
+    ("사과 ", "F1"),
+    ("국밥 돼지머리", "F4"),
+    ("김치찌개 1인분", "F3"),
+    ("김치찌개(1인분)", "F3"),
+    ("김치찌개 1/2그릇", "F3"),
+    ("사과 200g", "F1"),
+    ("사과 2개 (껍질 포함)", "F1"),
+    ("김치찌개", "F3"),
+    ("김치", None),               # 이름이 키의 앞부분인 방향은 찾지 않음
+    ("사", None),
+    ("배", "F7"),
+    ("배 1개", "F7"),
+    ("배추김치", None),           # 분량이 아닌 글자가 남으면 떼지 않음
+    ("두부조림", "F5"),
+    ("두부 조림 1인분", None),    # 정규화 키가 같은 음식이 둘이면 모호
+    ("된장국", None),
+])
+def test_lookup(food_name, food_id):
+    assert FoodNameIndex(FOODS).lookup(food_name) == food_id
+
+
+@pytest.mark.parametrize("food_name", ["김치볶음밥", "닭가슴살샐러드", "된장찌개정식", "김치 볶음밥 1인분", "닭가슴살 샐러드(200g)", "김치찌개라면"])
+def test_compound_dish_not_truncated_to_ingredient(food_name):
+    # 찾지 못한 이름은 None이어야 벡터 검색으로 넘어감
+    index = FoodNameIndex([("K1", "김치"), ("K2", "닭가슴살"), ("K3", "된장찌개"), ("K4", "김치찌개")])
+    assert index.lookup(food_name) is None
@@ -0,0 +1,89 @@
+"""
+MealPlanOptimizer 반복 한도 완화 / 키워드 태그 테스트
+
+사용법:
+    python -m pytest test/test_meal_optimizer.py
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from collections import Counter
+
+import numpy as np
+
+from Agent.tools.meal_optimizer import MEAL_SLOTS, MealPlanOptimizer, tags_from_keywords
+from db.nutrient_matrix import MANDATORY_COLUMNS, NUTRIENT_COLUMNS, NutrientMatrix
+
+TARGET = {
+    "energy_kcal": 2000.0, "protein_g": 60.0, "fat_g": 50.0, "carbohydrate_g": 300.0, "sugars_g": 50.0,
+    "sodium_mg": 2000.0, "cholesterol_mg": 300.0, "saturated_fat_g": 15.0, "trans_fat_g": 2.0,
+}
+
+
+def make_matrix(n: int) -> NutrientMatrix:
+    """영양 정보가 조금씩 다른 음식 n개 (100g 기준, 1회 200g)"""
+    rng = np.random.default_rng(0)
+    values = np.full((n, len(NUTRIENT_COLUMNS)), np.nan, dtype=np.float32)
+    for column in MANDATORY_COLUMNS:
+        values[:, NUTRIENT_COLUMNS.index(column)] = TARGET[column] / 20 * rng.uniform(0.5, 1.5, n)
+    return NutrientMatrix(
+        food_ids=np.array([f"F{i}" for i in range(n)]),
+        values=values,
+        reference_g=np.full(n, 100.0, dtype=np.float32),
+        serving_g=np.full(n, 200.0, dtype=np.float32),
+    )
+
+
+def make_optimizer(n: int, tags: dict | None = None, **kwargs) -> MealPlanOptimizer:
+    tags = tags or {}
+
+    def id_finder(disliked, exclude_tags, include_tags):
+        def ids(tag_names):
+            return [food_id for tag in tag_names for food_id in tags.get(tag, [])]
+        return [], ids(exclude_tags), ids(include_tags)
+
+    return MealPlanOptimizer(
+        matrix=make_matrix(n),
+        id_finder=id_finder,
+        name_finder=lambda food_ids: list(food_ids),
+        tag_finder=lambda: sorted(tags),
+        **kwargs,
+    )
+
+
+def used_foods(plan) -> Counter:
+    return Counter(item.food_name for day in plan.days for meal in day.meals for item in meal.food_list)
+
+
+def test_small_pool_relaxes_repeat_limit():
+    # 후보 5개 x 반복 2회 = 10 < 7일 x 3식 x 3개, 예전에는 모두 inf가 되어 0번 음식만 반복
+    plan, _ = make_optimizer(5).optimize(TARGET)
+    counts = used_foods(plan)
+    assert sum(counts.values()) == 7 * len(MEAL_SLOTS) * 3
+    assert len(counts) == 5
+    assert max(counts.values()) - min(counts.values()) <= 3
+    for day in plan.days:
+        for meal in day.meals:
+            names = [item.food_name for item in meal.food_list]
+            assert len(names) == len(set(names))
+
+
+def test_repeat_limit_kept_when_pool_is_large_enough():
+    plan, _ = make_optimizer(40).optimize(TARGET)
+    assert max(used_foods(plan).values()) <= 2
+
+
+def test_tags_from_keywords():
+    include, exclude = tags_from_keywords("비건, 견과류 알레르기, 매운 음식 빼고", ["비건", "견과류", "매운", "고단백"])
+    assert include == ["비건"]
+    assert exclude == ["견과류", "매운"]
+
+
+def test_keywords_filter_candidates():
+    tags = {"비건": [f"F{i}" for i in range(20)], "견과류": ["F0", "F1", "F2"]}
+    plan, _ = make_optimizer(40, tags=tags).optimize(TARGET, keywords="비건, 견과류 제외")
+    names = set(used_foods(plan))
+    assert names <= {f"F{i}" for i in range(3, 20)}
@@ -0,0 +1,114 @@
+"""
+parse_portion / NutrientAggregator.item_nutrients 분량 해석 테스트
+fill_daily_nutrients 미해결 음식 처리 테스트
+
+사용법:
+    python -m pytest test/test_nutrient_aggregator.py
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import math
+from datetime import date, time
+
+import numpy as np
+import pytest
+
+from Agent.tools.nutrient_aggregator import NutrientAggregator, parse_portion
+from db.nutrient_matrix import NUTRIENT_COLUMNS, NutrientMatrix
+from model.schemas.agent import DailyPlan, FoodItem, Meal, NutrientData, WeeklyMealPlan
+
+# (food_amount, 기대 g, 기대 개수) - 무게 단위가 있으면 g, 없으면 1회 분량 개수
+FOOD_PORTIONS = [
+    ("150g", 150.0, math.nan),
+    ("200 ml", 200.0, math.nan),
+    ("1 공기 (210g)", 210.0, math.nan),
+    ("1 공기", math.nan, 1.0),
+    ("2개 ", math.nan, 2.0),
+    ("2 slices", math.nan, 2.0),
+    ("1/2 공기", math.nan, 0.5),
+    ("1.5인분", math.nan, 1.5),
+    ("한 그릇", math.nan, 1.0),
+    ("", math.nan, 1.0),
+]
+
+
+def assert_close(result: float, expected: float):
+    if math.isnan(expected):
+        assert math.isnan(result)
+    else:
+        assert result == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("amount, grams, count", FOOD_PORTIONS)
+def test_parse_portion(amount, grams, count):
+    result_grams, result_count = parse_portion(amount)
+    assert_close(result_grams, grams)
+    assert_close(result_count, count)
+
+
+def make_matrix() -> NutrientMatrix:
+    """100g당 150kcal 음식 2개: 밥(1회 210g), 떡(1회 섭취량 없음)"""
+    values = np.full((2, len(NUTRIENT_COLUMNS)), np.nan, dtype=np.float32)
+    values[:, NUTRIENT_COLUMNS.index("energy_kcal")] = 150.0
+    return NutrientMatrix(
+        food_ids=np.array(["F1", "F2"]),
+        values=values,
+        reference_g=np.array([100.0, 100.0], dtype=np.float32),
+        serving_g=np.array([210.0, np.nan], dtype=np.float32),
+    )
+
+
+@pytest.mark.parametrize("food_id, amount, kcal", [
+    ("F1", "1 공기", 315.0),      # 1회 섭취량 210g
+    ("F1", "2개 ", 630.0),
+    ("F1", "1/2 공기", 157.5),
+    ("F1", "100g", 150.0),
+    ("F2", "2개", 300.0),         # 1회 섭취량이 없으면 기준량 100g
+])
+def test_item_nutrients_counts_servings(food_id, amount, kcal):
+    aggregator = NutrientAggregator(matrix=make_matrix(), resolver=lambda names: [])
+    items = aggregator.item_nutrients([food_id], [amount])
+    assert items[0, NUTRIENT_COLUMNS.index("energy_kcal")] == pytest.approx(kcal)
+
+
+LLM_NUTRIENTS = NutrientData(
+    energy_kcal=1234.0, protein_g=1.0, fat_g=1.0, carbohydrate_g=1.0, sugars_g=1.0,
+    sodium_mg=1.0, cholesterol_mg=1.0, saturated_fat_g=1.0, trans_fat_g=1.0,
+)
+
+
+def make_plan(*days: list[str]) -> WeeklyMealPlan:
+    """하루에 식사 1끼, 음식은 모두 1개씩, nutrients는 LLM 값"""
+    return WeeklyMealPlan(days=[
+        DailyPlan(
+            day=date(2025, 6, 23 + day_i),
+            meals=[Meal(time_slot=time(12, 0), food_list=[FoodItem(food_name=name, food_amount="1개") for name in names])],
+            nutrients=LLM_NUTRIENTS,
+        )
+        for day_i, names in enumerate(days)
+    ])
+
+
+def test_fill_daily_nutrients_keeps_llm_values_for_incomplete_days():
+    name_to_id = {"밥": "F1", "떡": "F2"}
+    aggregator = NutrientAggregator(matrix=make_matrix(), resolver=lambda names: [name_to_id.get(name) for name in names])
+    filled, report = aggregator.fill_daily_nutrients(make_plan(["밥", "떡"], ["밥", "없는음식"], ["떡"]))
+
+    assert report.unresolved_foods == ["없는음식"]
+    assert report.incomplete_days == [1]
+    assert filled.days[0].nutrients.energy_kcal == pytest.approx(315.0 + 150.0)
+    assert filled.days[1].nutrients == LLM_NUTRIENTS
+    assert filled.days[2].nutrients.energy_kcal == pytest.approx(150.0)
+
+
+def test_fill_daily_nutrients_all_resolved():
+    aggregator = NutrientAggregator(matrix=make_matrix(), resolver=lambda names: ["F1"] * len(names))
+    filled, report = aggregator.fill_daily_nutrients(make_plan(["밥"], ["밥", "밥"]))
+
+    assert report.unresolved_foods == []
+    assert report.incomplete_days == []
+    assert [day.nutrients.energy_kcal for day in filled.days] == pytest.approx([315.0, 630.0])
@@ -0,0 +1,37 @@
+"""
+권장 영양성분 캐시 프로필 키 테스트
+
+사용법:
+    python -m pytest test/test_nutrient_cache.py
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pytest
+
+from Agent.nutrient_cache import profile_key
+from Agent.tools.dri_calculator import DRI_AGE_BANDS
+
+
+def make_profile(age: int) -> dict:
+    return {"age": age, "gender": "남성", "height": 175.0, "weight": 70.0, "activity_level": "sedentary"}
+
+
+@pytest.mark.parametrize("younger, older", [(18, 19), (2, 3), (5, 6), (8, 9), (11, 12), (14, 15), (29, 30), (64, 65)])
+def test_dri_band_edges_get_different_keys(younger, older):
+    assert profile_key(make_profile(younger)) != profile_key(make_profile(older))
+
+
+def test_same_band_and_age_group_share_key():
+    assert profile_key(make_profile(40)) == profile_key(make_profile(44))
+
+
+def test_key_never_spans_dri_bands():
+    keys = {}
+    for age in range(1, 100):
+        band = int(sum(DRI_AGE_BANDS <= age)) - 1
+        keys.setdefault(profile_key(make_profile(age)), set()).add(band)
+    assert all(len(bands) == 1 for bands in keys.values())
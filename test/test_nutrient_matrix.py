@@ -0,0 +1,140 @@
+"""
+parse_amount_g 단위 해석 / 행렬 내보내기(build, load) 테스트
+
+사용법:
+    python -m pytest test/test_nutrient_matrix.py
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import json
+import math
+
+import numpy as np
+import pytest
+import sqlalchemy
+from sqlalchemy.orm import Session
+
+import db.tables.user_table  # noqa: F401 (food_table 관계 대상 등록)
+from db.base import Base
+from db.nutrient_matrix import MATRIX_FILES, NutrientMatrix, parse_amount_g
+from db.tables.food_table import FoodNutrition
+
+# (food_amount, 기대 g) - NaN은 무게로 읽을 수 없는 분량
+FOOD_AMOUNTS = [
+    ("150g", 150.0),
+    ("150 g", 150.0),
+    ("200ml", 200.0),
+    ("1.5kg", 1500.0),
+    ("1L", 1000.0),
+    ("1/2 kg", 500.0),
+    ("300그램", 300.0),
+    ("약 100g", 100.0),
+    ("1 공기 (210g)", 210.0),
+    ("1 공기", math.nan),
+    ("1/2 공기", math.nan),
+    ("2 개", math.nan),
+    ("2개", math.nan),
+    ("2 slices", math.nan),
+    ("1인분", math.nan),
+    ("100", math.nan),
+    ("", math.nan),
+    (None, math.nan),
+]
+
+
+@pytest.mark.parametrize("amount, expected", FOOD_AMOUNTS)
+def test_parse_amount_g(amount, expected):
+    result = parse_amount_g(amount)
+    if math.isnan(expected):
+        assert math.isnan(result)
+    else:
+        assert result == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("amount, expected", [("100", 100.0), ("30.5", 30.5), ("100g", 100.0), ("1 공기", math.nan)])
+def test_parse_amount_g_bare_number(amount, expected):
+    # DB의 *_g 컬럼처럼 단위가 g로 정해진 값은 숫자만 있어도 g
+    result = parse_amount_g(amount, bare_number_g=True)
+    if math.isnan(expected):
+        assert math.isnan(result)
+    else:
+        assert result == pytest.approx(expected)
+
+
+def test_parse_amount_g_default():
+    assert parse_amount_g("1 공기", default=100.0) == 100.0
+    assert parse_amount_g(None, default=100.0) == 100.0
+
+
+@pytest.fixture
+def session():
+    engine = sqlalchemy.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def add_foods(session: Session, *food_ids: str):
+    session.add_all(FoodNutrition(food_id=food_id, energy_kcal="100", nutrient_reference_amount_g="100") for food_id in food_ids)
+    session.flush()
+
+
+def test_build_and_load(session, tmp_path):
+    add_foods(session, "F2", "F1")
+    assert NutrientMatrix.build(session, tmp_path) == 2
+    matrix = NutrientMatrix.load(tmp_path)
+    assert list(matrix.food_ids) == ["F1", "F2"]
+    assert matrix.values.shape == (2, len(matrix.columns))
+
+
+def test_rebuild_keeps_only_current_and_previous_version(session, tmp_path):
+    versions = []
+    for food_id in ("F1", "F2", "F3"):
+        add_foods(session, food_id)
+        NutrientMatrix.build(session, tmp_path)
+        versions.append(json.loads((tmp_path / "meta.json").read_text(encoding="utf-8"))["version"])
+
+    assert len(NutrientMatrix.load(tmp_path)) == 3
+    assert {path.name for path in tmp_path.glob("*.npy")} == {f"{name}.{version}.npy" for name in MATRIX_FILES for version in versions[1:]}
+
+
+def test_failed_build_leaves_previous_matrix(session, tmp_path, monkeypatch):
+    add_foods(session, "F1")
+    NutrientMatrix.build(session, tmp_path)
+    add_foods(session, "F2")
+
+    # 배열 일부를 쓴 뒤 실패해도 meta.json은 이전 버전을 가리킴
+    save = np.save
+    def save_then_fail(path, array):
+        if "values" in str(path):
+            raise OSError("disk full")
+        save(path, array)
+    monkeypatch.setattr(np, "save", save_then_fail)
+    with pytest.raises(OSError):
+        NutrientMatrix.build(session, tmp_path)
+
+    assert list(NutrientMatrix.load(tmp_path).food_ids) == ["F1"]
+
+
+def test_load_rejects_mismatched_files(session, tmp_path):
+    add_foods(session, "F1", "F2")
+    NutrientMatrix.build(session, tmp_path)
+    meta = json.loads((tmp_path / "meta.json").read_text(encoding="utf-8"))
+    np.save(tmp_path / f"serving_g.{meta['version']}.npy", np.zeros(3, dtype=np.float32))
+    with pytest.raises(ValueError):
+        NutrientMatrix.load(tmp_path)
+
+
+def test_load_unversioned_files(tmp_path):
+    # 버전 도입 전에 내보낸 파일 구성
+    for name, array in {
+        "food_ids": np.array(["F1"]), "values": np.zeros((1, 2), dtype=np.float32),
+        "reference_g": np.full(1, 100.0, dtype=np.float32), "serving_g": np.full(1, np.nan, dtype=np.float32),
+    }.items():
+        np.save(tmp_path / f"{name}.npy", array)
+    (tmp_path / "meta.json").write_text(json.dumps({"columns": ["energy_kcal", "protein_g"], "categories": [], "rows": 1}), encoding="utf-8")
+    assert list(NutrientMatrix.load(tmp_path).food_ids) == ["F1"]
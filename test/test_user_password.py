@@ -0,0 +1,86 @@
+"""
+UserMixin.verify_user 비밀번호 확인 테스트 (bcrypt 해시 / 해시 도입 전 평문)
+
+사용법:
+    python -m pytest test/test_user_password.py
+"""
+import sys
+from pathlib import Path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy
+from sqlalchemy.orm import Session
+
+import db.tables.food_table  # noqa: F401 (user_table 관계 대상 등록)
+from db.base import Base
+from db.db_mixin.user_mixin import UserMixin, hash_password, is_password_hash
+from db.tables.user_table import Password, UserAuth, UserInfo
+
+
+class Manager(UserMixin):
+    """SQLite 세션 위의 UserMixin (조회는 uuid/password만 담은 객체로 대신함)"""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.autocommit = False
+        self.uncommitted = False
+
+    def get_user_by_email(self, email: str):
+        user_info = self.session.query(UserInfo).join(UserAuth).filter(UserAuth.email == email).first()
+        if user_info is None:
+            return None
+        return SimpleNamespace(uuid=user_info.uuid, password=user_info.password.password if user_info.password else None)
+
+    def get_user_by_uuid(self, uuid: str):
+        return self.session.get(UserInfo, uuid)
+
+
+@pytest.fixture
+def manager():
+    engine = sqlalchemy.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield Manager(session)
+
+
+def add_user(manager: Manager, email: str, stored: str) -> str:
+    """password 테이블에 stored를 그대로 저장한 사용자"""
+    user_uuid = manager.create_user(nickname="test", email=email)
+    manager.session.add(Password(uuid=user_uuid, password=stored))
+    manager.session.flush()
+    manager.uncommitted = False
+    return user_uuid
+
+
+def stored_password(manager: Manager, user_uuid: str) -> str:
+    return manager.session.query(Password).filter(Password.uuid == user_uuid).one().password
+
+
+def test_hashed_password(manager):
+    add_user(manager, "a@test.com", hash_password("secret"))
+    assert manager.verify_user("a@test.com", "secret") is not None
+    assert manager.verify_user("a@test.com", "wrong") is None
+    assert not manager.uncommitted
+
+
+def test_plaintext_password_rehashed_on_login(manager):
+    user_uuid = add_user(manager, "a@test.com", "secret")
+    assert manager.verify_user("a@test.com", "wrong") is None
+    assert stored_password(manager, user_uuid) == "secret"
+
+    assert manager.verify_user("a@test.com", "secret") is not None
+    assert manager.uncommitted
+    assert is_password_hash(stored_password(manager, user_uuid))
+    assert manager.verify_user("a@test.com", "secret") is not None
+
+
+@pytest.mark.parametrize("stored", ["$2b$12$broken", "$2b$12$" + "a" * 53, "$2b$99$" + "a" * 53])
+def test_malformed_stored_value_fails_login(manager, stored):
+    # 예전에는 bcrypt.checkpw가 ValueError(Invalid salt)를 내서 로그인이 500
+    add_user(manager, "a@test.com", stored)
+    assert manager.verify_user("a@test.com", "secret") is None
@@ -0,0 +1,88 @@
+"""
+/user/login, /user/me 부하 테스트
+
+실행 중인 서버에 동시 요청을 보내 엔드포인트별로 다음을 출력합니다.
+- req/s: 초당 처리한 요청 수
+- p50/p95 (ms): 요청 지연
+- errors: 2xx가 아닌 응답 또는 연결 오류 수
+
+테스트 계정이 없으면 /user/register로 먼저 만듭니다.
+동기 DBManager를 쓰던 버전과 비교하려면 같은 설정으로 변경 전/후 커밋의 서버를 각각 띄워 실행하세요.
+
+사용법:
+    uvicorn app:app --port 8000 --workers 1
+    python test/user_load_test.py --base-url http://localhost:8000 --concurrency 50 --duration 20
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+TEST_EMAIL = "loadtest@example.com"
+TEST_PASSWORD = "Load@Test1234"
+
+
+async def ensure_user(client: httpx.AsyncClient) -> str:
+    """테스트 계정으로 로그인해 액세스 토큰 반환 (없으면 가입 후 로그인)"""
+    credentials = {"email": TEST_EMAIL, "password": TEST_PASSWORD}
+    response = await client.post("/user/login", json=credentials)
+    if response.status_code == 401:
+        await client.post("/user/register", json={**credentials, "nickname": "loadtest"})
+        response = await client.post("/user/login", json=credentials)
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def worker(client: httpx.AsyncClient, request: dict, deadline: float, result: dict) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.request(**request)
+            ok = response.is_success
+        except httpx.HTTPError:
+            ok = False
+        result["latencies"].append((time.perf_counter() - start) * 1000)
+        result["errors"] += not ok
+
+
+async def run(base_url: str, endpoint: str, request: dict, concurrency: int, duration: float) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        result = {"endpoint": endpoint, "latencies": [], "errors": 0}
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(worker(client, request, deadline, result) for _ in range(concurrency)))
+        result["seconds"] = time.perf_counter() - start
+        return result
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="/user/login, /user/me 부하 테스트")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--endpoints", nargs="+", default=["login", "me"], choices=["login", "me"])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20, help="엔드포인트별 측정 시간(초)")
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        token = await ensure_user(client)
+
+    requests = {
+        "login": {"method": "POST", "url": "/user/login", "json": {"email": TEST_EMAIL, "password": TEST_PASSWORD}},
+        "me": {"method": "GET", "url": "/user/me", "headers": {"Authorization": f"Bearer {token}"}},
+    }
+    print(f"base url: {args.base_url}, concurrency: {args.concurrency}, duration: {args.duration}s")
+    print(f"{'endpoint':<8} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for endpoint in args.endpoints:
+        result = await run(args.base_url, endpoint, requests[endpoint], args.concurrency, args.duration)
+        latencies = result["latencies"] or [float("nan")]
+        print(
+            f"{endpoint:<8} {len(result['latencies']):>9} {len(result['latencies']) / result['seconds']:>8.1f} "
+            f"{np.percentile(latencies, 50):>8.1f} {np.percentile(latencies, 95):>8.1f} {result['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())